@@ -8,6 +8,9 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import heapq
+from concurrent import futures
+
 import sgtk
 
 HookBaseClass = sgtk.get_hook_baseclass()
@@ -16,12 +19,21 @@ HookBaseClass = sgtk.get_hook_baseclass()
 class GetPublishedFiles(HookBaseClass):
     """Hook to specify the query to retrieve Published Files for the app."""
 
+    # The published file fields that the published file key is made of (see
+    # `get_published_file_key`).
+    KEY_FIELDS = ["project", "entity", "task", "published_file_type", "name"]
+
     def get_published_files_for_items(
         self, items, data_retriever=None, extra_fields=None, published_file_filters=None
     ):
         """
         Make an API request to get all published files for the given file items.
 
+        If the query filters for the items exceed the budget defined by the app settings
+        `published_files_query_max_items` and `published_files_query_max_filter_size`, the
+        query is split into several queries that are executed concurrently. Their results are
+        merged, such that the result is ordered the same as a single query.
+
         :param items: a list of :class`FileItem` we want to get published files for.
         :type items: List[FileItem]
         :param data_retreiver: If provided, the api request will be async. The default value
@@ -35,11 +47,6 @@ class GetPublishedFiles(HookBaseClass):
         :rtype: str | dict
         """
 
-        # Get the filters to query published files for the given items.
-        filters = self.get_published_file_filters_for_items(items)
-        if published_file_filters:
-            filters.extend(published_file_filters)
-
         # Get the query fields. This assumes all file items in the list have the same fields.
         fields = list(items[0].sg_data.keys()) + ["version_number", "path"]
         fields += extra_fields
@@ -48,6 +55,24 @@ class GetPublishedFiles(HookBaseClass):
         # is the first result.
         order = [{"field_name": "version_number", "direction": "desc"}]
 
+        # Get the filters to query published files for the given items, split into several
+        # queries if the filters are too large for a single query.
+        query_filters = self.get_published_file_query_filters_for_items(
+            items, published_file_filters
+        )
+
+        if len(query_filters) > 1:
+            if data_retriever:
+                # Execute async and return the background task id. The data retriever will
+                # pass its Flow Production Tracking connection as the first argument.
+                return data_retriever.execute_method(
+                    self._find_published_files, query_filters, fields, order
+                )
+            return self._find_published_files(
+                self.sgtk.shotgun, query_filters, fields, order
+            )
+
+        filters = query_filters[0]
         if data_retriever:
             # Execute async and return the background task id.
             return data_retriever.execute_find(
@@ -65,6 +90,53 @@ class GetPublishedFiles(HookBaseClass):
             order=order,
         )
 
+    def get_latest_published_files_for_items(
+        self, items, data_retriever=None, extra_fields=None, published_file_filters=None
+    ):
+        """
+        Make an API request to get only the latest published file for each of the given file
+        items.
+
+        Unlike `get_published_files_for_items`, the full version history is not returned.
+        The query is executed in two passes: the first pass summarizes the highest version
+        number for each published file key (project, entity, task, published file type and
+        name) on the server, then the second pass retrieves all the requested fields for only
+        the published files of those versions. Both passes are split by the query budget (see
+        `get_published_file_query_filters_for_items`).
+
+        :param items: a list of :class`FileItem` we want to get published files for.
+        :type items: List[FileItem]
+        :param data_retreiver: If provided, the api request will be async. The default value
+            will execute the api request synchronously.
+        :type data_retriever: ShotgunDataRetriever
+        :param extra_fields: Additional fields to retrieve for the published files.
+        :type extra_fields: List[str]
+        :param published_file_filters: Additional filters to apply to the published file query.
+        :type published_file_filters: List[List[str]]
+
+        :return: If the request is async, then the request task id is returned, else the
+            latest published file data for each item key, ordered by version number in
+            descending order.
+        :rtype: str | List[dict]
+        """
+
+        if data_retriever:
+            # Execute async and return the background task id. The data retriever will
+            # pass its Flow Production Tracking connection as the first argument.
+            return data_retriever.execute_method(
+                self._find_latest_published_files,
+                items,
+                extra_fields=extra_fields,
+                published_file_filters=published_file_filters,
+            )
+
+        return self._find_latest_published_files(
+            self.sgtk.shotgun,
+            items,
+            extra_fields=extra_fields,
+            published_file_filters=published_file_filters,
+        )
+
     def get_latest_published_file(self, item, data_retriever=None, **kwargs):
         """
         Query Flow Production Tracking to get the latest published file for the given item.
@@ -113,12 +185,45 @@ class GetPublishedFiles(HookBaseClass):
 
         return result
 
+    def get_published_file_key(self, sg_data):
+        """
+        Get the key that identifies all versions of the given published file.
+
+        Published files that share the same key are considered to be different versions of
+        the same file. This is the only definition of the key, the app also uses it to match
+        the scene items to their latest published files (see
+        `BreakdownManager.get_publish_key`).
+
+        :param sg_data: The published file data.
+        :type sg_data: dict
+
+        :return: The published file key (project id, entity type, entity id, task id,
+            published file type id, name).
+        :rtype: tuple
+        """
+
+        project = sg_data.get("project") or {}
+        entity = sg_data.get("entity") or {}
+        task = sg_data.get("task") or {}
+        pf_type = sg_data.get("published_file_type") or {}
+
+        return (
+            project.get("id"),
+            entity.get("type"),
+            entity.get("id"),
+            task.get("id"),
+            pf_type.get("id"),
+            sg_data.get("name"),
+        )
+
     def get_published_file_filters_for_items(self, items):
         """
         Get published file filters based on the given items.
 
         The filters returned can be used to query for published files that belong to the given
-        items.
+        items. Only the published files that match exactly the key (project, entity, task,
+        published file type and name) of one of the given items will be found; the keys are
+        clustered to keep the filters small.
 
         :param items: a list of :class`FileItem` we want to get published files for.
         :type items: List[FileItem]
@@ -130,81 +235,85 @@ class GetPublishedFiles(HookBaseClass):
         if not items:
             return []
 
-        # Build the filters to get all published files for at once for all the file items.
-        entities = []
-        names = []
-        tasks = []
-        none_entity = False
-        none_task = False
-        pf_types = []
-
-        filters_by_project = {}
-
+        # Gather the unique item keys per project.
+        keys_by_project = {}
         for file_item in items:
-            project_id = file_item.sg_data["project"]["id"]
-            filters_by_project.setdefault(project_id, {})
-
-            # Required published file fields are name and published file type. There will be
-            # an api error if these are not set.
-            filters_by_project[project_id].setdefault("names", []).append(
-                file_item.sg_data["name"]
-            )
-
-            filters_by_project[project_id].setdefault(
-                "published_file_types", []
-            ).append(file_item.sg_data["published_file_type"])
-
-            # Optional fields are linked entity and task.
-            entity = file_item.sg_data["entity"]
-            if entity:
-                filters_by_project[project_id].setdefault("entities", []).append(entity)
-            else:
-                filters_by_project[project_id]["none_entity"] = True
+            key = self.get_published_file_key(file_item.sg_data)
+            keys_by_project.setdefault(key[0], set()).add(key)
 
-            task = file_item.sg_data["task"]
-            if task:
-                filters_by_project[project_id].setdefault("tasks", []).append(task)
+        filters = []
+        for project_id, keys in keys_by_project.items():
+            # Published files will be found by their entity, name, task and published file
+            # type. Cluster the keys either by context (entity, task, type) to match a list of
+            # names, or by (name, type, task) to match a list of entities, whichever produces
+            # the fewest clauses. Both clusterings match only the exact item keys.
+            by_context = {}
+            by_name = {}
+            for _, entity_type, entity_id, task_id, pf_type_id, name in keys:
+                by_context.setdefault(
+                    (entity_type, entity_id, task_id, pf_type_id), []
+                ).append(name)
+                by_name.setdefault((name, pf_type_id, task_id), []).append(
+                    (entity_type, entity_id)
+                )
+
+            key_filters = []
+            if len(by_context) <= len(by_name):
+                for (entity_type, entity_id, task_id, pf_type_id), names in sorted(
+                    by_context.items(), key=lambda x: str(x[0])
+                ):
+                    key_filters.append(
+                        {
+                            "filter_operator": "all",
+                            "filters": [
+                                self._get_entity_filter(
+                                    "entity", entity_type, entity_id
+                                ),
+                                self._get_entity_filter("task", "Task", task_id),
+                                self._get_entity_filter(
+                                    "published_file_type",
+                                    "PublishedFileType",
+                                    pf_type_id,
+                                ),
+                                ["name", "in", sorted(names)],
+                            ],
+                        }
+                    )
             else:
-                filters_by_project[project_id]["none_task"] = True
+                for (name, pf_type_id, task_id), entities in sorted(
+                    by_name.items(), key=lambda x: str(x[0])
+                ):
+                    entity_filters = [
+                        self._get_entity_filter("entity", entity_type, entity_id)
+                        for entity_type, entity_id in sorted(entities, key=str)
+                    ]
+                    key_filters.append(
+                        {
+                            "filter_operator": "all",
+                            "filters": [
+                                ["name", "is", name],
+                                self._get_entity_filter(
+                                    "published_file_type",
+                                    "PublishedFileType",
+                                    pf_type_id,
+                                ),
+                                self._get_entity_filter("task", "Task", task_id),
+                                {
+                                    "filter_operator": "any",
+                                    "filters": entity_filters,
+                                },
+                            ],
+                        }
+                    )
 
-        filters = []
-        for project_id, project_filters in filters_by_project.items():
-            names = project_filters.get("names", [])
-            pf_types = project_filters.get("published_file_types", [])
-
-            # Build the entity filters
-            entities = project_filters.get("entities", [])
-            none_entity = project_filters.get("none_entity", False)
-            entity_filters = []
-            if entities:
-                entity_filters.append(["entity", "in", entities])
-            if none_entity:
-                entity_filters.append(["entity", "is", None])
-
-            # Build the task filters
-            tasks = project_filters.get("tasks", [])
-            none_task = project_filters.get("none_task", False)
-            task_filters = []
-            if tasks:
-                task_filters.append(["task", "in", tasks])
-            if none_task:
-                task_filters.append(["task", "is", None])
-
-            # Published files will be found by their entity, name, task and published file type.
             filters.append(
                 {
                     "filter_operator": "all",
                     "filters": [
                         ["project.Project.id", "is", project_id],
-                        ["name", "in", names],
-                        ["published_file_type", "in", pf_types],
                         {
                             "filter_operator": "any",
-                            "filters": entity_filters,
-                        },
-                        {
-                            "filter_operator": "any",
-                            "filters": task_filters,
+                            "filters": key_filters,
                         },
                     ],
                 }
@@ -216,3 +325,407 @@ class GetPublishedFiles(HookBaseClass):
                 "filters": filters,
             },
         ]
+
+    def get_published_file_query_filters_for_items(
+        self, items, published_file_filters=None
+    ):
+        """
+        Get the filters to query the published files for the given items, split into several
+        queries that each stay under the query budget.
+
+        The budget is defined by the app settings `published_files_query_max_items`, the max
+        number of unique item keys per query, and `published_files_query_max_filter_size`,
+        the max size of the serialized filters per query. A value of 0 or less disables the
+        budget.
+
+        :param items: a list of :class`FileItem` we want to get published files for.
+        :type items: List[FileItem]
+        :param published_file_filters: Additional filters to apply to each query.
+        :type published_file_filters: List[List[str]]
+
+        :return: The filters of each query to execute.
+        :rtype: List[List]
+        """
+
+        # Items with the same key share the same published files, only the unique keys are
+        # split across queries.
+        items_by_key = {}
+        for file_item in items:
+            items_by_key.setdefault(
+                self.get_published_file_key(file_item.sg_data), file_item
+            )
+
+        return self._split_query_filters(
+            list(items_by_key.values()),
+            lambda batch: self.get_published_file_filters_for_items(batch)
+            + (published_file_filters or []),
+        )
+
+    def _split_query_filters(self, entries, get_filters):
+        """
+        Split the given entries into batches, such that the filters of each batch stay under
+        the query budget (see `get_published_file_query_filters_for_items`).
+
+        :param entries: The entries to split, e.g. the items to query published files for.
+        :type entries: list
+        :param get_filters: The function that returns the query filters for a batch of
+            entries.
+        :type get_filters: function
+
+        :return: The filters of each query to execute.
+        :rtype: List[List]
+        """
+
+        max_items = self.parent.get_setting("published_files_query_max_items", 0)
+        max_filter_size = self.parent.get_setting(
+            "published_files_query_max_filter_size", 0
+        )
+
+        if max_items and max_items > 0:
+            batches = [
+                entries[i : i + max_items] for i in range(0, len(entries), max_items)
+            ]
+        else:
+            batches = [entries]
+
+        query_filters = []
+        while batches:
+            batch = batches.pop(0)
+            filters = get_filters(batch)
+
+            if (
+                max_filter_size
+                and max_filter_size > 0
+                and len(batch) > 1
+                and len(repr(filters)) > max_filter_size
+            ):
+                # Split the batch in half until the filters fit in the budget.
+                half = len(batch) // 2
+                batches[0:0] = [batch[:half], batch[half:]]
+                continue
+
+            query_filters.append(filters)
+
+        return query_filters
+
+    def get_published_files_over_fetch_ratio(self, items, published_files):
+        """
+        Measure how many of the published files returned by a query do not belong to any of
+        the given items.
+
+        :param items: The list of :class`FileItem` that the published files were queried for.
+        :type items: List[FileItem]
+        :param published_files: The published file data returned by the query.
+        :type published_files: List[dict]
+
+        :return: The ratio of published files that do not match the key of any of the items,
+            from 0.0 (all published files belong to an item) to 1.0 (none of them belong to
+            an item).
+        :rtype: float
+        """
+
+        if not published_files:
+            return 0.0
+
+        item_keys = set(
+            self.get_published_file_key(file_item.sg_data) for file_item in items
+        )
+        unmatched = sum(
+            1
+            for pf_data in published_files
+            if self.get_published_file_key(pf_data) not in item_keys
+        )
+        return float(unmatched) / len(published_files)
+
+    def _find_latest_published_files(
+        self, sg, items, extra_fields=None, published_file_filters=None
+    ):
+        """
+        Query for the latest published file for each of the given items.
+
+        :param sg: The Flow Production Tracking API instance to execute the queries with.
+        :type sg: shotgun_api3.Shotgun
+        :param items: a list of :class`FileItem` we want to get published files for.
+        :type items: List[FileItem]
+        :param extra_fields: Additional fields to retrieve for the published files.
+        :type extra_fields: List[str]
+        :param published_file_filters: Additional filters to apply to the published file query.
+        :type published_file_filters: List[List[str]]
+
+        :return: The latest published file per item key, ordered by version number in
+            descending order.
+        :rtype: List[dict]
+        """
+
+        if not items:
+            return []
+
+        query_filters = self.get_published_file_query_filters_for_items(
+            items, published_file_filters
+        )
+
+        # This assumes all file items in the list have the same fields. The key fields are
+        # required to match the published files to their latest version.
+        fields = list(items[0].sg_data.keys()) + ["version_number", "path"]
+        fields += extra_fields or []
+        fields += [field for field in self.KEY_FIELDS if field not in fields]
+
+        order = [{"field_name": "version_number", "direction": "desc"}]
+
+        def find_latest(sg, filters):
+            # First pass, get the highest version number per key, without retrieving the
+            # version history.
+            latest_versions = self._get_latest_versions(sg, filters)
+            if not latest_versions:
+                return []
+
+            # Second pass, get the published file of the highest version number of each key,
+            # matching each key with its own version number.
+            published_files = self._merge_published_files(
+                [
+                    sg.find(
+                        "PublishedFile",
+                        filters=version_filters,
+                        fields=fields,
+                        order=order,
+                    )
+                    for version_filters in self._get_latest_version_query_filters(
+                        latest_versions, published_file_filters
+                    )
+                ]
+            )
+            result = []
+            for pf_data in published_files:
+                key = self.get_published_file_key(pf_data)
+                if key not in latest_versions:
+                    continue
+                # Only keep the first published file in case a version was published twice.
+                del latest_versions[key]
+                result.append(pf_data)
+            return result
+
+        return self._merge_published_files(
+            self._execute_queries(sg, find_latest, query_filters)
+        )
+
+    def _get_latest_version_query_filters(
+        self, latest_versions, published_file_filters=None
+    ):
+        """
+        Get the filters to query the published files of the given versions, split into
+        several queries that each stay under the query budget.
+
+        Each published file key is matched with its own version number, such that only the
+        published file of the given version is found for each key.
+
+        :param latest_versions: The version number by published file key, as returned by
+            `_get_latest_versions`.
+        :type latest_versions: dict
+        :param published_file_filters: Additional filters to apply to each query.
+        :type published_file_filters: List[List[str]]
+
+        :return: The filters of each query to execute.
+        :rtype: List[List]
+        """
+
+        def get_filters(batch):
+            version_filters = []
+            for key, version_number in batch:
+                project_id, entity_type, entity_id, task_id, pf_type_id, name = key
+                version_filters.append(
+                    {
+                        "filter_operator": "all",
+                        "filters": [
+                            self._get_entity_filter("project", "Project", project_id),
+                            self._get_entity_filter("entity", entity_type, entity_id),
+                            self._get_entity_filter("task", "Task", task_id),
+                            self._get_entity_filter(
+                                "published_file_type", "PublishedFileType", pf_type_id
+                            ),
+                            ["name", "is", name],
+                            ["version_number", "is", version_number],
+                        ],
+                    }
+                )
+            return [{"filter_operator": "any", "filters": version_filters}] + (
+                published_file_filters or []
+            )
+
+        return self._split_query_filters(
+            sorted(latest_versions.items(), key=str), get_filters
+        )
+
+    def _get_latest_versions(self, sg, filters):
+        """
+        Get the highest version number of the published files matching the filters, per
+        published file key.
+
+        The versions are summarized on the server, grouped by the key fields. Connections that
+        do not support summaries (e.g. a mocked connection) query the key fields of all
+        versions instead.
+
+        :param sg: The Flow Production Tracking API instance to execute the query with.
+        :type sg: shotgun_api3.Shotgun
+        :param filters: The published file filters.
+        :type filters: List
+
+        :return: The highest version number by published file key.
+        :rtype: dict
+        """
+
+        if not hasattr(sg, "summarize"):
+            latest_versions = {}
+            for pf_data in sg.find(
+                "PublishedFile",
+                filters=filters,
+                fields=self.KEY_FIELDS + ["version_number"],
+            ):
+                key = self.get_published_file_key(pf_data)
+                latest_versions[key] = max(
+                    latest_versions.get(key) or 0, pf_data.get("version_number") or 0
+                )
+            return latest_versions
+
+        summary = sg.summarize(
+            "PublishedFile",
+            filters=filters,
+            summary_fields=[{"field": "version_number", "type": "maximum"}],
+            grouping=[
+                {"field": field, "type": "exact", "direction": "asc"}
+                for field in self.KEY_FIELDS
+            ],
+        )
+
+        latest_versions = {}
+        # The groups are nested in the order of the grouping fields, walk them down to the
+        # last grouping field to get the values of all key fields.
+        stack = [(group, {}) for group in summary.get("groups") or []]
+        while stack:
+            group, key_data = stack.pop()
+            key_data = dict(key_data)
+            key_data[self.KEY_FIELDS[len(key_data)]] = group.get("group_value")
+            if len(key_data) < len(self.KEY_FIELDS):
+                stack.extend((child, key_data) for child in group.get("groups") or [])
+                continue
+
+            version_number = (group.get("summaries") or {}).get("version_number")
+            if version_number is not None:
+                latest_versions[self.get_published_file_key(key_data)] = version_number
+
+        return latest_versions
+
+    def _find_published_files(self, sg, query_filters, fields, order):
+        """
+        Execute the published file queries for the given filters, and merge their results.
+
+        A single query is executed with the given Flow Production Tracking connection. Multiple
+        queries are executed concurrently, each in its own thread with its own connection
+        (the Flow Production Tracking API connections are not thread safe).
+
+        :param sg: The Flow Production Tracking API instance to execute the queries with.
+        :type sg: shotgun_api3.Shotgun
+        :param query_filters: The filters of each query to execute.
+        :type query_filters: List[List]
+        :param fields: The published file fields to retrieve.
+        :type fields: List[str]
+        :param order: The order of the query results. Only the descending version number
+            order is preserved when merging multiple query results.
+        :type order: List[dict]
+
+        :return: The published files found by all queries, ordered by version number in
+            descending order.
+        :rtype: List[dict]
+        """
+
+        def find(sg, filters):
+            return sg.find(
+                "PublishedFile",
+                filters=filters,
+                fields=fields,
+                order=order,
+            )
+
+        return self._merge_published_files(
+            self._execute_queries(sg, find, query_filters)
+        )
+
+    def _execute_queries(self, sg, query, query_filters):
+        """
+        Execute a query for each of the given filters.
+
+        A single query is executed with the given Flow Production Tracking connection. Multiple
+        queries are executed concurrently, each in its own thread with its own connection
+        (the Flow Production Tracking API connections are not thread safe).
+
+        :param sg: The Flow Production Tracking API instance to execute a single query with.
+        :type sg: shotgun_api3.Shotgun
+        :param query: The function that executes the query. It takes the Flow Production
+            Tracking API instance and the query filters, and returns the query result.
+        :type query: function
+        :param query_filters: The filters of each query to execute.
+        :type query_filters: List[List]
+
+        :return: The result of each query, in the order of the query filters.
+        :rtype: list
+        """
+
+        if len(query_filters) == 1:
+            return [query(sg, query_filters[0])]
+
+        def execute(filters):
+            # The toolkit connection is thread local, each thread gets its own connection.
+            return query(self.sgtk.shotgun, filters)
+
+        max_workers = self.parent.get_setting("published_files_query_max_workers", 4)
+        with futures.ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers or 1, len(query_filters)))
+        ) as executor:
+            return list(executor.map(execute, query_filters))
+
+    @staticmethod
+    def _merge_published_files(results):
+        """
+        Merge the published files found by several queries.
+
+        :param results: The published files found by each query, ordered by version number in
+            descending order.
+        :type results: List[List[dict]]
+
+        :return: The published files of all queries, ordered by version number in descending
+            order.
+        :rtype: List[dict]
+        """
+
+        if len(results) == 1:
+            return results[0]
+
+        # Each result is ordered by version number in descending order, merge the results to
+        # preserve this order. Queries are split by item key, so a published file can only be
+        # found by one query.
+        return list(
+            heapq.merge(
+                *results,
+                key=lambda pf_data: pf_data.get("version_number") or 0,
+                reverse=True
+            )
+        )
+
+    @staticmethod
+    def _get_entity_filter(field, entity_type, entity_id):
+        """
+        Get the filter to match the given entity field value.
+
+        :param field: The entity field to filter on.
+        :type field: str
+        :param entity_type: The entity type of the value.
+        :type entity_type: str
+        :param entity_id: The entity id of the value, None to match an empty field.
+        :type entity_id: int
+
+        :return: The filter.
+        :rtype: list
+        """
+
+        if entity_id is None:
+            return [field, "is", None]
+        return [field, "is", {"type": entity_type, "id": entity_id}]
@@ -46,6 +46,24 @@ class BreakdownSceneOperations(HookBaseClass):
         available. Any such versions are then displayed in the UI as out of date.
         """
 
+        return [ref for batch in self.iter_scene_objects() for ref in batch]
+
+    def iter_scene_objects(self, batch_size=100):
+        """
+        Scan the scene progressively, and yield the scene references in batches.
+
+        The app consumes the batches from the main thread in time slices, such that the UI
+        stays responsive while large scenes are scanned, and each batch is resolved to its
+        published files while the rest of the scene is scanned. See :meth:`scan_scene` for
+        the scene reference data.
+
+        :param batch_size: The max number of scene references per batch.
+        :type batch_size: int
+
+        :return: A generator of lists of scene references.
+        :rtype: Generator[List[dict]]
+        """
+
         refs = []
 
         # first let's look at maya references
@@ -60,6 +78,9 @@ class BreakdownSceneOperations(HookBaseClass):
             refs.append(
                 {"node_name": node_name, "node_type": "reference", "path": maya_path}
             )
+            if len(refs) >= batch_size:
+                yield refs
+                refs = []
 
         # now look at file texture nodes
         for file_node in cmds.ls(l=True, type="file"):
@@ -74,8 +95,12 @@ class BreakdownSceneOperations(HookBaseClass):
             )
 
             refs.append({"node_name": file_node, "node_type": "file", "path": path})
+            if len(refs) >= batch_size:
+                yield refs
+                refs = []
 
-        return refs
+        if refs:
+            yield refs
 
     def update(self, item):
         """
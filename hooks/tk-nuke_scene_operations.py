@@ -46,6 +46,24 @@ class BreakdownSceneOperations(HookBaseClass):
         available. Any such versions are then displayed in the UI as out of date.
         """
 
+        return [node for batch in self.iter_scene_objects() for node in batch]
+
+    def iter_scene_objects(self, batch_size=100):
+        """
+        Scan the scene progressively, and yield the scene references in batches.
+
+        The app consumes the batches from the main thread in time slices, such that the UI
+        stays responsive while large scripts are scanned, and each batch is resolved to its
+        published files while the rest of the script is scanned. See :meth:`scan_scene` for
+        the scene reference data.
+
+        :param batch_size: The max number of scene references per batch.
+        :type batch_size: int
+
+        :return: A generator of lists of scene references.
+        :rtype: Generator[List[dict]]
+        """
+
         nodes = []
 
         # If we're in Nuke Studio or Hiero, we need to see if there are any
@@ -68,40 +86,35 @@ class BreakdownSceneOperations(HookBaseClass):
                                 extra_data={"clip": clip.activeItem()},
                             )
                         )
+                        if len(nodes) >= batch_size:
+                            yield nodes
+                            nodes = []
 
         # Hiero doesn't have nodes to check, so just return the clips.
         if self.parent.engine.hiero_enabled:
-            return nodes
-
-        # first let's look at the read nodes
-        for node in nuke.allNodes("Read"):
-
-            node_name = node.name()
-
-            # note! We are getting the "abstract path", so contains
-            # %04d and %V rather than actual values.
-            path = node.knob("file").value().replace("/", os.path.sep)
-            nodes.append({"node_name": node_name, "node_type": "Read", "path": path})
-
-        # then the read geometry nodes
-        for node in nuke.allNodes("ReadGeo2"):
-
-            node_name = node.name()
-
-            path = node.knob("file").value().replace("/", os.path.sep)
-            nodes.append(
-                {"node_name": node_name, "node_type": "ReadGeo2", "path": path}
-            )
-
-        # then the read camera nodes
-        for node in nuke.allNodes("Camera2"):
-
-            node_name = node.name()
-
-            path = node.knob("file").value().replace("/", os.path.sep)
-            nodes.append({"node_name": node_name, "node_type": "Camera2", "path": path})
-
-        return nodes
+            if nodes:
+                yield nodes
+            return
+
+        # first let's look at the read nodes, then the read geometry nodes and the read
+        # camera nodes
+        for node_type in ("Read", "ReadGeo2", "Camera2"):
+            for node in nuke.allNodes(node_type):
+
+                node_name = node.name()
+
+                # note! For read nodes, we are getting the "abstract path", so contains
+                # %04d and %V rather than actual values.
+                path = node.knob("file").value().replace("/", os.path.sep)
+                nodes.append(
+                    {"node_name": node_name, "node_type": node_type, "path": path}
+                )
+                if len(nodes) >= batch_size:
+                    yield nodes
+                    nodes = []
+
+        if nodes:
+            yield nodes
 
     def update(self, item):
         """
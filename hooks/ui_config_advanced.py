@@ -243,22 +243,43 @@ class UIConfigAdvanced(HookClass):
                 # The model has no data
                 subtitle = "NO FILES FOUND"
             else:
-                # Iterate through the source model items, counting how many items are being loaded
-                # and how many have a status of out of sync
-                loaded = 0
-                source_out_of_sync = 0
-                for row in range(source_rows):
-                    child_index = source_model.index(row, 0, source_index)
-
-                    status = child_index.data(source_model.STATUS_ROLE)
-                    if status == source_model.STATUS_OUT_OF_SYNC:
-                        source_out_of_sync += 1
-
-                    is_loading = (
-                        child_index.data(source_model.VIEW_ITEM_LOADING_ROLE) or False
+                # Get the group aggregates maintained by the source model, if the model provides
+                # them. Otherwise, the group items are counted below.
+                status_counts = None
+                loading_count = None
+                if hasattr(source_model, "GROUP_STATUS_COUNTS_ROLE") and hasattr(
+                    source_model, "GROUP_LOADING_COUNT_ROLE"
+                ):
+                    status_counts = source_index.data(
+                        source_model.GROUP_STATUS_COUNTS_ROLE
                     )
-                    if not is_loading:
-                        loaded += 1
+                    loading_count = source_index.data(
+                        source_model.GROUP_LOADING_COUNT_ROLE
+                    )
+
+                if status_counts is not None and loading_count is not None:
+                    loaded = source_rows - loading_count
+                    source_out_of_sync = status_counts.get(
+                        source_model.STATUS_OUT_OF_SYNC, 0
+                    )
+                else:
+                    # Iterate through the source model items, counting how many items are being loaded
+                    # and how many have a status of out of sync
+                    loaded = 0
+                    source_out_of_sync = 0
+                    for row in range(source_rows):
+                        child_index = source_model.index(row, 0, source_index)
+
+                        status = child_index.data(source_model.STATUS_ROLE)
+                        if status == source_model.STATUS_OUT_OF_SYNC:
+                            source_out_of_sync += 1
+
+                        is_loading = (
+                            child_index.data(source_model.VIEW_ITEM_LOADING_ROLE)
+                            or False
+                        )
+                        if not is_loading:
+                            loaded += 1
 
                 out_of_sync_str = None
                 if loaded < source_rows:
@@ -270,13 +291,22 @@ class UIConfigAdvanced(HookClass):
                 else:
                     # The source model is done loading, check if there are any filters applied and indicate
                     # if there are any items filtered or not.
-                    proxy_out_of_sync = 0
-                    for row in range(proxy_rows):
-                        child_index = proxy_model.index(row, 0, proxy_index)
-                        # The status role and enum are defined on the source model
-                        status = child_index.data(source_model.STATUS_ROLE)
-                        if status == source_model.STATUS_OUT_OF_SYNC:
-                            proxy_out_of_sync += 1
+                    if proxy_rows == source_rows:
+                        # All items are accepted by the proxy model
+                        proxy_out_of_sync = source_out_of_sync
+                    elif hasattr(proxy_model, "get_group_status_counts"):
+                        # Use the status counts cached by the proxy model
+                        proxy_out_of_sync = proxy_model.get_group_status_counts(
+                            proxy_index
+                        ).get(source_model.STATUS_OUT_OF_SYNC, 0)
+                    else:
+                        proxy_out_of_sync = 0
+                        for row in range(proxy_rows):
+                            child_index = proxy_model.index(row, 0, proxy_index)
+                            # The status role and enum are defined on the source model
+                            status = child_index.data(source_model.STATUS_ROLE)
+                            if status == source_model.STATUS_OUT_OF_SYNC:
+                                proxy_out_of_sync += 1
 
                     if proxy_rows != source_rows:
                         # Filters are applied, display total and filtered items.
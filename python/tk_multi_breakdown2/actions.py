@@ -176,16 +176,16 @@ class UpdateToLatestVersionAction(Action):
             return
 
         items_to_update = self._manager.update_to_latest_version(self._file_items)
-
-        for file_item in items_to_update:
-            # The file item object that the model holds was updated by the manager.
-            # Emit a signal that the data has changed.
-            index = self._get_index_for_item(file_item)
-            self._model.dataChanged.emit(
-                index,
-                index,
-                [self._model.FILE_ITEM_ROLE, self._model.FILE_ITEM_SG_DATA_ROLE],
-            )
+        if items_to_update:
+            # Check for further updates soon after the items were updated
+            self._model.request_status_check()
+
+        # The file item objects that the model holds were updated by the manager.
+        # Notify the model that the data has changed.
+        self._model.notify_file_items_changed(
+            items_to_update,
+            [self._model.FILE_ITEM_ROLE, self._model.FILE_ITEM_SG_DATA_ROLE],
+        )
 
 
 class UpdateToSpecificVersionAction(Action):
@@ -218,11 +218,12 @@ class UpdateToSpecificVersionAction(Action):
         do_update = self._manager.update_to_specific_version(file_item, self._sg_data)
 
         if do_update:
+            # Check for further updates soon after the item was updated
+            self._model.request_status_check()
+
             # The file item object that the model holds was updated by the manager.
-            # Emit a signal that the data has changed.
-            index = self._get_index_for_item(file_item)
-            self._model.dataChanged.emit(
-                index,
-                index,
+            # Notify the model that the data has changed.
+            self._model.notify_file_items_changed(
+                [file_item],
                 [self._model.FILE_ITEM_ROLE, self._model.FILE_ITEM_SG_DATA_ROLE],
             )
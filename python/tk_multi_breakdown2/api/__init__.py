@@ -9,3 +9,8 @@
 # not expressly granted therein are reserved by Autodesk, Inc.
 
 from .manager import BreakdownManager, FileItem
+from .store import FileItemStore
+from .status_table import FileItemStatusTable
+from .thumbnail_atlas import ThumbnailAtlas
+from .thumbnail_cache import ThumbnailCache
+from .thumbnail_scheduler import ThumbnailScheduler
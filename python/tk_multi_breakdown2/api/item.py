@@ -46,6 +46,7 @@ class FileItem(object):
         self._loaded = loaded
         self._latest_published_file = None
         self._thumbnail_path = None
+        self._publish_key = None
 
     def __hash__(self):
         """Override the base method to allow FileItem objects to be hashable."""
@@ -151,6 +152,22 @@ class FileItem(object):
     @sg_data.setter
     def sg_data(self, value):
         self._sg_data = value
+        self._publish_key = None
+
+    @property
+    def publish_key(self):
+        """
+        Get or set the key that identifies all versions of the published file for this item.
+
+        The key is defined by the get published files hook, it is computed and set by
+        :meth:`BreakdownManager.get_publish_key`. The key is reset when the Flow Production
+        Tracking data is set.
+        """
+        return self._publish_key
+
+    @publish_key.setter
+    def publish_key(self, value):
+        self._publish_key = value
 
     @property
     def thumbnail_path(self):
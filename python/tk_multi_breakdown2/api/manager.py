@@ -8,20 +8,41 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import itertools
+import os
+import time
+from concurrent import futures
+
 import sgtk
 from tank.errors import TankHookMethodDoesNotExistError
 
 from .item import FileItem
+from .path_cache import PublishedFilePathCache
+from .store import FileItemStore
+from .thumbnail_atlas import ThumbnailAtlas, ThumbnailAtlasLockedError
+from .thumbnail_cache import ThumbnailCache
 from .. import constants
 
 
 class BreakdownManager(object):
     """This class is used for managing and executing file updates."""
 
+    # Counter to generate the task group ids of the async published file requests.
+    _task_group_counter = itertools.count()
+
+    # The max number of thumbnail atlas files kept on disk.
+    MAX_THUMBNAIL_ATLASES = 4
+    # The max number of thumbnail atlas files per thumbnail size, for the processes that
+    # display the thumbnails at the same size at the same time.
+    MAX_THUMBNAIL_ATLAS_SLOTS = 4
+
     def __init__(self, bundle):
         """Initialize the manager."""
 
         self._bundle = bundle
+        # The get published files hook instance, to compute the published file keys without
+        # creating a hook instance per key.
+        self._published_files_hook = None
 
     @sgtk.LogManager.log_timing
     def get_scene_objects(self, execute_in_main_thread=True):
@@ -60,6 +81,91 @@ class BreakdownManager(object):
         # Execute in the current thread
         return self._bundle.execute_hook_method("hook_scene_operations", "scan_scene")
 
+    def iter_scene_objects(self, batch_size=None):
+        """
+        Get an iterator over the current scene objects, in batches.
+
+        If the scene operations hook implements the `iter_scene_objects` method, the scene is
+        scanned progressively as the batches are consumed. Otherwise, the hook `scan_scene`
+        method is executed when the first batch is consumed, and its result is returned as a
+        single batch: the whole scene is then scanned at once, and the main thread is blocked
+        until the scan is done, regardless of the batch size and the time budget given to
+        :meth:`get_next_scene_objects`. The scan is not executed in a background task, since
+        the DCC functionality it needs is usually only safe to call from the main thread.
+
+        The batches should be consumed from the main thread, since scanning the scene will
+        likely need to execute DCC functionality (see :meth:`get_next_scene_objects`).
+
+        :param batch_size: The max number of scene objects per batch. If not provided, the
+            app setting `scene_objects_batch_size` is used.
+        :type batch_size: int
+
+        :return: An iterator of lists of scene objects, see :meth:`get_scene_objects`.
+        :rtype: Iterator[List[dict]]
+        """
+
+        if batch_size is None:
+            batch_size = self._bundle.get_setting("scene_objects_batch_size", 100)
+
+        try:
+            batches = self._bundle.execute_hook_method(
+                "hook_scene_operations",
+                "iter_scene_objects",
+                batch_size=max(batch_size or 1, 1),
+            )
+        except TankHookMethodDoesNotExistError:
+            batches = None
+
+        if batches is None:
+            # Fallback to scanning the whole scene at once, when the first batch is consumed.
+            batches = self._iter_scanned_scene_objects()
+
+        return iter(batches)
+
+    def _iter_scanned_scene_objects(self):
+        """
+        Get an iterator over the scene objects found by the scan_scene hook method, as a
+        single batch. The scene is scanned when the batch is consumed.
+
+        :return: An iterator of a single list of scene objects.
+        :rtype: Iterator[List[dict]]
+        """
+
+        yield self.get_scene_objects()
+
+    def get_next_scene_objects(self, scene_objects_iter, time_budget=0):
+        """
+        Consume the batches of scene objects from the given iterator, until the time budget is
+        spent.
+
+        This is used to scan the scene in time slices from the main thread, such that control
+        can be returned to the event loop between slices. At least one batch is consumed.
+
+        :param scene_objects_iter: The iterator of scene object batches, as returned by
+            :meth:`iter_scene_objects`.
+        :type scene_objects_iter: Iterator[List[dict]]
+        :param time_budget: The time budget (in milliseconds) to consume batches for. A value
+            of 0 or less consumes all batches.
+        :type time_budget: int
+
+        :return: The scene objects consumed, and True if all batches have been consumed.
+        :rtype: Tuple[List[dict], bool]
+        """
+
+        deadline = (
+            time.perf_counter() + time_budget / 1000.0
+            if time_budget and time_budget > 0
+            else None
+        )
+
+        scene_objects = []
+        for batch in scene_objects_iter:
+            scene_objects.extend(batch or [])
+            if deadline is not None and time.perf_counter() >= deadline:
+                return scene_objects, False
+
+        return scene_objects, True
+
     @sgtk.LogManager.log_timing
     def scan_scene(self, extra_fields=None, execute_in_main_thread=True):
         """
@@ -88,11 +194,22 @@ class BreakdownManager(object):
 
     @sgtk.LogManager.log_timing
     def get_published_files_from_file_paths(
-        self, file_paths, extra_fields=None, bg_task_manager=None
+        self,
+        file_paths,
+        extra_fields=None,
+        bg_task_manager=None,
+        use_cached_misses=True,
     ):
         """
         Query the Flow Production Tracking API to get the published files for the given file paths.
 
+        The file paths are split into chunks of the size defined by the app setting
+        `published_file_paths_chunk_size`, which are resolved concurrently in a thread pool, of
+        the size defined by the app setting `published_file_paths_max_workers`. When executed
+        async, all chunks are resolved by a single background task. See
+        `get_published_files_from_file_paths_by_chunk` to get the results of each chunk as
+        they arrive.
+
         :param file_paths: A list of file paths to get the published files from.
         :type file_paths: List[str]
         :param extra_fields: A list of Flow Production Tracking fields to append to the Flow Production Tracking query
@@ -101,6 +218,10 @@ class BreakdownManager(object):
         :param bg_task_manager: (optional) A background task manager to execute the request
             async. If not provided, the request will be executed synchronously.
         :type: BackgroundTaskManager
+        :param use_cached_misses: False will resolve again the file paths cached as not
+            having any published file (e.g. on a reload requested by the user), if the
+            published file path cache is enabled.
+        :type use_cached_misses: bool
 
         :return: The task id for the request is returned if executed async, else the published
             files data is returned if executed synchronosly.
@@ -110,36 +231,385 @@ class BreakdownManager(object):
         if not file_paths:
             return None if bg_task_manager else {}
 
-        # Get the published file fields to pass to the query
-        fields = self.get_published_file_fields()
-        if extra_fields is not None:
-            fields += extra_fields
-
-        # Get the published file filters defined in the config to pass to the query
-        filters = self.get_published_file_filters()
+        chunks = self._get_file_path_chunks(file_paths)
+        task_kwargs = self._get_find_publish_kwargs(extra_fields, use_cached_misses)
 
         # Option to run this in a background task since this can take some time to execute.
         if bg_task_manager:
             # Execute the request async and return the task id for the operation.
             return bg_task_manager.add_task(
-                sgtk.util.find_publish,
-                task_args=[self._bundle.sgtk, file_paths],
-                task_kwargs={
-                    "filters": filters,
-                    "fields": fields,
-                    "only_current_project": False,
-                },
+                self._find_publish_chunks,
+                task_args=[chunks],
+                task_kwargs=task_kwargs,
             )
 
         # No background task manager provided, execute the request synchronously and return
         # the published files data immediately.
-        return sgtk.util.find_publish(
-            self._bundle.sgtk,
-            file_paths,
-            filters=filters,
-            fields=fields,
-            only_current_project=False,
-        )
+        return self._find_publish_chunks(chunks, **task_kwargs)
+
+    def get_published_files_from_file_paths_by_chunk(
+        self,
+        file_paths,
+        bg_task_manager,
+        extra_fields=None,
+        use_cached_misses=True,
+    ):
+        """
+        Make async requests to get the published files for the given file paths, one
+        background task per chunk of file paths.
+
+        The file paths are split into chunks of the size defined by the app setting
+        `published_file_paths_chunk_size`. All tasks are added to the same task group. Each
+        task result contains the published files for its chunk only, such that the results can
+        be used as they arrive. The task group id is returned to track the tasks, and to stop
+        the remaining tasks with `BackgroundTaskManager.stop_task_group`.
+
+        The number of chunks resolved at once is bounded by the number of threads of the
+        background task manager, the app setting `published_file_paths_max_workers` does not
+        apply.
+
+        :param file_paths: A list of file paths to get the published files from.
+        :type file_paths: List[str]
+        :param bg_task_manager: The background task manager to execute the requests.
+        :type: BackgroundTaskManager
+        :param extra_fields: A list of Flow Production Tracking fields to append to the Flow
+            Production Tracking query when retreiving the published files.
+        :type extra_fields: List[str]
+        :param use_cached_misses: False will resolve again the file paths cached as not
+            having any published file (e.g. on a reload requested by the user), if the
+            published file path cache is enabled.
+        :type use_cached_misses: bool
+
+        :return: The task group id, or None if there are no file paths to resolve.
+        :rtype: str
+        """
+
+        if not file_paths:
+            return None
+
+        task_kwargs = self._get_find_publish_kwargs(extra_fields, use_cached_misses)
+        group_id = "find_publish_%s" % next(self._task_group_counter)
+        for chunk in self._get_file_path_chunks(file_paths):
+            bg_task_manager.add_task(
+                self._find_publish,
+                group=group_id,
+                task_args=[chunk],
+                task_kwargs=task_kwargs,
+            )
+        return group_id
+
+    def _get_find_publish_kwargs(self, extra_fields=None, use_cached_misses=True):
+        """
+        Get the keyword arguments to resolve the published files from file paths with
+        `_find_publish`.
+
+        :param extra_fields: The fields to retrieve in addition to the published file fields.
+        :type extra_fields: List[str]
+        :param use_cached_misses: False will resolve again the file paths cached as not
+            having any published file.
+        :type use_cached_misses: bool
+
+        :return: The keyword arguments.
+        :rtype: dict
+        """
+
+        # Get the published file fields to pass to the query
+        fields = self.get_published_file_fields()
+        if extra_fields is not None:
+            fields += extra_fields
+
+        return {
+            # Get the published file filters defined in the config to pass to the query
+            "filters": self.get_published_file_filters(),
+            "fields": fields,
+            "use_cached_misses": use_cached_misses,
+        }
+
+    def _find_publish_chunks(self, chunks, **kwargs):
+        """
+        Get the published files for the given chunks of file paths, resolved concurrently in a
+        thread pool of the size defined by the app setting `published_file_paths_max_workers`.
+
+        :param chunks: The chunks of file paths to get the published files from.
+        :type chunks: List[List[str]]
+        :param kwargs: The keyword arguments passed to `_find_publish`.
+
+        :return: The published file data, mapped by file path.
+        :rtype: dict
+        """
+
+        if len(chunks) == 1:
+            return self._find_publish(chunks[0], **kwargs)
+
+        max_workers = self._bundle.get_setting("published_file_paths_max_workers", 4)
+        published_files = {}
+        with futures.ThreadPoolExecutor(
+            max_workers=max(1, min(max_workers or 1, len(chunks)))
+        ) as executor:
+            chunk_futures = [
+                executor.submit(self._find_publish, chunk, **kwargs) for chunk in chunks
+            ]
+            for future in futures.as_completed(chunk_futures):
+                published_files.update(future.result())
+        return published_files
+
+    def _get_file_path_chunks(self, file_paths):
+        """
+        Split the given file paths into chunks to resolve their published files.
+
+        Duplicate file paths are removed, such that each path is resolved only once.
+
+        :param file_paths: The file paths to split.
+        :type file_paths: List[str]
+
+        :return: The file path chunks.
+        :rtype: List[List[str]]
+        """
+
+        unique_paths = list(dict.fromkeys(file_paths))
+        chunk_size = self._bundle.get_setting("published_file_paths_chunk_size", 0)
+        if not chunk_size or chunk_size <= 0:
+            return [unique_paths]
+
+        return [
+            unique_paths[i : i + chunk_size]
+            for i in range(0, len(unique_paths), chunk_size)
+        ]
+
+    def get_published_file_path_cache(self, fields=None, filters=None):
+        """
+        Get the persistent cache of the published files resolved from file paths.
+
+        The cache is stored in the app cache location. Only the entries resolved with the
+        given fields and filters will be found in the cache.
+
+        :param fields: The published file fields retrieved when resolving the paths.
+        :type fields: List[str]
+        :param filters: The published file filters applied when resolving the paths.
+        :type filters: List
+
+        :return: The published file path cache, or None if the cache is disabled by the app
+            setting `published_file_path_cache`, or the cache database cannot be opened.
+        :rtype: PublishedFilePathCache
+        """
+
+        if not self._bundle.get_setting("published_file_path_cache", False):
+            return None
+
+        try:
+            return PublishedFilePathCache(
+                os.path.join(self._bundle.cache_location, "published_file_paths.db"),
+                hit_ttl=self._bundle.get_setting(
+                    "published_file_path_cache_hit_ttl", 0
+                ),
+                miss_ttl=self._bundle.get_setting(
+                    "published_file_path_cache_miss_ttl", 0
+                ),
+                signature=PublishedFilePathCache.get_signature(fields, filters),
+            )
+        except PublishedFilePathCache.ERRORS as e:
+            self._bundle.logger.warning(
+                "Failed to open the published file path cache: %s" % e
+            )
+            return None
+
+    def get_thumbnail_cache(self):
+        """
+        Get the process-wide cache of decoded thumbnails, with its memory budget set from the
+        app setting `thumbnail_cache_size` (in MB).
+
+        :return: The thumbnail cache.
+        :rtype: ThumbnailCache
+        """
+
+        cache_size = self._bundle.get_setting("thumbnail_cache_size", 0) or 0
+        return ThumbnailCache.instance(max_bytes=cache_size * 1024 * 1024)
+
+    def get_thumbnail_atlas(self, size, create=True):
+        """
+        Get the atlas of the thumbnails decoded to the given size.
+
+        The atlas is stored in the app cache location, one atlas file per thumbnail size.
+        An atlas file is only open in one process at a time, another atlas file is used for
+        the same size if it is already open in another process (e.g. the app is open in two
+        DCC sessions), up to `MAX_THUMBNAIL_ATLAS_SLOTS` files. Only the most recently used
+        atlas files are kept, the other ones are removed when a new atlas file is created.
+
+        :param size: The size (width, height) of the thumbnails.
+        :type size: Tuple[int, int]
+        :param create: True will create the atlas file if it does not exist yet.
+        :type create: bool
+
+        :return: The thumbnail atlas, or None if the atlas file does not exist, all the atlas
+            files for the size are open in other processes, or the atlas is disabled by the
+            app setting `thumbnail_atlas_size`.
+        :rtype: ThumbnailAtlas
+        """
+
+        atlas_size = self._bundle.get_setting("thumbnail_atlas_size", 0) or 0
+        if atlas_size <= 0 or not size:
+            return None
+
+        atlas_dir = os.path.join(self._bundle.cache_location, "thumbnail_atlas")
+        atlas_name = "thumbnails_%dx%d" % (int(size[0]), int(size[1]))
+        for slot in range(self.MAX_THUMBNAIL_ATLAS_SLOTS):
+            atlas_path = os.path.join(
+                atlas_dir,
+                "%s_%d.atlas" % (atlas_name, slot) if slot else "%s.atlas" % atlas_name,
+            )
+            exists = os.path.exists(atlas_path)
+            if not exists:
+                if not create:
+                    continue
+                self._remove_thumbnail_atlases(
+                    atlas_dir, self.MAX_THUMBNAIL_ATLASES - 1
+                )
+
+            try:
+                atlas = ThumbnailAtlas(atlas_path, max_bytes=atlas_size * 1024 * 1024)
+            except ThumbnailAtlasLockedError:
+                # The atlas is open in another process, try the next one.
+                continue
+
+            if exists:
+                # Mark the atlas as the most recently used
+                os.utime(atlas_path, None)
+            return atlas
+
+        return None
+
+    def _remove_thumbnail_atlases(self, atlas_dir, keep):
+        """
+        Remove the least recently used thumbnail atlas files. The atlas files that are open
+        in other processes are not removed, the next least recently used ones are removed
+        instead.
+
+        :param atlas_dir: The directory of the atlas files.
+        :type atlas_dir: str
+        :param keep: The number of most recently used atlas files to keep.
+        :type keep: int
+        """
+
+        if not os.path.isdir(atlas_dir):
+            return
+
+        atlas_paths = [
+            os.path.join(atlas_dir, name)
+            for name in os.listdir(atlas_dir)
+            if name.endswith(".atlas")
+        ]
+        atlas_paths.sort(key=os.path.getmtime)
+        count = len(atlas_paths)
+        for atlas_path in atlas_paths:
+            if count <= max(keep, 0):
+                break
+            try:
+                if ThumbnailAtlas.remove(atlas_path):
+                    count -= 1
+            except OSError as e:
+                self._bundle.logger.debug(
+                    "Failed to remove thumbnail atlas %s: %s" % (atlas_path, e)
+                )
+
+    def _find_publish(
+        self, file_paths, filters=None, fields=None, use_cached_misses=True
+    ):
+        """
+        Get the published files for the given file paths.
+
+        If the published file path cache is enabled, only the paths that are not cached (or
+        expired) are resolved with `sgtk.util.find_publish`. The cached published files are
+        validated against their `updated_at` field (one query per chunk of published file
+        ids), and resolved again if they have been modified or removed since they were
+        cached. If the cache cannot be read, all paths are resolved without the cache.
+
+        :param file_paths: A list of file paths to get the published files from.
+        :type file_paths: List[str]
+        :param filters: The published file filters to apply to the query.
+        :type filters: List
+        :param fields: The published file fields to retrieve.
+        :type fields: List[str]
+        :param use_cached_misses: False will resolve again the file paths cached as not
+            having any published file.
+        :type use_cached_misses: bool
+
+        :return: The published file data, mapped by file path.
+        :rtype: dict
+        """
+
+        path_cache = self.get_published_file_path_cache(fields=fields, filters=filters)
+        cached = None
+        if path_cache:
+            try:
+                cached = path_cache.get(file_paths)
+            except PublishedFilePathCache.ERRORS as e:
+                self._bundle.logger.warning(
+                    "Failed to read the published file path cache: %s" % e
+                )
+
+        if cached is None:
+            return sgtk.util.find_publish(
+                self._bundle.sgtk,
+                file_paths,
+                filters=filters,
+                fields=fields,
+                only_current_project=False,
+            )
+
+        # Keep track of the published files modification date to validate the cache.
+        fields = list(fields or [])
+        if "updated_at" not in fields:
+            fields.append("updated_at")
+
+        published_files, missing_paths, uncached_paths = cached
+        if not use_cached_misses:
+            uncached_paths.extend(missing_paths)
+
+        # Validate the cached published files, with one query per chunk of published file
+        # ids of the same size as the chunks of file paths.
+        if published_files:
+            cached_ids = list(
+                dict.fromkeys(sg_data["id"] for sg_data in published_files.values())
+            )
+            chunk_size = self._bundle.get_setting("published_file_paths_chunk_size", 0)
+            if not chunk_size or chunk_size <= 0:
+                chunk_size = len(cached_ids)
+            updated_at_by_id = {}
+            for i in range(0, len(cached_ids), chunk_size):
+                for sg_data in self._bundle.sgtk.shotgun.find(
+                    "PublishedFile",
+                    [["id", "in", cached_ids[i : i + chunk_size]]],
+                    ["updated_at"],
+                ):
+                    updated_at_by_id[sg_data["id"]] = sg_data.get("updated_at")
+            for path, sg_data in list(published_files.items()):
+                if sg_data["id"] not in updated_at_by_id or updated_at_by_id[
+                    sg_data["id"]
+                ] != sg_data.get("updated_at"):
+                    del published_files[path]
+                    uncached_paths.append(path)
+
+        if uncached_paths:
+            found_published_files = sgtk.util.find_publish(
+                self._bundle.sgtk,
+                uncached_paths,
+                filters=filters,
+                fields=fields,
+                only_current_project=False,
+            )
+            try:
+                path_cache.set_hits(found_published_files)
+                path_cache.set_misses(
+                    [p for p in uncached_paths if p not in found_published_files]
+                )
+            except PublishedFilePathCache.ERRORS as e:
+                # The published files are resolved, they will be resolved again next time.
+                self._bundle.logger.warning(
+                    "Failed to write the published file path cache: %s" % e
+                )
+            published_files.update(found_published_files)
+
+        return published_files
 
     def get_file_items(self, scene_objects, published_files):
         """
@@ -267,16 +737,24 @@ class BreakdownManager(object):
         return result
 
     def get_published_files_for_items(
-        self, items, data_retriever=None, extra_fields=None
+        self, items, data_retriever=None, extra_fields=None, published_file_filters=None
     ):
         """
         Get all published files (history) for the given items.
 
+        Large queries are split by the hook into several concurrent queries, see the app
+        settings `published_files_query_max_items` and `published_files_query_max_filter_size`.
+
         :param items: the list of :class`FileItem` we want to get published files for.
         :type items: List[FileItem]
         :param data_retreiver: If provided, the api request will be async. The default value
             will execute the api request synchronously.
         :type data_retriever: ShotgunDataRetriever
+        :param extra_fields: Additional fields to retrieve for the published files.
+        :type extra_fields: List[str]
+        :param published_file_filters: Additional filters to apply to the published file
+            query, on top of the history published file filters defined by the app.
+        :type published_file_filters: List[List[str]]
 
         :return: If the request is async, then the request task id is returned, else the
             published file data result from the api request.
@@ -291,6 +769,8 @@ class BreakdownManager(object):
             fields += extra_fields
 
         filters = self.get_history_published_file_filters()
+        if published_file_filters:
+            filters = filters + published_file_filters
 
         return self._bundle.execute_hook_method(
             "hook_get_published_files",
@@ -301,6 +781,319 @@ class BreakdownManager(object):
             published_file_filters=filters,
         )
 
+    def get_latest_published_files_for_items(
+        self, items, data_retriever=None, extra_fields=None, published_file_filters=None
+    ):
+        """
+        Get the published files required to determine the latest published file for the
+        given items.
+
+        If the app setting `latest_published_files_only` is True, only the latest published
+        file for each item is queried, else the full history is queried (the same as
+        :meth:`get_published_files_for_items`). In both cases, the published files are
+        ordered by version number in descending order, such that the first published file
+        found for an item is its latest.
+
+        :param items: the list of :class`FileItem` we want to get published files for.
+        :type items: List[FileItem]
+        :param data_retreiver: If provided, the api request will be async. The default value
+            will execute the api request synchronously.
+        :type data_retriever: ShotgunDataRetriever
+        :param extra_fields: Additional fields to retrieve for the published files.
+        :type extra_fields: List[str]
+        :param published_file_filters: Additional filters to apply to the published file
+            query, on top of the history published file filters defined by the app.
+        :type published_file_filters: List[List[str]]
+
+        :return: If the request is async, then the request task id is returned, else the
+            published file data result from the api request.
+        :rtype: str | dict
+        """
+
+        if not self._bundle.get_setting("latest_published_files_only", False):
+            return self.get_published_files_for_items(
+                items,
+                data_retriever=data_retriever,
+                extra_fields=extra_fields,
+                published_file_filters=published_file_filters,
+            )
+
+        if not items:
+            return None if data_retriever else {}
+
+        fields = self.get_published_file_fields()
+        if extra_fields:
+            fields += extra_fields
+
+        filters = self.get_history_published_file_filters()
+        if published_file_filters:
+            filters = filters + published_file_filters
+
+        return self._bundle.execute_hook_method(
+            "hook_get_published_files",
+            "get_latest_published_files_for_items",
+            items=items,
+            data_retriever=data_retriever,
+            extra_fields=fields,
+            published_file_filters=filters,
+        )
+
+    def get_published_files_over_fetch_ratio(self, items, published_files):
+        """
+        Get the ratio of the given published files that do not belong to any of the items.
+
+        This can be used to measure how precise the published file query filters are for
+        the given items.
+
+        :param items: The list of :class`FileItem` that the published files were queried for.
+        :type items: List[FileItem]
+        :param published_files: The published file data returned by the query.
+        :type published_files: List[dict]
+
+        :return: The over-fetch ratio, from 0.0 to 1.0.
+        :rtype: float
+        """
+
+        return self._bundle.execute_hook_method(
+            "hook_get_published_files",
+            "get_published_files_over_fetch_ratio",
+            items=items,
+            published_files=published_files,
+        )
+
+    def get_published_file_key(self, sg_data):
+        """
+        Get the key that identifies all versions of the given published file, by executing
+        the `get_published_file_key` method of the get published files hook.
+
+        :param sg_data: The published file data.
+        :type sg_data: dict
+
+        :return: The published file key, or None if no published file data is given.
+        :rtype: tuple
+        """
+
+        if not sg_data:
+            return None
+
+        if self._published_files_hook is None:
+            hook_path = self._bundle.get_setting("hook_get_published_files")
+            self._published_files_hook = self._bundle.create_hook_instance(hook_path)
+        return self._published_files_hook.get_published_file_key(sg_data)
+
+    def get_publish_key(self, item):
+        """
+        Get the key that identifies all versions of the published file for the given item.
+
+        The key is cached by the item, until its published file data is set again.
+
+        :param item: The item to get the published file key for.
+        :type item: FileItem
+
+        :return: The published file key, or None if the item does not have any published
+            file data.
+        :rtype: tuple
+        """
+
+        if item.publish_key is None and item.sg_data:
+            item.publish_key = self.get_published_file_key(item.sg_data)
+        return item.publish_key
+
+    def get_latest_published_files_index(self, published_files):
+        """
+        Index the given published files by their published file key, keeping only the
+        highest version for each key.
+
+        The index is built in a single pass over the published files, such that the full
+        history of each published file does not need to be kept. When multiple published
+        files have the same highest version, the first one is kept.
+
+        :param published_files: The published file data to index.
+        :type published_files: List[dict]
+
+        :return: The latest published file data, by published file key (see
+            :meth:`get_published_file_key`).
+        :rtype: dict
+        """
+
+        latest_published_files = {}
+
+        for sg_data in published_files or []:
+            key = self.get_published_file_key(sg_data)
+            latest = latest_published_files.get(key)
+            if latest is None or (sg_data.get("version_number") or 0) > (
+                latest.get("version_number") or 0
+            ):
+                latest_published_files[key] = sg_data
+
+        return latest_published_files
+
+    def get_latest_published_files_mapping(self, items, published_files):
+        """
+        Get the latest published file for each of the given items, from the given published
+        files.
+
+        :param items: The list of :class`FileItem` to get the latest published file for.
+        :type items: List[FileItem]
+        :param published_files: The published file data to find the latest published files
+            in, e.g. the result of :meth:`get_published_files_for_items`.
+        :type published_files: List[dict]
+
+        :return: The latest published file data, by item. Items without any published file
+            data, or without any matching published file, are not included.
+        :rtype: Dict[FileItem, dict]
+        """
+
+        latest_published_files = self.get_latest_published_files_index(published_files)
+
+        result = {}
+        for item in items:
+            if not item.sg_data:
+                continue
+            latest = latest_published_files.get(self.get_publish_key(item))
+            if latest is not None:
+                result[item] = latest
+        return result
+
+    def get_latest_published_files_changes(
+        self, latest_published_files, current_latest_published_files, merge=False
+    ):
+        """
+        Get the changes to apply to the current latest published files, from the given
+        latest published files index.
+
+        :param latest_published_files: The latest published file data, by published file
+            key, as returned by :meth:`get_latest_published_files_index`.
+        :type latest_published_files: dict
+        :param current_latest_published_files: The current latest published file id and
+            version number, by published file key. The id is None if the current latest
+            published file is not known.
+        :type current_latest_published_files: Dict[tuple, Tuple[int, int]]
+        :param merge: True if the index only contains a subset of the published files (e.g.
+            the published files created since the last query), in which case a key only
+            changes if the index contains a higher version for it. False if the index contains
+            all the published files, in which case a key changes if its latest published file
+            is different, or was not found.
+        :type merge: bool
+
+        :return: The changed latest published file data, by published file key. The data is
+            None if the key no longer has a latest published file.
+        :rtype: dict
+        """
+
+        changes = {}
+
+        for key, (current_id, current_version) in (
+            current_latest_published_files or {}
+        ).items():
+            latest = latest_published_files.get(key)
+            if merge:
+                if latest is None or (current_version or 0) >= (
+                    latest.get("version_number") or 0
+                ):
+                    continue
+            elif (latest or {}).get("id") == current_id:
+                continue
+            changes[key] = latest
+
+        return changes
+
+    def resolve_latest_published_files(
+        self,
+        items,
+        current_latest_published_files=None,
+        merge=False,
+        extra_fields=None,
+        published_file_filters=None,
+        bg_task_manager=None,
+    ):
+        """
+        Query the published files to determine the latest published file for the given
+        items, and resolve the result to the latest published file data by published file key.
+
+        The query result is indexed, and compared to the current latest published files, in
+        the same thread as the query is executed. When executed async, the full query result
+        is not returned to the calling thread, only the compact resolved data is.
+
+        The resolved data is a dictionary with the following key-values:
+
+            latest_published_files (dict)
+                The latest published file data, by published file key. If the current latest
+                published files are given, only the changed keys are included (see
+                :meth:`get_latest_published_files_changes`).
+            published_file_count (int)
+                The number of published files returned by the query.
+            over_fetch_ratio (float)
+                The ratio of published files returned that do not belong to any of the items.
+            max_created_at (datetime)
+                The most recent creation date of the published files returned, or None if
+                the creation date was not queried.
+
+        :param items: The list of :class`FileItem` to get the latest published files for.
+        :type items: List[FileItem]
+        :param current_latest_published_files: The current latest published file id and
+            version number, by published file key.
+        :type current_latest_published_files: Dict[tuple, Tuple[int, int]]
+        :param merge: True if the query only returns a subset of the published files, see
+            :meth:`get_latest_published_files_changes`.
+        :type merge: bool
+        :param extra_fields: Additional fields to retrieve for the published files.
+        :type extra_fields: List[str]
+        :param published_file_filters: Additional filters to apply to the published file
+            query.
+        :type published_file_filters: List[List[str]]
+        :param bg_task_manager: (optional) A background task manager to execute the request
+            async. If not provided, the request will be executed synchronously.
+        :type: BackgroundTaskManager
+
+        :return: The task group id for the request is returned if executed async, else the
+            resolved data is returned if executed synchronously.
+        :rtype: str | dict
+        """
+
+        if bg_task_manager:
+            group_id = "latest_publish_%s" % next(self._task_group_counter)
+            bg_task_manager.add_task(
+                self.resolve_latest_published_files,
+                group=group_id,
+                task_args=[list(items)],
+                task_kwargs={
+                    "current_latest_published_files": current_latest_published_files,
+                    "merge": merge,
+                    "extra_fields": extra_fields,
+                    "published_file_filters": published_file_filters,
+                },
+            )
+            return group_id
+
+        published_files = (
+            self.get_latest_published_files_for_items(
+                items,
+                extra_fields=extra_fields,
+                published_file_filters=published_file_filters,
+            )
+            or []
+        )
+
+        latest_published_files = self.get_latest_published_files_index(published_files)
+        if current_latest_published_files is not None:
+            latest_published_files = self.get_latest_published_files_changes(
+                latest_published_files, current_latest_published_files, merge=merge
+            )
+
+        created_dates = [
+            pf["created_at"] for pf in published_files if pf.get("created_at")
+        ]
+
+        return {
+            "latest_published_files": latest_published_files,
+            "published_file_count": len(published_files),
+            "over_fetch_ratio": self.get_published_files_over_fetch_ratio(
+                items, published_files
+            ),
+            "max_created_at": max(created_dates) if created_dates else None,
+        }
+
     def get_published_file_history(self, item, extra_fields=None, data_retriever=None):
         """
         Get the published history for the selected item. It will gather all the published files with the same context
@@ -407,10 +1200,27 @@ class BreakdownManager(object):
         # back to their FileItem object.
         updated_items = []
         if items_to_update:
+            file_item_store = FileItemStore(items_by_dict.keys())
+            item_ids_to_update = set()
+            for item_to_update in items_to_update:
+                if isinstance(item_to_update, FileItem):
+                    file_item = file_item_store.find(item_to_update)
+                    if file_item:
+                        item_ids_to_update.add(id(file_item))
+                    continue
+
+                # Look up the file item by its path before the update.
+                old_path = (item_to_update.get("extra_data") or {}).get("old_path")
+                for file_item in file_item_store.get_by_path(old_path):
+                    if file_item.node_name == item_to_update.get(
+                        "node_name"
+                    ) and file_item.node_type == item_to_update.get("node_type"):
+                        item_ids_to_update.add(id(file_item))
+
             # Only update the file item if specified. Updating the item will affect the data
             # model directly
             for item, item_dict in items_by_dict.items():
-                if item not in items_to_update:
+                if id(item) not in item_ids_to_update:
                     continue
                 item.sg_data = item.latest_published_file
                 item.path = item_dict["path"]
@@ -0,0 +1,334 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import contextlib
+import datetime
+import hashlib
+import json
+import os
+import sqlite3
+import time
+
+
+class PublishedFilePathCache(object):
+    """
+    A persistent cache of the published files resolved from file paths.
+
+    The cache stores both the paths that resolved to a published file (hits), and the paths
+    that did not resolve to any published file (misses). Hits and misses each have their own
+    time to live. The cache is stored in a SQLite database file, such that it persists across
+    sessions.
+
+    Each entry is stored with a signature of the query that resolved it (e.g. the fields and
+    filters), entries resolved by a different query are considered not cached.
+
+    The cache database may be shared by several sessions. The errors raised when it cannot be
+    read or written (e.g. it is locked by another session, or corrupt) are listed by `ERRORS`,
+    callers are expected to resolve the published files without the cache on these errors.
+
+    The published file data is stored as JSON, the datetime values are stored as tagged ISO
+    8601 strings and decoded back to datetime objects. Entries that cannot be decoded (e.g.
+    written by a previous version of the cache) are considered not cached.
+    """
+
+    ERRORS = (sqlite3.Error, OSError, ValueError, TypeError)
+
+    # The key of the JSON objects holding a datetime value.
+    DATETIME_KEY = "__datetime__"
+
+    def __init__(self, db_path, hit_ttl=86400, miss_ttl=3600, signature=None):
+        """
+        Constructor.
+
+        :param db_path: The path to the SQLite database file. It will be created if it does
+            not exist.
+        :type db_path: str
+        :param hit_ttl: The time (in seconds) that a resolved published file is cached for.
+            A value of 0 or less will not cache hits.
+        :type hit_ttl: int
+        :param miss_ttl: The time (in seconds) that a path without any published file is
+            cached for. A value of 0 or less will not cache misses.
+        :type miss_ttl: int
+        :param signature: The signature of the query used to resolve the published files.
+        :type signature: str
+        """
+
+        self._db_path = db_path
+        self._hit_ttl = hit_ttl or 0
+        self._miss_ttl = miss_ttl or 0
+        self._signature = signature or ""
+
+        db_dir = os.path.dirname(self._db_path)
+        if db_dir and not os.path.exists(db_dir):
+            os.makedirs(db_dir)
+
+        with self._connect() as connection:
+            connection.execute(
+                """
+                CREATE TABLE IF NOT EXISTS published_file_paths (
+                    path TEXT PRIMARY KEY,
+                    signature TEXT NOT NULL,
+                    cached_at REAL NOT NULL,
+                    publish_id INTEGER,
+                    sg_data TEXT
+                )
+                """
+            )
+
+    @property
+    def db_path(self):
+        """Get the path to the SQLite database file."""
+        return self._db_path
+
+    @staticmethod
+    def get_signature(fields, filters):
+        """
+        Get the signature of a published file query.
+
+        :param fields: The fields retrieved by the query.
+        :type fields: List[str]
+        :param filters: The filters applied to the query.
+        :type filters: List
+
+        :return: The query signature.
+        :rtype: str
+        """
+
+        data = repr((sorted(set(fields or [])), filters or []))
+        return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def normalize_path(path):
+        """
+        Normalize the given path to use it as a cache key.
+
+        :param path: The path to normalize.
+        :type path: str
+
+        :return: The normalized path.
+        :rtype: str
+        """
+
+        return os.path.normcase(os.path.normpath(path))
+
+    @classmethod
+    def encode_data(cls, sg_data):
+        """
+        Encode the given published file data to store it in the cache.
+
+        :param sg_data: The published file data.
+        :type sg_data: dict
+
+        :return: The JSON encoded data.
+        :rtype: str
+        """
+
+        def default(value):
+            if isinstance(value, datetime.datetime):
+                return {cls.DATETIME_KEY: value.isoformat()}
+            raise TypeError(
+                "Object of type %s is not JSON serializable" % type(value).__name__
+            )
+
+        return json.dumps(sg_data, default=default)
+
+    @classmethod
+    def decode_data(cls, data):
+        """
+        Decode the published file data stored in the cache.
+
+        :param data: The JSON encoded data, as returned by `encode_data`.
+        :type data: str
+
+        :return: The published file data.
+        :rtype: dict
+
+        :raises ValueError: If the data is not valid.
+        """
+
+        def object_hook(value):
+            if len(value) == 1 and cls.DATETIME_KEY in value:
+                return datetime.datetime.fromisoformat(value[cls.DATETIME_KEY])
+            return value
+
+        return json.loads(data, object_hook=object_hook)
+
+    def get(self, paths, now=None):
+        """
+        Look up the given paths in the cache.
+
+        :param paths: The paths to look up.
+        :type paths: List[str]
+        :param now: The current time, as returned by `time.time`. Defaults to the current
+            time.
+        :type now: float
+
+        :return: A tuple containing (1) a mapping of the paths to their cached published file
+            data, (2) the list of paths cached as not having a published file, and (3) the list
+            of paths that are not cached or expired.
+        :rtype: Tuple[dict, List[str], List[str]]
+        """
+
+        now = time.time() if now is None else now
+
+        paths_by_key = {}
+        for path in paths:
+            paths_by_key.setdefault(self.normalize_path(path), []).append(path)
+
+        rows = {}
+        keys = list(paths_by_key.keys())
+        with self._connect() as connection:
+            # Query in batches to respect the SQLite max number of variables
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                cursor = connection.execute(
+                    "SELECT path, signature, cached_at, publish_id, sg_data "
+                    "FROM published_file_paths WHERE path IN (%s)"
+                    % ",".join("?" * len(batch)),
+                    batch,
+                )
+                for row in cursor:
+                    rows[row[0]] = row
+
+        hits = {}
+        misses = []
+        uncached = []
+        for key, key_paths in paths_by_key.items():
+            row = rows.get(key)
+            if row is None or row[1] != self._signature:
+                uncached.extend(key_paths)
+                continue
+
+            _, _, cached_at, publish_id, sg_data = row
+            age = now - cached_at
+            if publish_id is None:
+                if age < self._miss_ttl:
+                    misses.extend(key_paths)
+                else:
+                    uncached.extend(key_paths)
+            elif age < self._hit_ttl:
+                try:
+                    published_file = self.decode_data(sg_data)
+                except (TypeError, ValueError):
+                    # The entry is resolved again, and replaced.
+                    uncached.extend(key_paths)
+                    continue
+                for path in key_paths:
+                    hits[path] = published_file
+            else:
+                uncached.extend(key_paths)
+
+        return hits, misses, uncached
+
+    def set_hits(self, published_files, now=None):
+        """
+        Cache the published files resolved for the given paths.
+
+        :param published_files: A mapping of paths to their published file data.
+        :type published_files: dict
+        :param now: The time the published files were resolved at. Defaults to the current
+            time.
+        :type now: float
+        """
+
+        if self._hit_ttl <= 0 or not published_files:
+            return
+
+        now = time.time() if now is None else now
+        rows = [
+            (
+                self.normalize_path(path),
+                self._signature,
+                now,
+                sg_data["id"],
+                self.encode_data(sg_data),
+            )
+            for path, sg_data in published_files.items()
+        ]
+        self._write(rows)
+
+    def set_misses(self, paths, now=None):
+        """
+        Cache the given paths as not having any published file.
+
+        :param paths: The paths without any published file.
+        :type paths: List[str]
+        :param now: The time the paths were resolved at. Defaults to the current time.
+        :type now: float
+        """
+
+        if self._miss_ttl <= 0 or not paths:
+            return
+
+        now = time.time() if now is None else now
+        rows = [
+            (self.normalize_path(path), self._signature, now, None, None)
+            for path in paths
+        ]
+        self._write(rows)
+
+    def invalidate(self, paths):
+        """
+        Remove the given paths from the cache.
+
+        :param paths: The paths to remove.
+        :type paths: List[str]
+        """
+
+        keys = list(set(self.normalize_path(path) for path in paths))
+        with self._connect() as connection:
+            for i in range(0, len(keys), 500):
+                batch = keys[i : i + 500]
+                connection.execute(
+                    "DELETE FROM published_file_paths WHERE path IN (%s)"
+                    % ",".join("?" * len(batch)),
+                    batch,
+                )
+
+    def clear(self):
+        """Remove all entries from the cache."""
+
+        with self._connect() as connection:
+            connection.execute("DELETE FROM published_file_paths")
+
+    def _write(self, rows):
+        """
+        Insert or replace the given rows in the cache.
+
+        :param rows: The rows to write.
+        :type rows: List[tuple]
+        """
+
+        with self._connect() as connection:
+            connection.executemany(
+                "INSERT OR REPLACE INTO published_file_paths "
+                "(path, signature, cached_at, publish_id, sg_data) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+
+    @contextlib.contextmanager
+    def _connect(self):
+        """
+        Open a connection to the cache database, commit the transaction and close the
+        connection on exit.
+
+        A new connection is opened for each operation, since the cache may be accessed from
+        background threads and SQLite connections cannot be shared across threads.
+
+        :return: The database connection.
+        :rtype: sqlite3.Connection
+        """
+
+        connection = sqlite3.connect(self._db_path, timeout=10)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -0,0 +1,467 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import array
+
+
+class FileItemStatusTable(object):
+    """
+    A columnar table of the data that determines the status of file items.
+
+    Each file item is stored as a row, with its current version number, its highest version
+    number, its locked flag, its loading flag and its status stored in their own typed array
+    (column). The aggregates of each group (the number of rows per status, and the number of
+    rows loading) are updated incrementally as rows are written or removed, such that the
+    status of a row, and the aggregates and status of a group are read in constant time.
+
+    When the highest versions of many rows change at once (e.g. the latest published files
+    are retrieved), `update_rows` writes the highest version column, and recomputes the
+    statuses of all rows and the group status counts from the columns in one pass.
+    """
+
+    # File item status enum, the same values as the file model status.
+    (
+        STATUS_NONE,
+        STATUS_UP_TO_DATE,
+        STATUS_OUT_OF_SYNC,
+        STATUS_LOCKED,
+    ) = range(4)
+
+    # The number of status values, to index the group status counts.
+    STATUS_COUNT = 4
+
+    # The group code of rows that do not belong to any group.
+    NO_GROUP = -1
+
+    def __init__(self):
+        """Constructor."""
+
+        self.clear()
+
+    def __len__(self):
+        """Return the number of rows in the table."""
+        return len(self._row_keys)
+
+    def __contains__(self, key):
+        """Return True if the table has a row for the given key."""
+        return key in self._rows
+
+    @classmethod
+    def compute_status(cls, current_version, highest_version, locked):
+        """
+        Compute the status of a file item.
+
+        :param current_version: The version number of the file item.
+        :type current_version: int
+        :param highest_version: The highest version number available for the file item, or
+            0 if not known yet.
+        :type highest_version: int
+        :param locked: True if the file item is locked.
+        :type locked: bool
+
+        :return: The file item status.
+        :rtype: int
+        """
+
+        if locked:
+            return cls.STATUS_LOCKED
+
+        if not highest_version:
+            # Item may still loading, too early to determine the status.
+            return cls.STATUS_NONE
+
+        if current_version < highest_version:
+            return cls.STATUS_OUT_OF_SYNC
+
+        return cls.STATUS_UP_TO_DATE
+
+    def clear(self):
+        """Remove all rows from the table."""
+
+        # The row index by key, and the key of each row.
+        self._rows = {}
+        self._row_keys = []
+
+        # The table columns.
+        self._current_versions = array.array("q")
+        self._highest_versions = array.array("q")
+        self._locked = array.array("B")
+        self._loading = array.array("B")
+        self._statuses = array.array("B")
+        self._groups = array.array("l")
+
+        # The group ids are stored as integer codes in the table.
+        self._group_codes = {}
+        self._group_ids = []
+
+        # The group aggregates, indexed by group code: the number of rows per status (flat,
+        # indexed by group code and status), and the number of rows loading.
+        self._group_status_counts = array.array("l")
+        self._group_loading_counts = array.array("l")
+
+    def set_row(self, key, current_version, highest_version, locked, group_id=None):
+        """
+        Add or update the row for the given key.
+
+        :param key: The key of the row (e.g. the file item identity).
+        :type key: hashable
+        :param current_version: The version number of the file item.
+        :type current_version: int
+        :param highest_version: The highest version number available for the file item, or
+            None if not known yet.
+        :type highest_version: int
+        :param locked: True if the file item is locked.
+        :type locked: bool
+        :param group_id: The id of the group the file item belongs to, or None if it does not
+            belong to any group.
+        :type group_id: str
+        """
+
+        group_code = self._get_group_code(group_id)
+        current_version = current_version or 0
+        highest_version = highest_version or 0
+        status = self.compute_status(current_version, highest_version, locked)
+
+        row = self._rows.get(key)
+        if row is None:
+            self._rows[key] = len(self._row_keys)
+            self._row_keys.append(key)
+            self._current_versions.append(current_version)
+            self._highest_versions.append(highest_version)
+            self._locked.append(1 if locked else 0)
+            self._loading.append(0)
+            self._statuses.append(status)
+            self._groups.append(group_code)
+            self._add_to_group(group_code, status, 0)
+        else:
+            self._remove_from_group(
+                self._groups[row], self._statuses[row], self._loading[row]
+            )
+            self._current_versions[row] = current_version
+            self._highest_versions[row] = highest_version
+            self._locked[row] = 1 if locked else 0
+            self._statuses[row] = status
+            self._groups[row] = group_code
+            self._add_to_group(group_code, status, self._loading[row])
+
+    def update_rows(self, keys, highest_versions):
+        """
+        Set the highest version numbers of the rows for the given keys, and recompute the
+        statuses of all rows and the group status counts from the table columns.
+
+        :param keys: The keys of the rows to update. Keys that are not in the table are
+            ignored.
+        :type keys: List[hashable]
+        :param highest_versions: The highest version number of each row, or None if not known
+            yet.
+        :type highest_versions: List[int]
+
+        :return: The keys of the rows whose status changed.
+        :rtype: List[hashable]
+        """
+
+        for key, highest_version in zip(keys, highest_versions):
+            row = self._rows.get(key)
+            if row is not None:
+                self._highest_versions[row] = highest_version or 0
+
+        return self._compute_statuses()
+
+    def set_loading(self, key, loading):
+        """
+        Set whether or not the row for the given key is loading (e.g. its thumbnail is being
+        retrieved).
+
+        :param key: The key of the row.
+        :type key: hashable
+        :param loading: True if the row is loading.
+        :type loading: bool
+
+        :return: True if the table has a row for the key, else False.
+        :rtype: bool
+        """
+
+        row = self._rows.get(key)
+        if row is None:
+            return False
+
+        loading = 1 if loading else 0
+        delta = loading - self._loading[row]
+        if delta:
+            self._loading[row] = loading
+            group_code = self._groups[row]
+            if group_code != self.NO_GROUP:
+                self._group_loading_counts[group_code] += delta
+        return True
+
+    def clear_loading(self):
+        """Set all rows as not loading."""
+
+        self._loading = array.array("B", [0]) * len(self._row_keys)
+        self._group_loading_counts = array.array("l", [0]) * len(self._group_ids)
+
+    def remove_row(self, key):
+        """
+        Remove the row for the given key.
+
+        The last row is moved to the removed row, such that the columns do not need to be
+        shifted.
+
+        :param key: The key of the row.
+        :type key: hashable
+
+        :return: True if the row was removed, else False if the table does not have a row for
+            the key.
+        :rtype: bool
+        """
+
+        row = self._rows.pop(key, None)
+        if row is None:
+            return False
+
+        self._remove_from_group(
+            self._groups[row], self._statuses[row], self._loading[row]
+        )
+
+        last_row = len(self._row_keys) - 1
+        if row != last_row:
+            last_key = self._row_keys[last_row]
+            self._rows[last_key] = row
+            self._row_keys[row] = last_key
+            for column in self._columns():
+                column[row] = column[last_row]
+
+        self._row_keys.pop()
+        for column in self._columns():
+            column.pop()
+
+        return True
+
+    def get_status(self, key):
+        """
+        Get the status of the row for the given key.
+
+        :param key: The key of the row.
+        :type key: hashable
+
+        :return: The status, or None if the table does not have a row for the key.
+        :rtype: int
+        """
+
+        row = self._rows.get(key)
+        if row is None:
+            return None
+
+        return self._statuses[row]
+
+    def is_loading(self, key):
+        """
+        Get whether or not the row for the given key is loading.
+
+        :param key: The key of the row.
+        :type key: hashable
+
+        :return: True if the row is loading.
+        :rtype: bool
+        """
+
+        row = self._rows.get(key)
+        if row is None:
+            return False
+
+        return bool(self._loading[row])
+
+    def get_group_status_counts(self, group_id):
+        """
+        Get the number of rows per status for the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The number of rows per status, indexed by status. The counts are 0 if the
+            group does not have any rows.
+        :rtype: List[int]
+        """
+
+        group_code = self._group_codes.get(group_id)
+        if group_code is None:
+            return [0] * self.STATUS_COUNT
+
+        start = group_code * self.STATUS_COUNT
+        return self._group_status_counts[start : start + self.STATUS_COUNT].tolist()
+
+    def get_group_count(self, group_id):
+        """
+        Get the number of rows in the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The number of rows.
+        :rtype: int
+        """
+
+        return sum(self.get_group_status_counts(group_id))
+
+    def get_group_loading_count(self, group_id):
+        """
+        Get the number of rows loading in the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The number of rows loading.
+        :rtype: int
+        """
+
+        group_code = self._group_codes.get(group_id)
+        if group_code is None:
+            return 0
+
+        return self._group_loading_counts[group_code]
+
+    def get_group_status(self, group_id):
+        """
+        Get the status of the given group.
+
+        The group status is out of sync if any of its rows are out of sync, locked if all of
+        its rows are locked, else up to date.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The group status, or None if the group does not have any rows.
+        :rtype: int
+        """
+
+        counts = self.get_group_status_counts(group_id)
+        total = sum(counts)
+        if not total:
+            return None
+
+        if counts[self.STATUS_OUT_OF_SYNC]:
+            return self.STATUS_OUT_OF_SYNC
+
+        if counts[self.STATUS_LOCKED] == total:
+            return self.STATUS_LOCKED
+
+        return self.STATUS_UP_TO_DATE
+
+    def _columns(self):
+        """
+        Get the table columns.
+
+        :return: The table columns.
+        :rtype: List[array.array]
+        """
+
+        return (
+            self._current_versions,
+            self._highest_versions,
+            self._locked,
+            self._loading,
+            self._statuses,
+            self._groups,
+        )
+
+    def _compute_statuses(self):
+        """
+        Compute the statuses of all rows, and the group status counts, from the version and
+        locked columns.
+
+        :return: The keys of the rows whose status changed.
+        :rtype: List[hashable]
+        """
+
+        statuses = array.array(
+            "B",
+            map(
+                self.compute_status,
+                self._current_versions,
+                self._highest_versions,
+                self._locked,
+            ),
+        )
+
+        status_counts = array.array("l", [0]) * (
+            len(self._group_ids) * self.STATUS_COUNT
+        )
+        for group_code, status in zip(self._groups, statuses):
+            if group_code != self.NO_GROUP:
+                status_counts[group_code * self.STATUS_COUNT + status] += 1
+
+        changed_keys = [
+            self._row_keys[row]
+            for row, (status, new_status) in enumerate(zip(self._statuses, statuses))
+            if status != new_status
+        ]
+        self._statuses = statuses
+        self._group_status_counts = status_counts
+        return changed_keys
+
+    def _get_group_code(self, group_id):
+        """
+        Get the code of the given group id, and allocate the aggregates of the group if it is
+        a new group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The group code.
+        :rtype: int
+        """
+
+        if group_id is None:
+            return self.NO_GROUP
+
+        group_code = self._group_codes.get(group_id)
+        if group_code is None:
+            group_code = len(self._group_ids)
+            self._group_codes[group_id] = group_code
+            self._group_ids.append(group_id)
+            self._group_status_counts.extend([0] * self.STATUS_COUNT)
+            self._group_loading_counts.append(0)
+        return group_code
+
+    def _add_to_group(self, group_code, status, loading):
+        """
+        Add a row to the aggregates of the given group.
+
+        :param group_code: The group code.
+        :type group_code: int
+        :param status: The row status.
+        :type status: int
+        :param loading: 1 if the row is loading, else 0.
+        :type loading: int
+        """
+
+        if group_code == self.NO_GROUP:
+            return
+
+        self._group_status_counts[group_code * self.STATUS_COUNT + status] += 1
+        self._group_loading_counts[group_code] += loading
+
+    def _remove_from_group(self, group_code, status, loading):
+        """
+        Remove a row from the aggregates of the given group.
+
+        :param group_code: The group code.
+        :type group_code: int
+        :param status: The row status.
+        :type status: int
+        :param loading: 1 if the row is loading, else 0.
+        :type loading: int
+        """
+
+        if group_code == self.NO_GROUP:
+            return
+
+        self._group_status_counts[group_code * self.STATUS_COUNT + status] -= 1
+        self._group_loading_counts[group_code] -= loading
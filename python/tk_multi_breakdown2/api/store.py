@@ -0,0 +1,569 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+from .status_table import FileItemStatusTable
+
+
+class FileItemStore(object):
+    """
+    A collection of FileItem objects, indexed to look them up in constant time.
+
+    The file items are indexed by their current path, their old path (the path before the
+    item was updated, stored in the extra data `old_path`), their published file key, their
+    group id and their status. Items are stored by identity, in the order they are added.
+
+    File items are mutable, the indexes of an item must be updated by calling `update` after
+    modifying its data.
+
+    The data that determines the item statuses is also kept in a :class:`FileItemStatusTable`,
+    to get the status of the items and the status counts of their groups without iterating
+    over the items.
+    """
+
+    # File item status enum, the same values as the file model status.
+    STATUS_NONE = FileItemStatusTable.STATUS_NONE
+    STATUS_UP_TO_DATE = FileItemStatusTable.STATUS_UP_TO_DATE
+    STATUS_OUT_OF_SYNC = FileItemStatusTable.STATUS_OUT_OF_SYNC
+    STATUS_LOCKED = FileItemStatusTable.STATUS_LOCKED
+
+    # The indexes of the store.
+    INDEX_PATH = "path"
+    INDEX_OLD_PATH = "old_path"
+    INDEX_PUBLISH_KEY = "publish_key"
+    INDEX_GROUP = "group"
+    INDEX_STATUS = "status"
+
+    def __init__(self, file_items=None, group_func=None, publish_key_func=None):
+        """
+        Constructor.
+
+        :param file_items: The file items to add to the store.
+        :type file_items: List[FileItem]
+        :param group_func: A function that takes a file item and returns the id of the group
+            it belongs to. If not provided, the file items are not indexed by group.
+        :type group_func: function
+        :param publish_key_func: A function that takes a file item and returns its published
+            file key, e.g. :meth:`BreakdownManager.get_publish_key`. If not provided, the
+            file items are indexed by their `publish_key` property value.
+        :type publish_key_func: function
+        """
+
+        self._group_func = group_func
+        self._publish_key_func = publish_key_func
+
+        # The file items by their identity
+        self._items = {}
+        # The keys of each file item, by index, to remove the item from the indexes.
+        self._item_keys = {}
+        self._indexes = {
+            self.INDEX_PATH: {},
+            self.INDEX_OLD_PATH: {},
+            self.INDEX_PUBLISH_KEY: {},
+            self.INDEX_GROUP: {},
+            self.INDEX_STATUS: {},
+        }
+        self._status_table = FileItemStatusTable()
+
+        if file_items:
+            self.add_items(file_items)
+
+    def __len__(self):
+        """Return the number of file items in the store."""
+        return len(self._items)
+
+    def __iter__(self):
+        """Iterate over the file items, in the order they were added."""
+        return iter(list(self._items.values()))
+
+    def __contains__(self, file_item):
+        """Return True if the given file item object is in the store."""
+        return id(file_item) in self._items
+
+    # ----------------------------------------------------------------------------------------
+    # Static methods
+
+    @classmethod
+    def get_item_status(cls, file_item):
+        """
+        Get the status of the given file item.
+
+        :param file_item: The file item to get the status of.
+        :type file_item: FileItem
+
+        :return: The file item status.
+        :rtype: int
+        """
+
+        return FileItemStatusTable.compute_status(
+            (file_item.sg_data or {}).get("version_number") or 0,
+            file_item.highest_version_number,
+            file_item.locked,
+        )
+
+    # ----------------------------------------------------------------------------------------
+    # Public methods
+
+    @property
+    def items(self):
+        """Get the list of file items, in the order they were added."""
+        return list(self._items.values())
+
+    def set_group_func(self, group_func):
+        """
+        Set the function to get the group id of the file items, and index the file items by
+        their new group.
+
+        :param group_func: A function that takes a file item and returns the id of the group
+            it belongs to.
+        :type group_func: function
+        """
+
+        self._group_func = group_func
+        self.update_items(self._items.values())
+
+    def add(self, file_item):
+        """
+        Add the file item to the store. If the item is already in the store, its indexes are
+        updated.
+
+        :param file_item: The file item to add.
+        :type file_item: FileItem
+        """
+
+        if id(file_item) in self._items:
+            self.update(file_item)
+            return
+
+        self._items[id(file_item)] = file_item
+        self._index(file_item)
+
+    def add_items(self, file_items):
+        """
+        Add the file items to the store.
+
+        :param file_items: The file items to add.
+        :type file_items: List[FileItem]
+        """
+
+        for file_item in file_items:
+            self.add(file_item)
+
+    def reset(self, file_items=None):
+        """
+        Remove all file items from the store, and add the given file items.
+
+        :param file_items: The file items to add.
+        :type file_items: List[FileItem]
+        """
+
+        self.clear()
+        if file_items:
+            self.add_items(file_items)
+
+    def update(self, file_item):
+        """
+        Update the indexes of the file item, after its data has been modified.
+
+        :param file_item: The file item to update.
+        :type file_item: FileItem
+
+        :return: True if the file item is in the store, else False.
+        :rtype: bool
+        """
+
+        if id(file_item) not in self._items:
+            return False
+
+        self._unindex(file_item)
+        self._index(file_item)
+        return True
+
+    def update_items(self, file_items):
+        """
+        Update the indexes of the file items, after their data has been modified.
+
+        :param file_items: The file items to update.
+        :type file_items: List[FileItem]
+        """
+
+        for file_item in list(file_items):
+            self.update(file_item)
+
+    def update_highest_versions(self, file_items):
+        """
+        Update the statuses of the file items, after their latest published file has been
+        modified. The statuses of all the file items are recomputed at once, which is more
+        efficient than updating each file item when the latest published files of many file
+        items change.
+
+        :param file_items: The file items to update.
+        :type file_items: List[FileItem]
+
+        :return: The file items whose status changed.
+        :rtype: List[FileItem]
+        """
+
+        file_items = [item for item in file_items if id(item) in self._items]
+        changed_keys = self._status_table.update_rows(
+            [id(item) for item in file_items],
+            [item.highest_version_number for item in file_items],
+        )
+
+        changed_items = []
+        status_index = self._indexes[self.INDEX_STATUS]
+        for key in changed_keys:
+            file_item = self._items[key]
+            item_keys = self._item_keys[key]
+            status_items = status_index.get(item_keys[self.INDEX_STATUS])
+            if status_items is not None:
+                status_items.pop(key, None)
+                if not status_items:
+                    del status_index[item_keys[self.INDEX_STATUS]]
+            status = self._status_table.get_status(key)
+            item_keys[self.INDEX_STATUS] = status
+            status_index.setdefault(status, {})[key] = file_item
+            changed_items.append(file_item)
+        return changed_items
+
+    def remove(self, file_item):
+        """
+        Remove the file item from the store.
+
+        :param file_item: The file item to remove.
+        :type file_item: FileItem
+
+        :return: True if the file item was removed, else False if it was not in the store.
+        :rtype: bool
+        """
+
+        if id(file_item) not in self._items:
+            return False
+
+        self._unindex(file_item)
+        self._status_table.remove_row(id(file_item))
+        del self._items[id(file_item)]
+        return True
+
+    def clear(self):
+        """Remove all file items from the store."""
+
+        self._items = {}
+        self._item_keys = {}
+        for index in self._indexes.values():
+            index.clear()
+        self._status_table.clear()
+
+    def find(self, file_item):
+        """
+        Find the file item in the store that is equal to the given file item.
+
+        :param file_item: The file item to find.
+        :type file_item: FileItem
+
+        :return: The file item in the store, or None if not found.
+        :rtype: FileItem
+        """
+
+        if id(file_item) in self._items:
+            return file_item
+
+        for item in self.get_by_path(file_item.path):
+            if item == file_item:
+                return item
+        return None
+
+    def find_by_path(self, path, check_old_path=False):
+        """
+        Find the first file item with the given path.
+
+        :param path: The file path to find the file item by.
+        :type path: str
+        :param check_old_path: True to also find the file items that had the given path
+            before they were updated.
+        :type check_old_path: bool
+
+        :return: The file item, or None if not found.
+        :rtype: FileItem
+        """
+
+        file_items = self.get_by_path(path)
+        if not file_items and check_old_path:
+            file_items = self.get_by_old_path(path)
+        return file_items[0] if file_items else None
+
+    def get_by_path(self, path):
+        """
+        Get the file items with the given current path.
+
+        :param path: The file path.
+        :type path: str
+
+        :return: The file items.
+        :rtype: List[FileItem]
+        """
+
+        return self._get(self.INDEX_PATH, path)
+
+    def get_by_old_path(self, path):
+        """
+        Get the file items that had the given path before they were updated.
+
+        :param path: The file path.
+        :type path: str
+
+        :return: The file items.
+        :rtype: List[FileItem]
+        """
+
+        return self._get(self.INDEX_OLD_PATH, path)
+
+    def get_by_publish_key(self, publish_key):
+        """
+        Get the file items for the given published file key.
+
+        :param publish_key: The published file key, as returned by
+            :meth:`BreakdownManager.get_publish_key`.
+        :type publish_key: tuple
+
+        :return: The file items.
+        :rtype: List[FileItem]
+        """
+
+        return self._get(self.INDEX_PUBLISH_KEY, publish_key)
+
+    def get_by_group(self, group_id):
+        """
+        Get the file items that belong to the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The file items.
+        :rtype: List[FileItem]
+        """
+
+        return self._get(self.INDEX_GROUP, group_id)
+
+    def get_by_status(self, status):
+        """
+        Get the file items with the given status.
+
+        :param status: The file item status.
+        :type status: int
+
+        :return: The file items.
+        :rtype: List[FileItem]
+        """
+
+        return self._get(self.INDEX_STATUS, status)
+
+    def get_status(self, file_item):
+        """
+        Get the status of the given file item.
+
+        The status is computed when the file item is added or updated.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+
+        :return: The file item status.
+        :rtype: int
+        """
+
+        status = self._status_table.get_status(id(file_item))
+        if status is None:
+            # The file item is not in the store.
+            return self.get_item_status(file_item)
+        return status
+
+    def set_loading(self, file_item, loading):
+        """
+        Set whether or not the given file item is loading (e.g. its thumbnail is being
+        retrieved), to keep track of the number of file items loading per group.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+        :param loading: True if the file item is loading.
+        :type loading: bool
+
+        :return: True if the file item is in the store, else False.
+        :rtype: bool
+        """
+
+        return self._status_table.set_loading(id(file_item), loading)
+
+    def clear_loading(self):
+        """Set all file items as not loading."""
+
+        self._status_table.clear_loading()
+
+    def is_loading(self, file_item):
+        """
+        Get whether or not the given file item is loading.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+
+        :return: True if the file item is loading.
+        :rtype: bool
+        """
+
+        return self._status_table.is_loading(id(file_item))
+
+    def get_group_count(self, group_id):
+        """
+        Get the number of file items in the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The number of file items.
+        :rtype: int
+        """
+
+        return self._status_table.get_group_count(group_id)
+
+    def get_group_loading_count(self, group_id):
+        """
+        Get the number of file items loading in the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The number of file items loading.
+        :rtype: int
+        """
+
+        return self._status_table.get_group_loading_count(group_id)
+
+    def get_group_status(self, group_id):
+        """
+        Get the status of the given group.
+
+        The group status is out of sync if any of its file items are out of sync, locked if
+        all of its file items are locked, else up to date.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The group status, or None if the group does not have any file items.
+        :rtype: int
+        """
+
+        return self._status_table.get_group_status(group_id)
+
+    def get_group_status_counts(self, group_id):
+        """
+        Get the number of file items per status in the given group.
+
+        :param group_id: The group id.
+        :type group_id: str
+
+        :return: The number of file items, by status.
+        :rtype: Dict[int, int]
+        """
+
+        return dict(enumerate(self._status_table.get_group_status_counts(group_id)))
+
+    def get_group_ids(self):
+        """
+        Get the ids of the groups that have file items.
+
+        :return: The group ids.
+        :rtype: List[str]
+        """
+
+        return list(self._indexes[self.INDEX_GROUP].keys())
+
+    # ----------------------------------------------------------------------------------------
+    # Protected methods
+
+    def _get(self, index_name, key):
+        """
+        Get the file items from the index for the given key.
+
+        :param index_name: The name of the index.
+        :type index_name: str
+        :param key: The index key.
+        :type key: hashable
+
+        :return: The file items.
+        :rtype: List[FileItem]
+        """
+
+        return list(self._indexes[index_name].get(key, {}).values())
+
+    def _get_item_keys(self, file_item):
+        """
+        Get the keys of the file item for each index.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+
+        :return: The index keys, by index name. A key of None is not indexed.
+        :rtype: dict
+        """
+
+        return {
+            self.INDEX_PATH: file_item.path,
+            self.INDEX_OLD_PATH: (file_item.extra_data or {}).get("old_path"),
+            self.INDEX_PUBLISH_KEY: (
+                self._publish_key_func(file_item)
+                if self._publish_key_func
+                else file_item.publish_key
+            ),
+            self.INDEX_GROUP: (
+                self._group_func(file_item) if self._group_func else None
+            ),
+            self.INDEX_STATUS: self.get_item_status(file_item),
+        }
+
+    def _index(self, file_item):
+        """
+        Add the file item to the indexes.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+        """
+
+        item_keys = self._get_item_keys(file_item)
+        for index_name, key in item_keys.items():
+            if key is None:
+                continue
+            self._indexes[index_name].setdefault(key, {})[id(file_item)] = file_item
+        self._item_keys[id(file_item)] = item_keys
+
+        self._status_table.set_row(
+            id(file_item),
+            (file_item.sg_data or {}).get("version_number"),
+            file_item.highest_version_number,
+            file_item.locked,
+            item_keys[self.INDEX_GROUP],
+        )
+
+    def _unindex(self, file_item):
+        """
+        Remove the file item from the indexes.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+        """
+
+        item_keys = self._item_keys.pop(id(file_item), {})
+        for index_name, key in item_keys.items():
+            if key is None:
+                continue
+            index = self._indexes[index_name]
+            index_items = index.get(key)
+            if index_items is None:
+                continue
+            index_items.pop(id(file_item), None)
+            if not index_items:
+                del index[key]
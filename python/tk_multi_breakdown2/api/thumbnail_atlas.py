@@ -0,0 +1,445 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import hashlib
+import mmap
+import os
+import struct
+import sys
+
+from .thumbnail_cache import ThumbnailCache
+
+if sys.platform == "win32":
+    import msvcrt
+
+    fcntl = None
+else:
+    import fcntl
+
+
+class ThumbnailAtlasLockedError(OSError):
+    """Raised when a thumbnail atlas file is already open in another process."""
+
+
+class ThumbnailAtlas(object):
+    """
+    A single file of decoded thumbnail images, memory-mapped for reading.
+
+    The atlas stores thumbnails that have already been decoded and scaled to the same size,
+    as raw pixel data, such that they can be displayed without decoding any image file. The
+    thumbnails are appended to the file as they are decoded, and read as slices of the
+    memory-mapped file, without copying the pixel data.
+
+    The file starts with a header (magic and version), followed by one record per thumbnail:
+    a record header (marker, key, width, height, bytes per line, image format) followed by
+    the pixel data (bytes per line * height bytes). A thumbnail appended again for the same
+    key replaces the previous one. The records are indexed when the atlas is opened, reading
+    only the record headers. A truncated or invalid record (e.g. the app was closed while the
+    record was written) ends the atlas, and is discarded when the atlas is opened.
+
+    Once the file exceeds its max size, it is cleared before the next thumbnail is appended.
+
+    An atlas file is only open in one process at a time: it is locked (with a lock file next
+    to it) while it is open, and opening it from another process raises a
+    :class:`ThumbnailAtlasLockedError`. The process that has the atlas open is then the only
+    one to append to it, clear it, or read it, such that the file is never truncated while
+    another process has it mapped in memory, and the index of the atlas is never outdated.
+    """
+
+    MAGIC = b"TKBDATLS"
+    VERSION = 2
+    HEADER = struct.Struct("<8sI")
+
+    RECORD_MARKER = 0x7468756D
+    RECORD = struct.Struct("<IqIIII")
+
+    def __init__(self, path, max_bytes=0):
+        """
+        Constructor.
+
+        :param path: The path to the atlas file. It will be created if it does not exist.
+        :type path: str
+        :param max_bytes: The max size (in bytes) of the atlas file. A value of 0 or less does
+            not limit the atlas size.
+        :type max_bytes: int
+
+        :raises ThumbnailAtlasLockedError: If the atlas file is open in another process.
+        """
+
+        self._path = path
+        self._max_bytes = max_bytes or 0
+
+        # The record data offset, width, height, bytes per line and image format, by key.
+        self._index = {}
+        # The offset where the next record is appended.
+        self._end = self.HEADER.size
+        self._mmap = None
+
+        atlas_dir = os.path.dirname(self._path)
+        if atlas_dir and not os.path.exists(atlas_dir):
+            os.makedirs(atlas_dir)
+
+        self._lock_file = self._lock(self._path)
+        try:
+            self._file = open(self._path, "a+b")
+            self._load()
+        except Exception:
+            self._unlock(self._lock_file)
+            raise
+
+    def __len__(self):
+        """Return the number of thumbnails in the atlas."""
+        return len(self._index)
+
+    def __contains__(self, key):
+        """Return True if the atlas has a thumbnail for the key."""
+        return key in self._index
+
+    @classmethod
+    def get_key(cls, publish_id, image_url):
+        """
+        Get the atlas key of a thumbnail.
+
+        The key is computed from the published file id and the path of the thumbnail url,
+        such that a thumbnail uploaded again for the same published file gets a new key.
+
+        :param publish_id: The id of the published file that the thumbnail belongs to.
+        :type publish_id: int
+        :param image_url: The thumbnail url.
+        :type image_url: str
+
+        :return: The thumbnail key, or None if the published file id is not given.
+        :rtype: int
+        """
+
+        if not publish_id:
+            return None
+
+        key_data = "%s:%s" % (publish_id, ThumbnailCache.get_image_path(image_url))
+        digest = hashlib.sha1(key_data.encode("utf-8")).digest()
+        return struct.unpack("<q", digest[:8])[0]
+
+    @classmethod
+    def remove(cls, path):
+        """
+        Remove the atlas file, and its lock file, if it is not open in any process.
+
+        :param path: The path to the atlas file.
+        :type path: str
+
+        :return: True if the atlas file was removed, else False if it is open in another
+            process.
+        :rtype: bool
+
+        :raises OSError: If the atlas file could not be removed.
+        """
+
+        try:
+            lock_file = cls._lock(path)
+        except ThumbnailAtlasLockedError:
+            return False
+
+        try:
+            os.remove(path)
+        finally:
+            cls._unlock(lock_file)
+
+        try:
+            os.remove(cls._get_lock_path(path))
+        except OSError:
+            # The lock file was opened again in the meantime.
+            pass
+        return True
+
+    @property
+    def path(self):
+        """Get the path to the atlas file."""
+        return self._path
+
+    @property
+    def size_in_bytes(self):
+        """Get the size (in bytes) of the atlas file."""
+        return self._end
+
+    def get(self, key):
+        """
+        Get the thumbnail for the key.
+
+        The pixel data is a view on the memory-mapped file, it is not copied. It must not be
+        used once the atlas is closed or cleared, e.g. it should be copied (converted to a
+        pixmap) before then.
+
+        :param key: The thumbnail key (see `get_key`).
+        :type key: int
+
+        :return: The pixel data, width, height, bytes per line and image format of the
+            thumbnail, or None if the atlas does not have a thumbnail for the key.
+        :rtype: Tuple[memoryview, int, int, int, int]
+        """
+
+        entry = self._index.get(key)
+        if entry is None:
+            return None
+
+        offset, width, height, bytes_per_line, image_format = entry
+        data_end = offset + bytes_per_line * height
+        if self._mmap is None or len(self._mmap) < data_end:
+            # The thumbnail was appended after the file was mapped. Map the file again, the
+            # previous map is released once it is no longer referenced.
+            self._mmap = self._map()
+            if self._mmap is None:
+                return None
+
+        return (
+            memoryview(self._mmap)[offset:data_end],
+            width,
+            height,
+            bytes_per_line,
+            image_format,
+        )
+
+    def add(self, key, data, width, height, bytes_per_line, image_format):
+        """
+        Append the thumbnail to the atlas.
+
+        :param key: The thumbnail key (see `get_key`).
+        :type key: int
+        :param data: The pixel data, bytes per line * height bytes.
+        :type data: bytes
+        :param width: The thumbnail width.
+        :type width: int
+        :param height: The thumbnail height.
+        :type height: int
+        :param bytes_per_line: The number of bytes per line of pixel data.
+        :type bytes_per_line: int
+        :param image_format: The image format of the pixel data (e.g. a QImage.Format value).
+        :type image_format: int
+
+        :return: True if the thumbnail was added, else False if it does not fit in the max
+            size of the atlas, or the atlas could not be written.
+        :rtype: bool
+        """
+
+        data_size = bytes_per_line * height
+        if len(data) != data_size:
+            raise ValueError(
+                "Expected %d bytes of pixel data, got %d" % (data_size, len(data))
+            )
+
+        record_size = self.RECORD.size + data_size
+        if self._max_bytes > 0:
+            if self.HEADER.size + record_size > self._max_bytes:
+                return False
+            if self._end + record_size > self._max_bytes and not self.clear():
+                return False
+
+        record = self.RECORD.pack(
+            self.RECORD_MARKER,
+            key,
+            width,
+            height,
+            bytes_per_line,
+            int(image_format),
+        )
+        try:
+            # The file is opened in append mode, the record is written at the end of file.
+            self._file.seek(0, os.SEEK_END)
+            offset = self._file.tell()
+            self._file.write(record)
+            self._file.write(data)
+            self._file.flush()
+        except (IOError, OSError):
+            return False
+
+        self._index[key] = (
+            offset + self.RECORD.size,
+            width,
+            height,
+            bytes_per_line,
+            int(image_format),
+        )
+        self._end = offset + record_size
+        return True
+
+    def clear(self):
+        """
+        Remove all thumbnails from the atlas.
+
+        :return: True if the atlas was cleared, else False if the file could not be truncated
+            (e.g. its pixel data is still in use).
+        :rtype: bool
+        """
+
+        if not self._release_map():
+            return False
+
+        try:
+            self._file.seek(0)
+            self._file.truncate()
+            self._write_header()
+        except (IOError, OSError):
+            return False
+
+        self._index = {}
+        self._end = self.HEADER.size
+        return True
+
+    def close(self):
+        """Close the atlas file, and unlock it."""
+
+        self._release_map()
+        self._file.close()
+        self._unlock(self._lock_file)
+
+    def _load(self):
+        """Index the records of the atlas file, or initialize the file if it is not valid."""
+
+        self._file.seek(0, os.SEEK_END)
+        file_size = self._file.tell()
+        self._file.seek(0)
+        header = self._file.read(self.HEADER.size)
+        if len(header) < self.HEADER.size or self.HEADER.unpack(header) != (
+            self.MAGIC,
+            self.VERSION,
+        ):
+            self._file.seek(0)
+            self._file.truncate()
+            self._write_header()
+            return
+
+        offset = self.HEADER.size
+        while offset + self.RECORD.size <= file_size:
+            self._file.seek(offset)
+            (
+                marker,
+                key,
+                width,
+                height,
+                bytes_per_line,
+                image_format,
+            ) = self.RECORD.unpack(self._file.read(self.RECORD.size))
+            data_offset = offset + self.RECORD.size
+            data_end = data_offset + bytes_per_line * height
+            if marker != self.RECORD_MARKER or data_end > file_size:
+                break
+
+            self._index[key] = (
+                data_offset,
+                width,
+                height,
+                bytes_per_line,
+                image_format,
+            )
+            offset = data_end
+
+        if offset < file_size:
+            # Discard the invalid record, the next record is appended in its place.
+            self._file.truncate(offset)
+
+        self._end = offset
+        self._mmap = self._map()
+
+    @staticmethod
+    def _get_lock_path(path):
+        """
+        Get the path to the lock file of the atlas file.
+
+        :param path: The path to the atlas file.
+        :type path: str
+
+        :rtype: str
+        """
+
+        return path + ".lock"
+
+    @classmethod
+    def _lock(cls, path):
+        """
+        Lock the atlas file, without waiting for another process to unlock it. The lock is
+        released when the lock file is closed, or when the process ends.
+
+        :param path: The path to the atlas file.
+        :type path: str
+
+        :return: The open lock file.
+
+        :raises ThumbnailAtlasLockedError: If the atlas file is locked by another process.
+        """
+
+        lock_file = open(cls._get_lock_path(path), "a+b")
+        try:
+            if fcntl is None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except (IOError, OSError) as e:
+            lock_file.close()
+            raise ThumbnailAtlasLockedError(
+                "The thumbnail atlas %s is open in another process: %s" % (path, e)
+            )
+        return lock_file
+
+    @staticmethod
+    def _unlock(lock_file):
+        """
+        Unlock the atlas file, and close its lock file.
+
+        :param lock_file: The open lock file, as returned by `_lock`.
+        """
+
+        try:
+            if fcntl is None:
+                lock_file.seek(0)
+                msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        except (IOError, OSError):
+            # The lock is released when the file is closed.
+            pass
+        lock_file.close()
+
+    def _write_header(self):
+        """Write the atlas file header."""
+
+        self._file.write(self.HEADER.pack(self.MAGIC, self.VERSION))
+        self._file.flush()
+
+    def _map(self):
+        """
+        Map the atlas file in memory, read only.
+
+        :return: The memory map, or None if the file could not be mapped.
+        :rtype: mmap.mmap
+        """
+
+        try:
+            return mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):
+            return None
+
+    def _release_map(self):
+        """
+        Close the memory map of the atlas file.
+
+        :return: True if the map was closed, else False if its pixel data is still in use.
+        :rtype: bool
+        """
+
+        if self._mmap is None:
+            return True
+
+        try:
+            self._mmap.close()
+        except BufferError:
+            return False
+
+        self._mmap = None
+        return True
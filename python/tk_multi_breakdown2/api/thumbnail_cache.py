@@ -0,0 +1,246 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import collections
+from urllib.parse import urlparse
+
+
+class ThumbnailCache(object):
+    """
+    A bounded, in-memory cache of decoded thumbnails.
+
+    Thumbnails are keyed by their published file id, their url path and the size they were
+    decoded to, such that the same thumbnail is decoded once for all the views that display
+    it at the same size, and a thumbnail uploaded again is decoded again. Each thumbnail is stored with its cost (the number of bytes of its decoded image),
+    and the least recently used thumbnails are evicted once the total cost exceeds the memory
+    budget.
+
+    The cache is not thread safe, it is expected to be accessed from the main thread only
+    (e.g. the thumbnails are decoded in background tasks, and cached once they are returned
+    to the main thread).
+    """
+
+    # The process-wide cache instance, shared by all models.
+    __instance = None
+
+    def __init__(self, max_bytes=0):
+        """
+        Constructor.
+
+        :param max_bytes: The memory budget (in bytes) of the cache. A value of 0 or less does
+            not limit the cache size.
+        :type max_bytes: int
+        """
+
+        self._max_bytes = max_bytes or 0
+
+        # The cached values and their cost, by key, from least to most recently used.
+        self._entries = collections.OrderedDict()
+        self._bytes = 0
+
+        self.reset_stats()
+
+    def __len__(self):
+        """Return the number of cached thumbnails."""
+        return len(self._entries)
+
+    def __contains__(self, key):
+        """Return True if a thumbnail is cached for the key."""
+        return key in self._entries
+
+    @classmethod
+    def instance(cls, max_bytes=None):
+        """
+        Get the process-wide thumbnail cache.
+
+        :param max_bytes: The memory budget (in bytes) to set for the cache. If None, the
+            memory budget of the cache is not changed.
+        :type max_bytes: int
+
+        :return: The thumbnail cache.
+        :rtype: ThumbnailCache
+        """
+
+        if cls.__instance is None:
+            cls.__instance = cls()
+
+        if max_bytes is not None:
+            cls.__instance.max_bytes = max_bytes
+
+        return cls.__instance
+
+    @staticmethod
+    def get_key(publish_id, size=None, image_url=None):
+        """
+        Get the cache key of a thumbnail.
+
+        :param publish_id: The id of the published file that the thumbnail belongs to. The
+            thumbnail path may be used instead, for thumbnails without a published file.
+        :type publish_id: int | str
+        :param size: The size (width, height) that the thumbnail is decoded to, or None if it
+            is decoded at its original size.
+        :type size: Tuple[int, int]
+        :param image_url: The thumbnail url, such that a thumbnail uploaded again for the same
+            published file gets a new key.
+        :type image_url: str
+
+        :return: The cache key.
+        :rtype: tuple
+        """
+
+        return (
+            publish_id,
+            ThumbnailCache.get_image_path(image_url),
+            tuple(size) if size else None,
+        )
+
+    @staticmethod
+    def get_image_path(image_url):
+        """
+        Get the path of a thumbnail url, without its query. The query of a thumbnail url
+        (e.g. its signature) may change each time the url is retrieved, while its path only
+        changes when a new thumbnail is uploaded.
+
+        :param image_url: The thumbnail url.
+        :type image_url: str
+
+        :return: The url path, or None if no url is given.
+        :rtype: str
+        """
+
+        if not image_url or not isinstance(image_url, str):
+            return None
+
+        return urlparse(image_url).path or image_url
+
+    @property
+    def max_bytes(self):
+        """
+        Get or set the memory budget (in bytes) of the cache. A value of 0 or less does not
+        limit the cache size. Setting a smaller budget evicts the least recently used
+        thumbnails.
+        """
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value):
+        self._max_bytes = value or 0
+        self._evict()
+
+    @property
+    def size_in_bytes(self):
+        """Get the total cost (in bytes) of the cached thumbnails."""
+        return self._bytes
+
+    @property
+    def stats(self):
+        """
+        Get the cache statistics: the number of hits, misses and evictions since the
+        statistics were reset, the number of cached thumbnails, and their total cost and the
+        memory budget (in bytes).
+        """
+
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "evictions": self._evictions,
+            "count": len(self._entries),
+            "bytes": self._bytes,
+            "max_bytes": self._max_bytes,
+        }
+
+    def reset_stats(self):
+        """Reset the hit, miss and eviction counts."""
+
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Get the cached thumbnail for the key, and mark it as the most recently used.
+
+        :param key: The cache key (see `get_key`).
+        :type key: tuple
+        :param default: The value to return if the thumbnail is not cached.
+
+        :return: The cached thumbnail, or the default value if not cached.
+        """
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return default
+
+        self._hits += 1
+        self._entries.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, value, cost=0):
+        """
+        Cache the thumbnail for the key, and evict the least recently used thumbnails if the
+        memory budget is exceeded.
+
+        :param key: The cache key (see `get_key`).
+        :type key: tuple
+        :param value: The thumbnail to cache (e.g. a QIcon).
+        :param cost: The cost (in bytes) of the thumbnail.
+        :type cost: int
+
+        :return: True if the thumbnail was cached, else False if its cost exceeds the memory
+            budget on its own.
+        :rtype: bool
+        """
+
+        cost = max(cost or 0, 0)
+        self.remove(key)
+
+        if self._max_bytes > 0 and cost > self._max_bytes:
+            return False
+
+        self._entries[key] = (value, cost)
+        self._bytes += cost
+        self._evict()
+        return True
+
+    def remove(self, key):
+        """
+        Remove the cached thumbnail for the key.
+
+        :param key: The cache key (see `get_key`).
+        :type key: tuple
+
+        :return: True if the thumbnail was removed, else False if it was not cached.
+        :rtype: bool
+        """
+
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+
+        self._bytes -= entry[1]
+        return True
+
+    def clear(self):
+        """Remove all cached thumbnails."""
+
+        self._entries.clear()
+        self._bytes = 0
+
+    def _evict(self):
+        """Evict the least recently used thumbnails until the memory budget is met."""
+
+        if self._max_bytes <= 0:
+            return
+
+        while self._bytes > self._max_bytes and self._entries:
+            _, (_, cost) = self._entries.popitem(last=False)
+            self._bytes -= cost
+            self._evictions += 1
@@ -0,0 +1,212 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import collections
+
+
+class ThumbnailScheduler(object):
+    """
+    Schedule thumbnail requests by visibility priority.
+
+    Thumbnail requests are queued, and started up to a max number of concurrent requests.
+    The queued requests of the visible items are started first, in the order that the items
+    are displayed. The other requests are started once there are no visible items left to
+    request, in the order they were queued, such that all thumbnails are eventually retrieved.
+
+    Requests started for visible items are cancelled once their item is no longer visible
+    (e.g. scrolled away), and queued again behind the visible items.
+
+    The requests are started and cancelled by the given functions, the scheduler only keeps
+    track of the request ids. The owner is expected to call `finish` once a request has
+    completed (or failed), to start the next requests.
+    """
+
+    def __init__(self, start_request, cancel_request, max_concurrent=8):
+        """
+        Constructor.
+
+        :param start_request: A function that takes the key and data of a queued request,
+            starts the request and returns its id. The function returns None if no request
+            was started (e.g. the thumbnail is already cached).
+        :type start_request: function
+        :param cancel_request: A function that takes a request id and cancels the request.
+        :type cancel_request: function
+        :param max_concurrent: The max number of requests running at the same time. A value
+            of 0 or less does not limit the number of requests.
+        :type max_concurrent: int
+        """
+
+        self._start_request = start_request
+        self._cancel_request = cancel_request
+        self._max_concurrent = max_concurrent or 0
+
+        # The data of the queued requests, by key, in the order they were queued.
+        self._queue = collections.OrderedDict()
+        # The keys of the visible items, in display order.
+        self._visible_keys = []
+        self._visible = set()
+        # The running requests (request id, True if started for a visible item, request data),
+        # by key, and the key of each running request id.
+        self._running = {}
+        self._request_keys = {}
+
+    def __len__(self):
+        """Return the number of queued and running requests."""
+        return len(self._queue) + len(self._running)
+
+    def __contains__(self, key):
+        """Return True if a request is queued or running for the key."""
+        return key in self._queue or key in self._running
+
+    @property
+    def pending(self):
+        """Get whether or not there are requests queued or running."""
+        return bool(self._queue or self._running)
+
+    @property
+    def running_count(self):
+        """Get the number of running requests."""
+        return len(self._running)
+
+    @property
+    def max_concurrent(self):
+        """
+        Get or set the max number of requests running at the same time. A value of 0 or less
+        does not limit the number of requests.
+        """
+        return self._max_concurrent
+
+    @max_concurrent.setter
+    def max_concurrent(self, value):
+        self._max_concurrent = value or 0
+        self._start_next()
+
+    def enqueue(self, key, data=None):
+        """
+        Queue a request, and start it if the max number of concurrent requests has not been
+        reached. A request that is already queued or running for the key is not queued again,
+        but its data is updated.
+
+        :param key: The key of the request (e.g. the item identity).
+        :type key: hashable
+        :param data: The data passed to the start request function.
+        """
+
+        if key in self._running:
+            request_id, visible, _ = self._running[key]
+            self._running[key] = (request_id, visible, data)
+            return
+
+        self._queue[key] = data
+        self._start_next()
+
+    def remove(self, key):
+        """
+        Remove the queued request for the key, or cancel it if it is running.
+
+        :param key: The key of the request.
+        :type key: hashable
+
+        :return: True if a request was removed, else False.
+        :rtype: bool
+        """
+
+        if key in self._queue:
+            del self._queue[key]
+            return True
+
+        running = self._running.pop(key, None)
+        if running is None:
+            return False
+
+        self._request_keys.pop(running[0], None)
+        self._cancel_request(running[0])
+        self._start_next()
+        return True
+
+    def clear(self):
+        """Remove all queued requests and cancel all running requests."""
+
+        running = self._running
+        self._queue.clear()
+        self._running = {}
+        self._request_keys = {}
+
+        for request_id, _, _ in running.values():
+            self._cancel_request(request_id)
+
+    def set_visible(self, keys):
+        """
+        Set the keys of the visible items, in display order. Their queued requests are started
+        first, and the requests started for the items that are no longer visible are
+        cancelled, and queued again behind the visible items.
+
+        :param keys: The keys of the visible items.
+        :type keys: List[hashable]
+        """
+
+        self._visible_keys = list(keys)
+        self._visible = set(self._visible_keys)
+
+        for key, (request_id, visible, data) in list(self._running.items()):
+            if visible and key not in self._visible:
+                del self._running[key]
+                self._request_keys.pop(request_id, None)
+                self._cancel_request(request_id)
+                self._queue[key] = data
+
+        self._start_next()
+
+    def finish(self, request_id):
+        """
+        Mark the request as finished (completed or failed), and start the next requests.
+
+        :param request_id: The request id.
+
+        :return: The key of the finished request, or None if the request is not running (e.g.
+            it was cancelled).
+        :rtype: hashable
+        """
+
+        key = self._request_keys.pop(request_id, None)
+        if key is not None:
+            self._running.pop(key, None)
+            self._start_next()
+        return key
+
+    def _start_next(self):
+        """Start the next queued requests, until the max number of requests are running."""
+
+        while self._queue and (
+            self._max_concurrent <= 0 or len(self._running) < self._max_concurrent
+        ):
+            key = self._next_key()
+            data = self._queue.pop(key)
+            request_id = self._start_request(key, data)
+            if request_id is None:
+                continue
+
+            self._running[key] = (request_id, key in self._visible, data)
+            self._request_keys[request_id] = key
+
+    def _next_key(self):
+        """
+        Get the key of the next request to start: the first visible item that has a queued
+        request, or else the first queued request.
+
+        :return: The key of the next request.
+        :rtype: hashable
+        """
+
+        for key in self._visible_keys:
+            if key in self._queue:
+                return key
+
+        return next(iter(self._queue))
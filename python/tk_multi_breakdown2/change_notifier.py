@@ -0,0 +1,163 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+from sgtk.platform.qt import QtCore
+
+
+class ChangeNotifier(QtCore.QObject):
+    """
+    Coalesce the data changed notifications of a tree model.
+
+    Changed model items are collected, along with their changed roles, and the model
+    `dataChanged` signal is emitted once the flush interval has elapsed. One signal is emitted
+    for each range of contiguous rows, under the same parent, that changed for the same roles.
+
+    Model items are collected rather than indexes, such that the rows are resolved when the
+    signals are emitted (e.g. after rows were inserted or removed). The model items are
+    expected to provide their `parent_item` and their `row`, which is -1 if the item has been
+    removed from its parent.
+    """
+
+    def __init__(self, model, get_index_from_item, interval=0, parent=None):
+        """
+        Constructor.
+
+        :param model: The model to emit the data changed signals for.
+        :type model: QtCore.QAbstractItemModel
+        :param get_index_from_item: A function that takes a model item and returns its model
+            index.
+        :type get_index_from_item: function
+        :param interval: The interval (in milliseconds) to collect changes for, before the
+            signals are emitted. A value of 0 or less emits the signals once control returns
+            to the event loop.
+        :type interval: int
+        :param parent: The parent QObject.
+        :type parent: QtCore.QObject
+        """
+
+        super().__init__(parent)
+
+        self._model = model
+        self._get_index_from_item = get_index_from_item
+        self._interval = max(interval or 0, 0)
+
+        # The changed roles, by model item, by parent item. The roles are None if all roles
+        # changed.
+        self._changes = {}
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.flush)
+
+    @property
+    def interval(self):
+        """Get the interval (in milliseconds) that changes are collected for."""
+        return self._interval
+
+    @property
+    def pending(self):
+        """Get whether or not there are changes that have not been emitted yet."""
+        return bool(self._changes)
+
+    def add(self, model_item, roles=None):
+        """
+        Add a changed model item.
+
+        :param model_item: The model item that changed.
+        :type model_item: FileTreeModelItem
+        :param roles: The roles that changed. If not provided, all roles changed.
+        :type roles: List[int]
+        """
+
+        changes = self._changes.setdefault(model_item.parent_item, {})
+        if roles is None or (model_item in changes and changes[model_item] is None):
+            changes[model_item] = None
+        else:
+            changes.setdefault(model_item, set()).update(roles)
+
+        if not self._timer.isActive():
+            self._timer.start(self._interval)
+
+    def add_items(self, model_items, roles=None):
+        """
+        Add changed model items.
+
+        :param model_items: The model items that changed.
+        :type model_items: List[FileTreeModelItem]
+        :param roles: The roles that changed. If not provided, all roles changed.
+        :type roles: List[int]
+        """
+
+        for model_item in model_items:
+            self.add(model_item, roles)
+
+    def clear(self):
+        """Discard the changes that have not been emitted yet."""
+
+        self._timer.stop()
+        self._changes = {}
+
+    def flush(self):
+        """Emit the data changed signals for the collected changes."""
+
+        self._timer.stop()
+        changes = self._changes
+        self._changes = {}
+
+        for parent_item, item_roles in changes.items():
+            if parent_item is not None and parent_item.row() < 0:
+                # The parent has been removed from the model.
+                continue
+
+            rows = []
+            for model_item, roles in item_roles.items():
+                row = model_item.row()
+                if row < 0:
+                    # The item has been removed from the model.
+                    continue
+                rows.append((row, frozenset(roles) if roles is not None else None))
+            if not rows:
+                continue
+
+            parent_index = (
+                self._get_index_from_item(parent_item)
+                if parent_item is not None
+                else QtCore.QModelIndex()
+            )
+            for first_row, last_row, roles in self.get_ranges(rows):
+                self._model.dataChanged.emit(
+                    self._model.index(first_row, 0, parent_index),
+                    self._model.index(last_row, 0, parent_index),
+                    sorted(roles) if roles is not None else [],
+                )
+
+    @staticmethod
+    def get_ranges(rows):
+        """
+        Get the ranges of contiguous rows that changed for the same roles.
+
+        :param rows: The changed rows, and their changed roles (None if all roles changed).
+        :type rows: List[Tuple[int, frozenset]]
+
+        :return: The ranges (first row, last row, roles).
+        :rtype: List[Tuple[int, int, frozenset]]
+        """
+
+        ranges = []
+        for row, roles in sorted(rows, key=lambda r: r[0]):
+            if ranges:
+                first_row, last_row, range_roles = ranges[-1]
+                if row == last_row + 1 and roles == range_roles:
+                    ranges[-1] = (first_row, row, range_roles)
+                    continue
+                if row == last_row:
+                    continue
+            ranges.append((row, row, roles))
+        return ranges
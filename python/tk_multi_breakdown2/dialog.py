@@ -8,6 +8,8 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import itertools
+
 import sgtk
 from sgtk.platform.qt import QtGui, QtCore
 from tank.errors import TankHookMethodDoesNotExistError
@@ -110,6 +112,22 @@ class AppDialog(QtGui.QWidget):
         # Flag to indicate when an action is executing that affects multiple items.
         self.__executing_bulk_action = False
 
+        # The scene changes (items added or removed) are collected until control returns to
+        # the event loop, to update the file model in bulk (e.g. when many references are
+        # imported at once).
+        self.__pending_scene_changes = []
+        self.__scene_changes_timer = QtCore.QTimer(self)
+        self.__scene_changes_timer.setSingleShot(True)
+        self.__scene_changes_timer.setInterval(0)
+        self.__scene_changes_timer.timeout.connect(self._apply_scene_changes)
+
+        # The visible file items are updated once the view stops changing (e.g. scrolling),
+        # to request their thumbnails first.
+        self.__visible_items_timer = QtCore.QTimer(self)
+        self.__visible_items_timer.setSingleShot(True)
+        self.__visible_items_timer.setInterval(50)
+        self.__visible_items_timer.timeout.connect(self._update_visible_file_items)
+
         # create a single instance of the task manager that manages all
         # asynchronous work/tasks
         self._bg_task_manager = BackgroundTaskManager(self, max_threads=2)
@@ -422,11 +440,33 @@ class AppDialog(QtGui.QWidget):
         # Connect signals
 
         # Model & Views
-        self._file_model.modelAboutToBeReset.connect(self._on_file_model_reset_begin)
-        self._file_model.modelReset.connect(self._on_file_model_reset_end)
+        self._file_model.reload_started.connect(self._on_file_model_reload_begin)
+        self._file_model.reload_finished.connect(self._on_file_model_reload_end)
         self._file_model.layoutChanged.connect(self._on_file_model_layout_changed)
         self._file_model.dataChanged.connect(self._on_file_model_item_changed)
+        self._file_model.rescan_finished.connect(self._on_file_model_rescan_finished)
         self._file_proxy_model.layoutChanged.connect(self._update_file_view_overlay)
+        # Update the visible file items whenever the file view content or scroll position
+        # changes. The timer start method is not connected directly, since the signal
+        # arguments would be passed as the timer interval.
+        self._file_proxy_model.layoutChanged.connect(
+            lambda *args: self.__visible_items_timer.start()
+        )
+        self._file_proxy_model.modelReset.connect(
+            lambda *args: self.__visible_items_timer.start()
+        )
+        self._file_proxy_model.rowsInserted.connect(
+            lambda *args: self.__visible_items_timer.start()
+        )
+        self._file_proxy_model.rowsRemoved.connect(
+            lambda *args: self.__visible_items_timer.start()
+        )
+        self._ui.file_view.verticalScrollBar().valueChanged.connect(
+            lambda *args: self.__visible_items_timer.start()
+        )
+        self._ui.file_view.verticalScrollBar().rangeChanged.connect(
+            lambda *args: self.__visible_items_timer.start()
+        )
 
         self._ui.file_view.selectionModel().selectionChanged.connect(
             self._on_file_selection
@@ -503,6 +543,12 @@ class AppDialog(QtGui.QWidget):
         :type event: QtGui.QShowEvent
         """
 
+        # Resume polling for published file updates while the app is showing
+        if self._file_model:
+            self._file_model.poll_scheduler.resume(
+                self._file_model.poll_scheduler.PAUSE_HIDDEN
+            )
+
         # Do not refresh when show event is caused by the window system, only internal events
         if event.spontaneous():
             return
@@ -511,10 +557,26 @@ class AppDialog(QtGui.QWidget):
             # There were changes while the app was hiding, reset the flag and refresh the
             # model data
             self.__update_on_show = False
-            self._reload_file_model()
+            self._rescan_file_model()
 
         super().showEvent(event)
 
+    def hideEvent(self, event):
+        """
+        Override the base method.
+
+        :param event: The hide event object.
+        :type event: QtGui.QHideEvent
+        """
+
+        # Pause polling for published file updates while the app is hiding
+        if self._file_model:
+            self._file_model.poll_scheduler.pause(
+                self._file_model.poll_scheduler.PAUSE_HIDDEN
+            )
+
+        super().hideEvent(event)
+
     def closeEvent(self, event):
         """
         Override the base method.
@@ -532,6 +594,8 @@ class AppDialog(QtGui.QWidget):
         # Tell the main app instance that we are closing
         self._bundle._on_dialog_close(self)
 
+        self.__visible_items_timer.stop()
+
         # Disconnect any signals that were set up for handlding scene changes
         if self.__can_unregister_scene_change_callback:
             self.scene_operations_hook.unregister_scene_change_callback()
@@ -1012,6 +1076,20 @@ class AppDialog(QtGui.QWidget):
 
         self._file_model.reload()
 
+    def _rescan_file_model(self):
+        """
+        Rescan the file model.
+
+        This will scan the scene again, and only update the model with the scene changes
+        since the last scan.
+        """
+
+        if not self._file_model:
+            # Cannot rescan the model if it does not exist yet.
+            return
+
+        self._file_model.rescan()
+
     def _scene_changed(self, event_type="reload", data=None):
         """
         Handle a scene changed event.
@@ -1028,33 +1106,45 @@ class AppDialog(QtGui.QWidget):
             self.__update_on_show = True
             return
 
-        invalidate_filtering = False
-        is_reload = event_type == "reload"
+        if event_type == "reload":
+            # Only update the model with the scene changes, a full reload is only performed
+            # when explicitly requested by the user. The rescan includes any pending changes.
+            self.__pending_scene_changes = []
+            self.__scene_changes_timer.stop()
+            self._rescan_file_model()
 
-        if is_reload:
-            self._reload_file_model()
-        else:
-            if event_type == "add":
-                if self._file_model:
-                    # Special case handling when adding an item that requires a new group to be
-                    # created, filtering does not accept the newly added item. Set the flag to
-                    # invalidate the proxy model at the end of this operation.
-                    # TODO understand exactly why this happens.
-                    invalidate_filtering = True
+        elif event_type in ("add", "remove"):
+            # Collect the changes to update the model in bulk.
+            self.__pending_scene_changes.append((event_type, data))
+            self.__scene_changes_timer.start()
 
-                    self._file_model.add_item(data)
+    def _apply_scene_changes(self):
+        """
+        Update the file model with the scene changes collected by `_scene_changed`.
+
+        Consecutive changes of the same type are applied in bulk. The file items added are
+        resolved async, the filtering is updated once the model signals that the items have
+        been added (see `_on_file_model_rescan_finished`).
+        """
+
+        scene_changes = self.__pending_scene_changes
+        self.__pending_scene_changes = []
 
+        if not self._file_model or not scene_changes:
+            return
+
+        removed = False
+        for event_type, changes in itertools.groupby(scene_changes, lambda c: c[0]):
+            data = [change_data for _, change_data in changes]
+            if event_type == "add":
+                self._file_model.add_items(data)
             elif event_type == "remove":
-                if self._file_model:
-                    self._file_model.remove_item_by_file_path(data)
+                removed = bool(self._file_model.remove_items(data)) or removed
 
-            # Refresh the filter menu after the data has loaded.
+        if removed:
+            # Refresh the filter menu after the data has been removed.
             self._filter_menu.refresh()
 
-            if invalidate_filtering:
-                self._file_proxy_model.invalidate()
-                self._expand_all_groups()
-
     def _listen_for_events(self, listen):
         """
         Listen for DCC specific events that require the app to update.
@@ -1139,15 +1229,17 @@ class AppDialog(QtGui.QWidget):
         else:
             self._set_details_panel_visibility(True)
 
-    def _on_file_model_reset_begin(self):
+    def _on_file_model_reload_begin(self):
         """
-        Slot triggered when the file model signal 'modelAboutToBeReset' has been fired.
+        Slot triggered when the file model signal 'reload_started' has been fired.
 
         Show the file model overlay spinner and disable UI components while the model is
-        loading
+        loading. The spinner is not shown if the model already has data, since the current
+        data is displayed until the reloaded data is applied.
         """
 
-        self._file_model_overlay.start_spin()
+        if self._file_model.rowCount() <= 0:
+            self._file_model_overlay.start_spin()
 
         # Do not allow user to interact with UI while the model is async reloading
         self._ui.group_by_combo_box.setEnabled(False)
@@ -1157,13 +1249,13 @@ class AppDialog(QtGui.QWidget):
         self._ui.select_all_outdated_button.setEnabled(False)
         self._ui.update_selected_button.setEnabled(False)
 
-    def _on_file_model_reset_end(self):
+    def _on_file_model_reload_end(self):
         """
-        Slot triggered once the main file model has finished resetting and has emitted
-        the `modelRest` signal.
+        Slot triggered once the main file model has finished reloading and has emitted
+        the `reload_finished` signal.
         """
 
-        # Re-enable buttons that were disabled during reset
+        # Re-enable buttons that were disabled during reload
         self._ui.group_by_combo_box.setEnabled(True)
         self._ui.group_by_label.setEnabled(True)
         self._ui.refresh_btn.setEnabled(True)
@@ -1174,7 +1266,12 @@ class AppDialog(QtGui.QWidget):
         selected_indexes = self._ui.file_view.selectionModel().selectedIndexes()
         self._setup_details_panel(selected_indexes)
 
-        # Ensure all the file groupings are expand after a model reset. This is a bit of a
+        # Rows may have been added in new groups, which are not accepted by the filter model
+        # until it is invalidated (see `_scene_changed`).
+        self._file_proxy_model.invalidate()
+        self._update_file_view_overlay()
+
+        # Ensure all the file groupings are expand after a model reload. This is a bit of a
         # work around for how filtering works - the group indexes are never accepted by the
         # filter model and only accepted if a child index is accepted. By not explicitly
         # accepting the group index, this causes the group to collapse, even thoug there are
@@ -1184,6 +1281,20 @@ class AppDialog(QtGui.QWidget):
         # Refresh the filter menu after the data has loaded
         self._filter_menu.refresh()
 
+    def _on_file_model_rescan_finished(self):
+        """
+        Slot triggered once the main file model has finished updating the model with the
+        changes found by a rescan.
+        """
+
+        # Items may have been added in new groups, which are not accepted by the filter
+        # model until it is invalidated (see `_scene_changed`).
+        self._file_proxy_model.invalidate()
+        self._expand_all_groups()
+
+        # Refresh the filter menu after the data has loaded
+        self._filter_menu.refresh()
+
     def _on_filter_menu_refreshed(self):
         """Callback triggered when the filter menu has finished refreshing."""
 
@@ -1284,20 +1395,78 @@ class AppDialog(QtGui.QWidget):
 
                 # Update the delegate to resize the items based on the slider value
                 # and current view mode
+                # The thumbnails are decoded to the size they are painted at.
                 if view_mode["mode"] == self.THUMBNAIL_VIEW_MODE:
                     width = value * (16 / 9.0)
                     delegate.thumbnail_size = QtCore.QSize(width, value)
+                    self._file_model.thumbnail_size = (int(width), value)
 
                 elif view_mode["mode"] == self.LIST_VIEW_MODE:
                     delegate.item_height = value
                     delegate.item_width = -1
+                    self._file_model.thumbnail_size = (value * 2, value)
 
                 elif view_mode["mode"] == self.GRID_VIEW_MODE:
                     delegate.item_height = None
                     delegate.item_width = value * 2
+                    self._file_model.thumbnail_size = (value * 2, value * 2)
 
         self._ui.file_view._update_all_item_info = True
         self._ui.file_view.viewport().update()
+        self.__visible_items_timer.start()
+
+    def _update_visible_file_items(self):
+        """
+        Set the file items visible in the file view on the file model, such that their
+        thumbnails are requested first.
+
+        The file items are ordered vertically within each group, so the visible items of each
+        group are found by a binary search on their position in the viewport.
+        """
+
+        if not self._file_model:
+            return
+
+        view = self._ui.file_view
+        viewport_rect = view.viewport().rect()
+        top = viewport_rect.top()
+        bottom = viewport_rect.bottom()
+
+        visible_indexes = []
+        for group_row in range(self._file_proxy_model.rowCount()):
+            group_index = self._file_proxy_model.index(group_row, 0)
+            group_rect = view.visualRect(group_index)
+            if group_rect.isValid() and group_rect.top() > bottom:
+                # The groups are laid out vertically, the next groups are not visible.
+                break
+
+            child_count = self._file_proxy_model.rowCount(group_index)
+            if not child_count:
+                continue
+
+            # Find the first child that ends below the top of the viewport
+            low, high = 0, child_count
+            while low < high:
+                mid = (low + high) // 2
+                rect = view.visualRect(
+                    self._file_proxy_model.index(mid, 0, group_index)
+                )
+                if rect.isValid() and rect.bottom() < top:
+                    low = mid + 1
+                else:
+                    high = mid
+
+            for row in range(low, child_count):
+                index = self._file_proxy_model.index(row, 0, group_index)
+                rect = view.visualRect(index)
+                if not rect.isValid():
+                    # The group is collapsed
+                    break
+                if rect.top() > bottom:
+                    break
+                visible_indexes.append(self._file_proxy_model.mapToSource(index))
+
+        self._file_model.set_visible_indexes(visible_indexes)
 
     @wait_cursor
     def _on_select_all_outdated(self):
@@ -11,8 +11,9 @@
 import sgtk
 from sgtk.platform.qt import QtCore, QtGui
 
+from .api import ThumbnailCache
 from .framework_qtwidgets import SGQIcon
-from .utils import get_ui_published_file_fields
+from .utils import get_image_size_in_bytes, get_ui_published_file_fields
 
 
 shotgun_model = sgtk.platform.import_framework(
@@ -53,6 +54,10 @@ class FileHistoryModel(ShotgunModel, ViewItemRolesMixin):
     }
     LOCKED_ICON = SGQIcon.resource_path("lock", SGQIcon.SIZE_16x16)
 
+    # The size (width, height) that the history thumbnails are scaled to, twice the size of
+    # the history view thumbnails for high dpi screens.
+    THUMBNAIL_SIZE = (128, 128)
+
     def __init__(self, parent, bg_task_manager):
         """
         Class constructor
@@ -67,6 +72,10 @@ class FileHistoryModel(ShotgunModel, ViewItemRolesMixin):
         self._app = sgtk.platform.current_bundle()
         self.__manager = self._app.create_breakdown_manager()
 
+        # The thumbnails are shared with the file model through the process-wide thumbnail
+        # cache, such that the same thumbnails are not decoded each time the history loads.
+        self.__thumbnail_cache = self.__manager.get_thumbnail_cache()
+
         # Store parent file item data
         self.__parent_sg_data = None
         self.__parent_locked = None
@@ -227,6 +236,67 @@ class FileHistoryModel(ShotgunModel, ViewItemRolesMixin):
         # Set up the methods to call to retrieve the data for the specified role.
         self.set_data_for_role_methods(item, sg_data)
 
+    def _request_thumbnail_download(self, item, field, url, entity_type, entity_id):
+        """
+        Override the base :class:`ShotgunQueryModel` method.
+
+        The thumbnail is not downloaded (or loaded from disk) if it is already cached.
+
+        :param item: The model item to download the thumbnail for.
+        :param field: The field that the thumbnail is downloaded for.
+        :param url: The thumbnail url.
+        :param entity_type: The type of the entity that the thumbnail belongs to.
+        :param entity_id: The id of the entity that the thumbnail belongs to.
+        """
+
+        if field == "image":
+            icon = self.__thumbnail_cache.get(
+                ThumbnailCache.get_key(entity_id, self.THUMBNAIL_SIZE, image_url=url)
+            )
+            if icon is not None:
+                item.setIcon(icon)
+                return
+
+        super()._request_thumbnail_download(item, field, url, entity_type, entity_id)
+
+    def _populate_thumbnail_image(self, item, field, image, path):
+        """
+        Override the base :class:`ShotgunQueryModel` method.
+
+        Called when the thumbnail for an item has been loaded. The thumbnail is scaled down to
+        the history thumbnail size, and cached for the next time it is displayed.
+
+        :param item: The model item that the thumbnail was downloaded for.
+        :param field: The field that the thumbnail was downloaded for.
+        :param image: The thumbnail image.
+        :type image: QtGui.QImage
+        :param path: The path to the thumbnail on disk.
+        """
+
+        if field != "image":
+            return
+
+        sg_data = item.get_sg_data() or {}
+        key = ThumbnailCache.get_key(
+            sg_data.get("id") or path,
+            self.THUMBNAIL_SIZE,
+            image_url=sg_data.get(field),
+        )
+        icon = self.__thumbnail_cache.get(key)
+        if icon is None:
+            width, height = self.THUMBNAIL_SIZE
+            if image.width() > width or image.height() > height:
+                image = image.scaled(
+                    width,
+                    height,
+                    QtCore.Qt.KeepAspectRatio,
+                    QtCore.Qt.SmoothTransformation,
+                )
+            icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+            self.__thumbnail_cache.put(key, icon, get_image_size_in_bytes(image))
+
+        item.setIcon(icon)
+
     def _set_tooltip(self, item, sg_item):
         """
         Override base method to ensure no tooltip is set from the model. Let the delegate
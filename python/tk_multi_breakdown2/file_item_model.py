@@ -8,12 +8,23 @@
 # agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
 # not expressly granted therein are reserved by Autodesk, Inc.
 
+import collections
+import datetime
+import time
+
 import sgtk
 from sgtk import TankError
 from sgtk.platform.qt import QtGui, QtCore
 
-from .utils import get_ui_published_file_fields
+from .api import FileItemStore, ThumbnailAtlas, ThumbnailCache, ThumbnailScheduler
+from .utils import (
+    get_image_data,
+    get_image_size_in_bytes,
+    get_ui_published_file_fields,
+)
 from .decorators import wait_cursor
+from .change_notifier import ChangeNotifier
+from .poll_scheduler import PollScheduler
 from .framework_qtwidgets import SGQIcon
 
 shotgun_data = sgtk.platform.import_framework(
@@ -39,6 +50,26 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
     UI_CONFIG_ADV_HOOK_PATH = "hook_ui_config_advanced"
 
+    # Signals emitted when a reload starts, and once the reloaded data has been applied to
+    # the model. The current model data is kept until the reloaded data is ready.
+    reload_started = QtCore.Signal()
+    reload_finished = QtCore.Signal()
+    # Signal emitted when an incremental rescan has finished updating the model.
+    rescan_finished = QtCore.Signal()
+    # Signal emitted after each slice of the model build, with the number of file items built
+    # and the total number of file items to build.
+    build_progress_changed = QtCore.Signal(int, int)
+
+    # The overlap applied to the published file creation date watermark when polling for new
+    # published files. This accounts for published files that are committed to the database
+    # some time after their creation date.
+    DELTA_POLL_OVERLAP = datetime.timedelta(seconds=60)
+
+    # The background task group of the thumbnail decode tasks.
+    THUMBNAIL_DECODE_GROUP = "thumbnail_decode"
+    # The image format of the thumbnails stored in the thumbnail atlas.
+    THUMBNAIL_ATLAS_FORMAT = QtGui.QImage.Format_ARGB32_Premultiplied
+
     # Additional data roles defined for the model
     _BASE_ROLE = QtCore.Qt.UserRole + 32
     (
@@ -57,8 +88,10 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE,  # Convenience role for the file item latest_published_file field
         FILE_ITEM_CREATED_AT_ROLE,  # Convenience method to extract the created at datetime from the file item shotgun data
         FILE_ITEM_TAGS_ROLE,  # Convenience method to extract the file item tags from the shotgun data
+        GROUP_STATUS_COUNTS_ROLE,  # The number of file items per status in a group
+        GROUP_LOADING_COUNT_ROLE,  # The number of file items loading in a group
         NEXT_AVAILABLE_ROLE,  # Keep track of the next available custome role. Insert new roles above.
-    ) = range(_BASE_ROLE, _BASE_ROLE + 16)
+    ) = range(_BASE_ROLE, _BASE_ROLE + 18)
 
     # File item status enum
     (
@@ -132,6 +165,7 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         # ------------------------------------------------------------------------------------
 
         self._app = sgtk.platform.current_bundle()
+        self._manager = self._app.create_breakdown_manager()
 
         # Flag indicating if the model is dynamically loaded as it is retrieved async. False
         # will show a loader until all data is loaded in.
@@ -139,38 +173,136 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
         # Flag indicating if the model is in the middle of a reload
         self.__is_reloading = False
+        # Flag indicating if the model has been fully loaded at least once
+        self.__has_loaded = False
 
         # Flag indicating if the model will poll for published file updates async.
         self.__polling = polling
 
         # Get the app setting for the timeout interval length for polling file item statuses.
         self._timeout_interval = self._app.get_setting("file_status_check_interval")
-        # Create a timer that checks the latest published file every X seconds
-        self._file_status_check_timer = QtCore.QTimer()
-        self._file_status_check_timer.timeout.connect(
+        # Create a scheduler that checks the latest published file every X seconds. The
+        # interval backs off while the polls do not find any updates.
+        self._file_status_poll_scheduler = PollScheduler(
+            self._timeout_interval,
+            max_interval=self._app.get_setting("file_status_check_max_interval"),
+            parent=self,
+        )
+        self._file_status_poll_scheduler.poll_requested.connect(
             lambda s=self: self.check_published_files_status()
         )
-
-        # The list of scene objects last found by the scan_scene method. These objects
-        # determine the file items shown in the app.
-        self.__scene_objects = []
-        # The list of file item data that currently populates the model.
-        self.__file_items = []
+        # Get the app setting for the interval length to fully re-sync the file item statuses.
+        # Between full re-syncs, polling only queries for the published files created since
+        # the last poll.
+        self._full_resync_interval = self._app.get_setting(
+            "file_status_full_resync_interval"
+        )
+        # The most recent published file creation date found by the status queries, and the
+        # time of the last full status query.
+        self.__published_files_watermark = None
+        self.__last_full_resync_time = None
+
+        # The scene objects last found by the scan_scene method, by their key (node name, node
+        # type and path). These objects determine the file items shown in the app. The scene
+        # object keys are also indexed by path, to look up the scene objects of a file path
+        # without going through all the scene objects.
+        self.__scene_objects = {}
+        self.__scene_object_keys_by_path = {}
+        # The file item data that currently populates the model, indexed for fast look ups.
+        self.__file_store = FileItemStore(
+            group_func=self._get_file_group_id,
+            publish_key_func=self._manager.get_publish_key,
+        )
+        # The model items by their file item object id.
+        self.__model_items = {}
+        # Coalesce the data changed signals emitted as the model items are updated, into one
+        # signal per range of changed rows.
+        self._change_notifier = ChangeNotifier(
+            self,
+            self.__get_index_from_item,
+            interval=self._app.get_setting("data_changed_flush_interval"),
+            parent=self,
+        )
+        # The list of file item data retrieved by the current reload, which will replace the
+        # current file items once all their data is retrieved.
+        self.__reload_file_items = []
+        # The model is built progressively from the reloaded file items, one slice of file
+        # items at a time, such that the UI stays responsive while the rows are inserted. Each
+        # slice is processed within the time budget, and the next slice is processed once
+        # control returns to the event loop.
+        self._build_slice_budget = self._app.get_setting("model_build_slice_budget")
+        self.__build_queue = collections.deque()
+        self.__build_latest_published_files = None
+        self.__build_count = 0
+        self.__build_timer = QtCore.QTimer(self)
+        self.__build_timer.setInterval(0)
+        self.__build_timer.timeout.connect(self._build_next_slice)
         # The list of current group items in the model to easily change groupings.
         self._group_items = {}
 
-        # Keep track of pending background tasks.
-        self.__pending_published_file_data_request = None
+        # The scene is scanned progressively on reload, one slice of scene object batches at a
+        # time, within the same time budget as the model build. Each slice is resolved to
+        # published files while the rest of the scene is being scanned.
+        self.__scene_scan = None
+        self.__scan_timer = QtCore.QTimer(self)
+        self.__scan_timer.setInterval(0)
+        self.__scan_timer.timeout.connect(self._scan_next_slice)
+
+        # Keep track of pending background tasks. The published file data is resolved by a
+        # group of tasks per slice of the scene scan (one task per chunk of file paths), whose
+        # results are merged as they arrive. Values are the scene objects of the slice by
+        # path (see `_get_scene_objects_by_path`), to get the file items of each chunk.
+        self.__pending_published_file_data_requests = {}
+        self.__pending_published_file_data = {}
+        # The latest published file data is requested for each chunk as soon as it is
+        # resolved, while the other chunks are still being resolved. The latest published
+        # files are resolved in background tasks, which only return the resolved data (see
+        # `BreakdownManager.resolve_latest_published_files`).
+        self.__pending_reload_latest_requests = set()
+        self.__reload_latest_results = []
         self.__pending_latest_published_files_data_request = None
+        self.__pending_latest_published_files_delta = False
         self.__pending_version_requests = {}
+        # The file item of each running thumbnail request, by request id. The thumbnail
+        # requests are queued by file item identity, and started by visibility priority (see
+        # `set_visible_indexes`).
         self.__pending_thumbnail_requests = {}
+        self._thumbnail_scheduler = ThumbnailScheduler(
+            self._start_thumbnail_request,
+            self._cancel_thumbnail_request,
+            max_concurrent=self._app.get_setting("thumbnail_max_concurrent_requests"),
+        )
+        # The identity of the added file items whose latest published file is being resolved.
+        self.__resolving_file_items = set()
+        # Thumbnails are decoded in background tasks, by task id. Values are the model item,
+        # the thumbnail path and the size it is decoded to. The model items being decoded are
+        # kept by identity, to request only one decode per model item at a time.
+        self.__pending_thumbnail_decodes = {}
+        self.__decoding_model_items = set()
+        # The model items visible in the view, in display order. Only the thumbnails of the
+        # visible items are decoded.
+        self.__visible_model_items = []
+        # The size (width, height) that thumbnails are decoded to, or None to decode them at
+        # their original size.
+        self.__thumbnail_size = None
+        # The atlas of the thumbnails decoded to the current thumbnail size, and the size it
+        # was opened for. The atlas is opened once it is used.
+        self.__thumbnail_atlas = None
+        self.__thumbnail_atlas_size = None
+        # Requests for the scene objects added since the last scan, by request (or task group)
+        # id. Values are the scene objects to resolve by path, then the file items to get the
+        # latest data for.
+        self.__pending_add_published_file_requests = {}
+        self.__pending_add_latest_published_files_requests = {}
 
         if group_by and isinstance(group_by, str):
             self._group_by = group_by
         else:
             self._group_by = "project"
 
-        self._manager = self._app.create_breakdown_manager()
+        # The decoded thumbnails are stored in the process-wide thumbnail cache, shared with
+        # the file history model, rather than by each model item.
+        self._thumbnail_cache = self._manager.get_thumbnail_cache()
 
         self._bg_task_manager = bg_task_manager
         self._bg_task_manager.task_completed.connect(self._on_background_task_completed)
@@ -212,6 +344,26 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
             self.VIEW_ITEM_SEPARATOR_ROLE: ui_config_adv_hook.get_item_separator,
             QtCore.Qt.BackgroundRole: ui_config_adv_hook.get_item_background_color,
         }
+        # The role method results are memoized by file model item, such that the hook methods
+        # are called once per item change rather than each time the item is painted. The
+        # memoized roles that depend on each changed role are invalidated when the item
+        # changes, a change of any role not listed here invalidates all memoized roles of the
+        # item (e.g. its sg_data, latest published file, status, or locked and loaded state
+        # changed). The text roles may show the loading state of the item.
+        self._role_data_dependencies = {
+            QtCore.Qt.DecorationRole: (),
+            self.VIEW_ITEM_THUMBNAIL_ROLE: (),
+            self.VIEW_ITEM_LOADING_ROLE: (
+                self.VIEW_ITEM_SUBTITLE_ROLE,
+                self.VIEW_ITEM_TEXT_ROLE,
+                self.VIEW_ITEM_SHORT_TEXT_ROLE,
+            ),
+        }
+        # The roles that are not memoized. The thumbnails are kept by the thumbnail cache,
+        # within its memory budget, memoizing them would keep them for all the items.
+        self._unmemoized_roles = {self.VIEW_ITEM_THUMBNAIL_ROLE}
+        # The number of times the role methods were called, by role.
+        self.__role_call_counts = {}
 
     @classmethod
     def get_status_icon(cls, status):
@@ -249,6 +401,76 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         self.__polling = value
         self.start_timer() if self.__polling else self.stop_timer()
 
+    @property
+    def poll_scheduler(self):
+        """Get the scheduler that polls for published file updates."""
+        return self._file_status_poll_scheduler
+
+    @property
+    def build_slice_budget(self):
+        """
+        Get or set the time budget (in milliseconds) of each slice of the model build. A value
+        of 0 or less builds the model in a single pass.
+        """
+        return self._build_slice_budget
+
+    @build_slice_budget.setter
+    def build_slice_budget(self, value):
+        self._build_slice_budget = value
+
+    @property
+    def build_progress(self):
+        """
+        Get the progress of the model build, as the number of file items built and the total
+        number of file items to build.
+        """
+        return (self.__build_count - len(self.__build_queue), self.__build_count)
+
+    def is_building(self):
+        """
+        Return True if the model is being built progressively from the reloaded file items.
+
+        :rtype: bool
+        """
+
+        return bool(self.__build_queue)
+
+    @property
+    def thumbnail_size(self):
+        """
+        Get or set the size (width, height) that the thumbnails are decoded to, e.g. the size
+        that the view delegate paints the thumbnails at. None decodes the thumbnails at their
+        original size. Thumbnails are decoded again when they are visible at a larger size.
+        """
+        return self.__thumbnail_size
+
+    @thumbnail_size.setter
+    def thumbnail_size(self, value):
+        if isinstance(value, QtCore.QSize):
+            value = (value.width(), value.height())
+        value = tuple(value) if value else None
+        if value == self.__thumbnail_size:
+            return
+
+        self.__thumbnail_size = value
+        # The role methods may depend on the thumbnail size, the memoized role data is
+        # retrieved again for all items.
+        for model_item in self.__model_items.values():
+            model_item.clear_role_data()
+
+    @property
+    def role_call_counts(self):
+        """
+        Get the number of times the method defined to retrieve the item data was called, by
+        role, since the counts were last reset. Memoized role data is not counted.
+        """
+        return dict(self.__role_call_counts)
+
+    @property
+    def thumbnail_cache(self):
+        """Get the cache of decoded thumbnails, e.g. to get its hit/miss and memory stats."""
+        return self._thumbnail_cache
+
     @property
     def dynamic_loading(self):
         """Get or set the property indicating if the model dynamicly loads data or not."""
@@ -331,9 +553,12 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                 return file_item.sg_data.get("name") or file_item.node_name
 
             if role == QtCore.Qt.DecorationRole:
-                if not model_item.thumbnail_icon:
-                    model_item.set_thumbnail(file_item.thumbnail_path)
-                return model_item.thumbnail_icon
+                # Only return the thumbnail if it is already cached, it is never requested
+                # while painting. The thumbnails of the visible items are read from the
+                # thumbnail atlas or decoded async (see `set_visible_indexes`), and the item
+                # is updated once the decoded thumbnail is cached.
+                icon = self._get_thumbnail_icon(model_item)
+                return icon if icon is not None else QtGui.QIcon()
 
             if role == FileTreeItemModel.GROUP_ID_ROLE:
                 return model_item.group_id
@@ -375,19 +600,9 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                 # it is also locked, we would need to create a separate role to determine
                 # if the file is locked or not, in addition to this status role that would
                 # then not check if the file is locked.
-                if file_item.locked:
-                    return FileTreeItemModel.STATUS_LOCKED
-
-                if file_item.highest_version_number:
-                    if (
-                        file_item.sg_data["version_number"]
-                        < file_item.highest_version_number
-                    ):
-                        return FileTreeItemModel.STATUS_OUT_OF_SYNC
-                    return FileTreeItemModel.STATUS_UP_TO_DATE
-
-                # Item may still loading, too early to determine the status.
-                return FileTreeItemModel.STATUS_NONE
+                # The statuses are computed for all file items at once by the store, and
+                # cached until the file items are modified.
+                return self.__file_store.get_status(file_item)
 
             if role == FileTreeItemModel.STATUS_FILTER_DATA_ROLE:
                 status_value = self.data(index, FileTreeItemModel.STATUS_ROLE)
@@ -451,48 +666,50 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                 return False
 
             if role == FileTreeItemModel.STATUS_ROLE:
-                num_children = model_item.child_count()
-                if num_children > 0:
-                    locked = True
-                    for row in range(num_children):
-                        child_index = self.index(row, 0, index)
-                        child_status = self.data(child_index, role)
-
-                        if child_status == FileTreeItemModel.STATUS_OUT_OF_SYNC:
-                            # The group status is out of sync if any children are out of sync.
-                            return FileTreeItemModel.STATUS_OUT_OF_SYNC
-
-                        if child_status != FileTreeItemModel.STATUS_LOCKED:
-                            # The group status is locked only if all children are locked.
-                            locked = False
-
-                    return (
-                        FileTreeItemModel.STATUS_LOCKED
-                        if locked
-                        else FileTreeItemModel.STATUS_UP_TO_DATE
-                    )
+                # The group status is out of sync if any children are out of sync, and locked
+                # only if all children are locked. The group has no status if it has no
+                # children, it should not exist.
+                return self.__file_store.get_group_status(model_item.group_id)
 
-                # Group has no children, it should not exist.
-                return None
+            if role == FileTreeItemModel.GROUP_STATUS_COUNTS_ROLE:
+                return self.__file_store.get_group_status_counts(model_item.group_id)
 
-        # base model item handling here for role methods
-        result = None
+            if role == FileTreeItemModel.GROUP_LOADING_COUNT_ROLE:
+                if self._is_loading_published_files():
+                    # All file items are loading
+                    return self.__file_store.get_group_count(model_item.group_id)
+                return self.__file_store.get_group_loading_count(model_item.group_id)
 
+        # base model item handling here for role methods
         # Check if the model has a method defined for retrieving the item data for this role.
         data_method = self.get_method_for_role(role)
-        if data_method:
-            try:
-                result = data_method(index)
-            except TypeError as error:
-                raise TankError(
-                    "Failed to execute the method defined to retrieve item data for role `{role}`.\nError: {msg}".format(
-                        role=role, msg=error
-                    )
+        if not data_method:
+            return None
+
+        # Only the file item data is memoized, the group item data depends on its children
+        # (e.g. the group status counts).
+        role_data = (
+            model_item.role_data
+            if model_item.file_item and role not in self._unmemoized_roles
+            else None
+        )
+        if role_data is not None and role in role_data:
+            return role_data[role]
+
+        self.__role_call_counts[role] = self.__role_call_counts.get(role, 0) + 1
+        try:
+            result = data_method(index)
+        except TypeError as error:
+            raise TankError(
+                "Failed to execute the method defined to retrieve item data for role `{role}`.\nError: {msg}".format(
+                    role=role, msg=error
                 )
-        else:
-            result = None
+            )
 
-        return shotgun_model.util.sanitize_qt(result)
+        result = shotgun_model.util.sanitize_qt(result)
+        if role_data is not None:
+            role_data[role] = result
+        return result
 
     def setData(self, index, value, role=QtCore.Qt.EditRole):
         """Sets the role data for the item at index to value."""
@@ -528,8 +745,15 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                     # Update the grouping of this file item now that its data has changed
                     # and it no longer belongs in its current group
                     self.update_file_group(index.row(), file_item, value)
+                    # The model item has moved to its new group
+                    index = self.__get_index_from_item(model_item)
+                if self.__model_items.get(id(file_item)) is model_item:
+                    del self.__model_items[id(file_item)]
 
             model_item.set_file_item(value)
+            if value:
+                self.__model_items[id(value)] = model_item
+                self.__file_store.update(value)
             changed = True
 
         elif role == FileTreeItemModel.FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE:
@@ -541,10 +765,19 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                     or file_item.latest_published_file.get("id") != value.get("id")
                 ):
                     file_item.latest_published_file = value
+                    self.__file_store.update(file_item)
                     changed = True
+                    # The status is derived from the latest published file
+                    change_roles.extend(
+                        [
+                            FileTreeItemModel.STATUS_ROLE,
+                            FileTreeItemModel.STATUS_FILTER_DATA_ROLE,
+                        ]
+                    )
 
         if changed:
-            self.dataChanged.emit(index, index, change_roles)
+            # The data changed signal is emitted once the changes are coalesced.
+            self._notify_item_changed(model_item, change_roles)
             return True
 
         return False
@@ -564,17 +797,7 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
             parent_item = parent.internalPointer()
 
         # Insert the rows now
-        if row == parent_item.child_count():
-            # Append to the parent item
-            for _ in range(count):
-                item = FileTreeModelItem()
-                parent_item.append_child(item)
-                item.parent_item = parent_item
-        else:
-            for i in range(count):
-                item = FileTreeModelItem()
-                parent_item.child_items.insert(row + i, item)
-                item.parent_item = parent_item
+        parent_item.insert_children(row, [FileTreeModelItem() for _ in range(count)])
 
         self.endInsertRows()
 
@@ -593,7 +816,14 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                 parent_item = parent.internalPointer()
 
             # Update the model internal data
-            del parent_item.child_items[row : row + count]
+            for removed_item in parent_item.remove_children(row, count):
+                for model_item in [removed_item] + removed_item.child_items:
+                    if (
+                        model_item.file_item
+                        and self.__model_items.get(id(model_item.file_item))
+                        is model_item
+                    ):
+                        del self.__model_items[id(model_item.file_item)]
 
             success = True
         else:
@@ -613,6 +843,8 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
         self.clear()
         self.stop_timer()
+        self._file_status_poll_scheduler.destroy()
+        self._close_thumbnail_atlas()
 
         if self._sg_data_retriever:
             self._sg_data_retriever.stop()
@@ -646,27 +878,67 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
         self.__root_item.reset()
 
-        self.__scene_objects = []
-        self.__file_items = []
+        self._set_scene_objects([])
+        self.__visible_model_items = []
+        self.__file_store.clear()
+        self.__model_items = {}
         self._group_items = {}
+        self._change_notifier.clear()
+
+        self._stop_pending_requests()
+
+    def _stop_pending_requests(self):
+        """Stop any background tasks currently running and reset the polling state."""
+
+        self.__reload_file_items = []
+        self._stop_scan()
+        self._stop_build()
 
         # Stop any background tasks currently running
-        self._bg_task_manager.stop_task(self.__pending_published_file_data_request)
-        self._bg_task_manager.stop_task(
-            self.__pending_latest_published_files_data_request
-        )
+        for published_file_group_id in self.__pending_published_file_data_requests:
+            self._bg_task_manager.stop_task_group(published_file_group_id)
+        if self.__pending_latest_published_files_data_request is not None:
+            self._bg_task_manager.stop_task_group(
+                self.__pending_latest_published_files_data_request
+            )
+
+        for latest_group_id in self.__pending_reload_latest_requests:
+            self._bg_task_manager.stop_task_group(latest_group_id)
 
         for version_request_id in self.__pending_version_requests:
             self._bg_task_manager.stop_task(version_request_id)
 
-        for thumbnail_request_id in self.__pending_thumbnail_requests:
-            self._bg_task_manager.stop_task(thumbnail_request_id)
+        # Cancel the running thumbnail requests, and discard the queued ones.
+        self._thumbnail_scheduler.clear()
+
+        for add_group_id in self.__pending_add_published_file_requests:
+            self._bg_task_manager.stop_task_group(add_group_id)
+
+        for add_group_id in self.__pending_add_latest_published_files_requests:
+            self._bg_task_manager.stop_task_group(add_group_id)
+
+        for decode_task_id in self.__pending_thumbnail_decodes:
+            self._bg_task_manager.stop_task(decode_task_id)
 
         # Clear request ids
-        self.__pending_published_file_data_request = None
+        self.__pending_published_file_data_requests.clear()
+        self.__pending_published_file_data = {}
+        self.__pending_reload_latest_requests.clear()
+        self.__reload_latest_results = []
         self.__pending_latest_published_files_data_request = None
+        self.__pending_latest_published_files_delta = False
         self.__pending_version_requests.clear()
         self.__pending_thumbnail_requests.clear()
+        self.__resolving_file_items.clear()
+        self.__file_store.clear_loading()
+        self.__pending_add_published_file_requests.clear()
+        self.__pending_add_latest_published_files_requests.clear()
+        self.__pending_thumbnail_decodes.clear()
+        self.__decoding_model_items.clear()
+
+        # Reset the polling state, the next status query will be a full re-sync.
+        self.__published_files_watermark = None
+        self.__last_full_resync_time = None
 
     #########################################################################################################
     # Public FileModel methods
@@ -676,52 +948,44 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         """
         Reload the data in the model.
 
-        Fire off a background task that scans the current scene to get all the file items. Once
-        the background task is complete, the file items will be processed to rebuild the model.
+        Scan the current scene progressively, and fire off background tasks to get the file
+        items for each slice of the scan. Once the scan and the background tasks are complete,
+        the file items will be processed to update the model.
 
-        This method will emit the signal that the model is resetting but does not call the
-        signal to end the model reset. The slot called when the scan scene task is complete
-        is responsible for emitting the end model reset signal.
+        The current model data is kept until all the reloaded data has been retrieved. The
+        model is then updated with the differences between the current and reloaded data
+        (rows inserted, removed or changed), rather than being reset.
+
+        This method will emit the signal `reload_started`. The slot called when the async
+        tasks are complete is responsible for emitting the `reload_finished` signal.
         """
 
-        self.beginResetModel()
         self.__is_reloading = True
+        self.reload_started.emit()
 
         try:
             restore_state = self.blockSignals(True)
-            self.clear()
+            self._stop_pending_requests()
             # Pause polling for updates while the model reloads. This will start again once
             # all async tasks are complete to reload the model.
             self.stop_timer()
 
             # Run the scan scene method in the main thread (not a background task) since this
-            # may cause issues for certain DCCs
-            self.__scene_objects = self._manager.get_scene_objects()
-
-            # Make an async request to get the published files for the references in the scene.
-            # This will omit any objects from the scene that do not have a
-            # Flow Production Tracking Published File. Some files can come from other projects
-            # so we cannot rely on templates, and instead need to query Flow Production Tracking.
-            file_paths = [o["path"] for o in self.__scene_objects]
-            self.__pending_published_file_data_request = (
-                self._manager.get_published_files_from_file_paths(
-                    file_paths,
-                    extra_fields=self._published_file_fields,
-                    bg_task_manager=self._bg_task_manager,
-                )
-            )
+            # may cause issues for certain DCCs. The scene is scanned in time slices, if the
+            # scene operations hook supports it.
+            self._set_scene_objects([])
+            self.__scene_scan = self._manager.iter_scene_objects()
         except:
             # Reset on failure to reload
-            self.__pending_published_file_data_request = None
+            self.__scene_scan = None
         finally:
-            # Restore block siganls state, but do not emit endResetModel signal yet, this will
-            # be done when the background tasks have completed to load the model data.
+            # Restore block siganls state, but do not emit the reload finished signal yet, this
+            # will be done when the background tasks have completed to load the model data.
             self.blockSignals(restore_state)
 
-        # If there was no data to fetch, then the model is done reloading (async tasks will
-        # not emit signals to finish model reload).
-        if self.__pending_published_file_data_request is None:
-            self._finish_reload(start_timer=False)
+        # Scan the first slice now, the next slices are scanned once control returns to the
+        # event loop.
+        self._scan_next_slice()
 
     @sgtk.LogManager.log_timing
     @wait_cursor
@@ -731,40 +995,107 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
         This method should be called if the model grouping (parent/child relationships) have
         been changed.
+
+        The model is reset, and built progressively from the current file items, in the same
+        time-budgeted slices as a reload (see `_start_build`). The status checks are skipped
+        until the model is built.
         """
 
         # Do not refresh if the model is in the middle of a reload already
         if self.__is_reloading:
             return
 
-        self.layoutAboutToBeChanged.emit()
+        # Save the current file items to refresh with (these will be lost on clear)
+        file_items = self.__file_store.items
 
+        self.beginResetModel()
         try:
-            restore_state = self.blockSignals(True)
+            self.clear()
+        finally:
+            self.endResetModel()
 
-            # Save the current file items to refresh with (these will be lost on clear)
-            file_items = self.__file_items
+        # Rebuild the model without refreshing the current model data, only the model
+        # structure has changed. The file items are indexed again by their new group as they
+        # are built. Thumbnails that have already been retrieved are not requested again.
+        self._start_build(file_items)
 
-            if self.__pending_thumbnail_requests:
-                request_thumbnails = True
-            else:
-                request_thumbnails = False
+    @sgtk.LogManager.log_timing
+    def rescan(self):
+        """
+        Scan the scene and update the model with the differences since the last scan.
 
-            # Clear the current model and pause the timer polling for updates.
-            self.clear()
-            self.stop_timer()
+        Scene objects are compared with the last scan by their node name, node type and path.
+        File items for unchanged scene objects are kept as is, file items for scene objects
+        that are no longer in the scene are removed, and only the new scene objects are
+        resolved to published files async, to add their file items to the model.
 
-            # Restore the file items
-            self.__file_items = file_items
+        If the model has not been loaded yet, or is in the middle of a reload, a full reload
+        is performed instead.
 
-            # Rebuild the model without refreshing the current model data. Only the model
-            # structure has chagned.
-            self._build_model_from_file_items(refresh_thumbnails=request_thumbnails)
+        The signal `rescan_finished` is emitted once the model has been updated.
+        """
 
-            self.start_timer()
-        finally:
-            self.blockSignals(restore_state)
-            self.layoutChanged.emit()
+        if not self.__has_loaded or self.__is_reloading:
+            self.reload()
+            return
+
+        scene_objects = self._manager.get_scene_objects()
+        scene_object_keys = set(self._get_scene_object_key(o) for o in scene_objects)
+
+        # File items are updated in place when their version changes (e.g. their path), so
+        # use the file items' current key, rather than the last scanned scene object.
+        known_keys = set(self.__scene_objects.keys())
+        file_items_to_remove = []
+        for file_item in self.__file_store:
+            key = self._get_file_item_key(file_item)
+            known_keys.add(key)
+            if key not in scene_object_keys:
+                file_items_to_remove.append(file_item)
+
+        added_scene_objects = [
+            o for o in scene_objects if self._get_scene_object_key(o) not in known_keys
+        ]
+        self._set_scene_objects(scene_objects)
+
+        # Remove the file items that are no longer in the scene.
+        self._remove_file_items(file_items_to_remove)
+
+        # Update the state of the file items that are still in the scene.
+        file_items_by_key = {
+            self._get_file_item_key(file_item): file_item
+            for file_item in self.__file_store
+        }
+        for scene_object in scene_objects:
+            file_item = file_items_by_key.get(self._get_scene_object_key(scene_object))
+            if not file_item:
+                continue
+
+            locked = scene_object.get("locked", False)
+            loaded = scene_object.get("loaded", True)
+            if file_item.locked == locked and file_item.loaded == loaded:
+                continue
+
+            file_item.locked = locked
+            file_item.loaded = loaded
+            self.__file_store.update(file_item)
+            model_item = self.__model_items.get(id(file_item))
+            if model_item:
+                self._notify_item_changed(model_item)
+
+        if not added_scene_objects:
+            self.rescan_finished.emit()
+            return
+
+        # Resolve the new scene objects async, their file items will be added to the model
+        # once all their data has been retrieved (per chunk of file paths resolved).
+        group_id = self._manager.get_published_files_from_file_paths_by_chunk(
+            [o["path"] for o in added_scene_objects],
+            self._bg_task_manager,
+            extra_fields=self._published_file_fields,
+        )
+        self.__pending_add_published_file_requests[
+            group_id
+        ] = self._get_scene_objects_by_path(added_scene_objects)
 
     @sgtk.LogManager.log_timing
     @wait_cursor
@@ -799,45 +1130,111 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
             return False
 
         # Get the latest published file for the new item.
-        item_published_files = self._get_published_files_for_items(file_items)
-        file_item.latest_published_file = item_published_files[0]
+        result = self._resolve_latest_published_files(file_items)
+        file_item.latest_published_file = result["latest_published_files"].get(
+            self._manager.get_publish_key(file_item)
+        )
 
         # Now we have all the data necessary to add the new file item to the model.
-        group_by_id, group_by_display = self._get_file_group_info(file_item)
-        if self._group_items.get(group_by_id) is None:
-            # Insert a new row in the model for the new file item grouping
-            group_row = self.__root_item.child_count()
-            success = self.insertRows(group_row, 1)
-            if not success:
-                return False
+        success = self._insert_file_item(file_item)
+        if success:
+            # Update the internal data with the new file item.
+            self._add_scene_objects([file_item_data])
 
-            group_index = self.index(group_row)
-            self.setData(group_index, group_by_id, self.GROUP_ID_ROLE)
-            self.setData(group_index, group_by_display, self.GROUP_DISPLAY_ROLE)
+        return success
 
-            group_item = group_index.internalPointer()
-            self._group_items[group_by_id] = group_item
-        else:
-            # Get the existing group item to add the new file model item to.
-            group_item = self._group_items[group_by_id]
-            group_index = self.index(group_item.row(), 0)
+    def add_items(self, file_items_data):
+        """
+        Add new file items to the model from the given data, async.
 
-        # Insert the row in the model to hold the new file item data
-        item_row = group_item.child_count()
-        success = self.insertRows(item_row, 1, group_index)
-        if success:
-            item_index = self.index(item_row, 0, group_index)
-            self.setData(item_index, file_item, self.FILE_ITEM_ROLE)
+        The published files of all the new file items are resolved with a single async
+        request (split into chunks of file paths). The file items of each chunk are inserted
+        as soon as the chunk is resolved, with one row insertion per group, and are shown as
+        loading until their latest published file is resolved.
 
-            # Request the thumbnail data
-            file_model_item = item_index.internalPointer()
-            self._request_thumbnail(file_model_item, file_item)
+        The signal `rescan_finished` is emitted once all file items have been added.
 
-            # Update the internal data with the new file item.
-            self.__scene_objects.append(file_item_data)
-            self.__file_items.append(file_item)
+        :param file_items_data: The data to create the new file items from, as returned by
+            the scan scene hook.
+        :type file_items_data: List[dict]
 
-        return success
+        :return: True if new file items are being added, else False.
+        :rtype: bool
+        """
+
+        if self.__is_reloading:
+            return False
+
+        # Keep track of the new scene objects now, such that they are not added if removed
+        # before they are resolved.
+        scene_objects = []
+        for scene_object in file_items_data:
+            scene_object_key = self._get_scene_object_key(scene_object)
+            if scene_object_key in self.__scene_objects:
+                continue
+            self._add_scene_objects([scene_object])
+            scene_objects.append(scene_object)
+
+        if not scene_objects:
+            return False
+
+        group_id = self._manager.get_published_files_from_file_paths_by_chunk(
+            [o["path"] for o in scene_objects],
+            self._bg_task_manager,
+            extra_fields=self._published_file_fields,
+        )
+        self.__pending_add_published_file_requests[
+            group_id
+        ] = self._get_scene_objects_by_path(scene_objects)
+        return True
+
+    def remove_items(self, file_paths):
+        """
+        Remove the file items corresponding to the given file paths from the model.
+
+        One file item is removed per file path, matching either its current path or the
+        path before it was updated. The rows are removed in bulk, with one row removal per
+        range of contiguous rows.
+
+        :param file_paths: The file paths to look up the file items to remove.
+        :type file_paths: List[str]
+
+        :return: The number of file items removed.
+        :rtype: int
+        """
+
+        if self.__is_reloading:
+            return 0
+
+        file_items_to_remove = {}
+        for file_path in file_paths:
+            file_items = self.__file_store.get_by_path(
+                file_path
+            ) + self.__file_store.get_by_old_path(file_path)
+            file_item = next(
+                (fi for fi in file_items if id(fi) not in file_items_to_remove), None
+            )
+            if file_item is None:
+                # The file item may not be resolved yet, remove its scene object such that
+                # it is not added once resolved.
+                scene_object_keys = self.__scene_object_keys_by_path.get(file_path)
+                if scene_object_keys:
+                    self._remove_scene_object(next(iter(scene_object_keys)))
+                continue
+
+            file_items_to_remove[id(file_item)] = file_item
+
+            # The scene object may still have the path before the file item was updated.
+            for path in (
+                file_item.path,
+                (file_item.extra_data or {}).get("old_path"),
+            ):
+                scene_object_key = (file_item.node_name, file_item.node_type, path)
+                if self._remove_scene_object(scene_object_key):
+                    break
+
+        self._remove_file_items(list(file_items_to_remove.values()))
+        return len(file_items_to_remove)
 
     @sgtk.LogManager.log_timing
     @wait_cursor
@@ -864,39 +1261,22 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
             # Invalid index data
             return False
 
-        file_path = file_item_to_remove.path
-        for i, obj in enumerate(self.__scene_objects):
-            if obj["path"] == file_path:
-                del self.__scene_objects[i]
-                break
-
-        for i, fi in enumerate(self.__file_items):
-            if fi == file_item_to_remove:
-                del self.__file_items[i]
+        # The scene object may still have the path before the file item was updated.
+        for path in (
+            file_item_to_remove.path,
+            (file_item_to_remove.extra_data or {}).get("old_path"),
+        ):
+            scene_object_key = (
+                file_item_to_remove.node_name,
+                file_item_to_remove.node_type,
+                path,
+            )
+            if self._remove_scene_object(scene_object_key):
                 break
 
-        parent_index = index.parent()
-        success = self.removeRows(index.row(), 1, parent_index)
-
-        if not success:
-            # Failed to remove item, return failure.
-            return False
-
-        # Check if by remove this item, the item's group is now empty. If so, remove the group
-        if not parent_index.isValid():
-            # No parent group to check, return success.
-            return True
-
-        if not self.rowCount(parent_index):
-            # Remove the group from the internal data list
-            group_id = self.data(parent_index, self.GROUP_ID_ROLE)
-            del self._group_items[group_id]
-
-            # Remove the group since it is now empty. Return the result of removing the group.
-            return self.removeRows(parent_index.row(), 1, parent_index.parent())
+        self.__file_store.remove(file_item_to_remove)
 
-        # Item removed successfully.
-        return True
+        return self._remove_index(index)
 
     def get_group_by_fields(self):
         """
@@ -912,7 +1292,7 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
     def item_from_file(self, file_item):
         """
-        Traverse the model to get the model item that matches the given file item data.
+        Get the model item that matches the given file item data.
 
         :param file_item: The file item data to find the model item by.
         :type file_item: FileItem
@@ -921,27 +1301,19 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         :rtype: FileModelItem
         """
 
-        row_count = self.__root_item.child_count()
-
-        for group_row in range(row_count):
-            group_index = self.index(group_row, 0)
-            group_item = group_index.internalPointer()
-
-            num_children = group_item.child_count()
-            for child_row in range(num_children):
-                child_index = self.index(child_row, 0, group_index)
-
-                if (
-                    self.data(child_index, FileTreeItemModel.FILE_ITEM_ROLE)
-                    == file_item
-                ):
-                    return child_index.internalPointer()
+        model_item = self.__model_items.get(id(file_item))
+        if model_item:
+            return model_item
 
-        return None
+        # Look up the file item that is equal to the given one.
+        stored_file_item = self.__file_store.find(file_item)
+        if stored_file_item is None:
+            return None
+        return self.__model_items.get(id(stored_file_item))
 
     def index_from_file_path(self, file_path, check_old_path=False):
         """
-        Traverse the model to get the model item index that matches the given file path.
+        Get the model item index that matches the given file path.
 
         :param file_path: The file path to find the model index by.
         :type file_path: str
@@ -954,26 +1326,14 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         :rtype: QtCore.QModelIndex
         """
 
-        row_count = self.__root_item.child_count()
-
-        for group_row in range(row_count):
-            group_index = self.index(group_row, 0)
-            group_item = group_index.internalPointer()
-
-            num_children = group_item.child_count()
-            for child_row in range(num_children):
-                child_index = self.index(child_row, 0, group_index)
-                file_item = self.data(child_index, FileTreeItemModel.FILE_ITEM_ROLE)
+        file_items = self.__file_store.get_by_path(file_path)
+        if check_old_path:
+            file_items += self.__file_store.get_by_old_path(file_path)
 
-                if file_item.path == file_path:
-                    return child_index
-
-                if (
-                    check_old_path
-                    and file_item.extra_data
-                    and file_item.extra_data.get("old_path") == file_path
-                ):
-                    return child_index
+        for file_item in file_items:
+            model_item = self.__model_items.get(id(file_item))
+            if model_item:
+                return self.__get_index_from_item(model_item)
 
         return QtCore.QModelIndex()
 
@@ -991,331 +1351,1641 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         :type new_file_item_data: FileItem
         """
 
-        # Get the current grouping and remove the file model item from it, and remove the
-        # grouping totally if it becomes empty after removing the item.
         cur_group_id, _ = self._get_file_group_info(cur_file_item_data)
+        new_group_id, new_group_display = self._get_file_group_info(new_file_item_data)
         cur_group_item = self._group_items.get(cur_group_id)
-        file_model_item = cur_group_item.takeRow(file_model_item_row)
-        if not cur_group_item.hasChildren():
-            self.removeRow(cur_group_item.row())
+        if cur_group_item is None or cur_group_id == new_group_id:
+            return
+
+        # Get the current grouping and remove the file model item from it, and remove the
+        # grouping totally if it becomes empty after removing the item.
+        cur_group_index = self.index(cur_group_item.row(), 0)
+        self.beginRemoveRows(cur_group_index, file_model_item_row, file_model_item_row)
+        file_model_item = cur_group_item.take_child(file_model_item_row)
+        self.endRemoveRows()
+        if file_model_item is None:
+            return
+
+        if not cur_group_item.child_count():
             del self._group_items[cur_group_id]
+            self.removeRows(cur_group_item.row(), 1)
 
         # Get the new grouping, create the group item if it does not yet exist, and add the
         # file model item to it
-        new_group_id, new_group_display = self._get_file_group_info(new_file_item_data)
         new_group_item = self._group_items.get(new_group_id)
         if new_group_item is None:
+            group_row = self.__root_item.child_count()
+            self.beginInsertRows(QtCore.QModelIndex(), group_row, group_row)
             new_group_item = FileTreeModelItem(
                 group_id=new_group_id, group_display=new_group_display
             )
-            self._group_items[new_group_id] = new_group_item
             self.__root_item.append_child(new_group_item)
-            self.appendRow(new_group_item)
+            self.endInsertRows()
+            self._group_items[new_group_id] = new_group_item
 
+        new_group_index = self.index(new_group_item.row(), 0)
+        item_row = new_group_item.child_count()
+        self.beginInsertRows(new_group_index, item_row, item_row)
         new_group_item.append_child(file_model_item)
+        self.endInsertRows()
 
     #########################################################################################################
     # Protected FileModel methods
 
-    def _finish_reload(self, start_timer=True):
+    @staticmethod
+    def _get_scene_object_key(scene_object):
         """
-        Model has finished reloading.
+        Get the key to compare scene objects between scans.
 
-        Emit the Qt signal for model reset and reset the reloading flag.
+        :param scene_object: The scene object, as returned by the scan scene hook.
+        :type scene_object: dict
 
-        :param start_timer: True will start the timer to poll for published file updates.
-        :type start_time: bool
+        :return: The scene object key (node name, node type, path).
+        :rtype: tuple
         """
 
-        if start_timer:
-            self.start_timer()
-
-        self.__is_reloading = False
-        self.endResetModel()
+        return (
+            scene_object["node_name"],
+            scene_object["node_type"],
+            scene_object["path"],
+        )
 
-    @sgtk.LogManager.log_timing
-    def _build_model_from_file_items(
-        self, published_files_mapping=None, refresh_thumbnails=True
-    ):
+    @classmethod
+    def _get_scene_objects_by_key(cls, scene_objects):
         """
-        Process the current file items data in the model to create and add the model items.
+        Get the given scene objects by their key.
 
-        A model item will be created for each of the given file items, and will be added to
-        the model.
+        :param scene_objects: The scene objects, as returned by the scan scene hook.
+        :type scene_objects: List[dict]
 
-        This method does not clear the current model items, the clear method, in most cases,
-        should be called before this method.
-
-        :param published_files_mapping: A dictionary mapping a list of published files by
-            their entity, task, published file type, and name. This is used to set the file
-            items' latest published file field. It is assumed that the list of published files
-            in this mapping are already sorted from highest version number to lowest. If not
-            provided, the latest published file data will not be updated.
-        :type published_files_mapping: dict
-        :param refresh_thumbnails: True will fetch thumbnails for file items async, else False
-            will not update the thumbnail data for file items. Default is True.
-        :type refresh_thumbnails: bool
+        :return: The scene objects by their key, in the given order.
+        :rtype: dict
         """
 
-        # Keep track of file items by grouping to add all at once at the end of processing. It
-        # is more efficient to call appendRows rather than appendRow for each item.
-        file_items_by_group = {}
+        return {cls._get_scene_object_key(o): o for o in scene_objects}
 
-        for file_item in self.__file_items:
-            # if the item doesn't have any associated shotgun data, it means that the file is not a
-            # Published File so skip it
-            if not file_item.sg_data:
-                continue
+    @staticmethod
+    def _get_scene_objects_by_path(scene_objects):
+        """
+        Get the given scene objects by their path, with their position in the given list.
 
-            group_by_id, group_by_display = self._get_file_group_info(file_item)
-            if self._group_items.get(group_by_id) is None:
-                group_item = FileTreeModelItem(
-                    group_id=group_by_id, group_display=group_by_display
-                )
-                self._group_items[group_by_id] = group_item
-            else:
-                group_item = self._group_items[group_by_id]
+        The scene objects of a chunk of file paths are looked up from the result of the chunk
+        with `_get_chunk_scene_objects`, without going through all the scene objects.
 
-            if published_files_mapping:
-                file_item.latest_published_file = (
-                    self._get_latest_published_file_for_item(
-                        file_item, published_files_mapping
-                    )
-                )
+        :param scene_objects: The scene objects, as returned by the scan scene hook.
+        :type scene_objects: List[dict]
 
-            file_model_item = FileTreeModelItem(file_item=file_item)
+        :return: The list of (position, scene object) by path.
+        :rtype: dict
+        """
 
-            # Make async requests to get the item thumbnail data while the model data is being
-            # processed.
-            if refresh_thumbnails:
-                self._request_thumbnail(file_model_item, file_item)
+        scene_objects_by_path = {}
+        for position, scene_object in enumerate(scene_objects):
+            scene_objects_by_path.setdefault(scene_object["path"], []).append(
+                (position, scene_object)
+            )
+        return scene_objects_by_path
 
-            # Add the file item to the grouping
-            file_items_by_group.setdefault(group_by_id, []).append(file_model_item)
+    @staticmethod
+    def _get_chunk_scene_objects(scene_objects_by_path, published_files):
+        """
+        Get the scene objects that have a published file in the result of a chunk of file
+        paths, in their scene order.
 
-        # Add all model items (by their parent) at once to improve performance.
-        group_items = list(self._group_items.values())
+        :param scene_objects_by_path: The scene objects of the request, as returned by
+            `_get_scene_objects_by_path`.
+        :type scene_objects_by_path: dict
+        :param published_files: The published files of the chunk, by file path.
+        :type published_files: dict
 
-        for group_item in group_items:
-            group_item.parent_item = self.__root_item
-            self.__root_item.append_child(group_item)
+        :return: The scene objects of the chunk.
+        :rtype: List[dict]
+        """
 
-        for group_id, file_items in file_items_by_group.items():
-            group_item = self._group_items[group_id]
-            for file_item in file_items:
-                file_item.parent_item = group_item
-                group_item.append_child(file_item)
+        chunk_scene_objects = []
+        for path in published_files:
+            chunk_scene_objects.extend(scene_objects_by_path.get(path, []))
+        chunk_scene_objects.sort(key=lambda position_object: position_object[0])
+        return [scene_object for _, scene_object in chunk_scene_objects]
 
-    @sgtk.LogManager.log_timing
-    def _update_latest_published_files(self, published_files_mapping):
+    def _set_scene_objects(self, scene_objects):
         """
-        Update the current model data to reflect the latest published file data.
+        Set the scene objects that determine the file items shown in the app.
 
-        :param published_files_mapping: A dictionary mapping a list of published files by
-            their entity, task, published file type, and name which is used to determine
-            the latest published file for the given item. This param is expected to be the
-            result returned by the method `_get_published_files_mapping`.
-        :type published_files_mapping: dict
+        :param scene_objects: The scene objects, as returned by the scan scene hook.
+        :type scene_objects: List[dict]
         """
 
-        # NOTE: watch performance here. If many items update their published files at once,
-        # this causes many consecutive data changed signals per item, which could make the
-        # UI sluggish.
+        self.__scene_objects = {}
+        self.__scene_object_keys_by_path = {}
+        self._add_scene_objects(scene_objects)
 
-        row_count = self.__root_item.child_count()
+    def _add_scene_objects(self, scene_objects):
+        """
+        Add the given scene objects to the scene objects that determine the file items shown
+        in the app, replacing the scene objects with the same key.
 
-        for row in range(row_count):
-            group_index = self.index(row, 0)
-            group_item = group_index.internalPointer()
-            child_row_count = group_item.child_count()
+        :param scene_objects: The scene objects, as returned by the scan scene hook.
+        :type scene_objects: List[dict]
+        """
 
-            for child_row in range(child_row_count):
-                child_index = self.index(child_row, 0, group_index)
-                file_item = self.data(child_index, self.FILE_ITEM_ROLE)
-                latest_published_file = self._get_latest_published_file_for_item(
-                    file_item, published_files_mapping
-                )
-                self.setData(
-                    child_index,
-                    latest_published_file,
-                    FileTreeItemModel.FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE,
-                )
+        for scene_object in scene_objects:
+            scene_object_key = self._get_scene_object_key(scene_object)
+            self.__scene_objects[scene_object_key] = scene_object
+            # The keys of a path are kept in order, as a dict with no values.
+            self.__scene_object_keys_by_path.setdefault(scene_object_key[2], {})[
+                scene_object_key
+            ] = None
 
-    def is_loading(self, index=None):
+    def _remove_scene_object(self, scene_object_key):
+        """
+        Remove the scene object with the given key.
+
+        :param scene_object_key: The key of the scene object to remove, as returned by
+            `_get_scene_object_key`.
+        :type scene_object_key: tuple
+
+        :return: The removed scene object, or None if there is no scene object for the key.
+        :rtype: dict
+        """
+
+        scene_object = self.__scene_objects.pop(scene_object_key, None)
+        if scene_object is None:
+            return None
+
+        path = scene_object_key[2]
+        scene_object_keys = self.__scene_object_keys_by_path[path]
+        del scene_object_keys[scene_object_key]
+        if not scene_object_keys:
+            del self.__scene_object_keys_by_path[path]
+        return scene_object
+
+    @staticmethod
+    def _get_file_item_identity(file_item):
+        """
+        Get the key to compare file items between reloads.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+
+        :return: The file item identity (node name, node type, path, published file id).
+        :rtype: tuple
+        """
+
+        return (
+            file_item.node_name,
+            file_item.node_type,
+            file_item.path,
+            (file_item.sg_data or {}).get("id"),
+        )
+
+    @staticmethod
+    def _get_file_item_key(file_item):
+        """
+        Get the key to compare the file item with the scene objects.
+
+        :param file_item: The file item.
+        :type file_item: FileItem
+
+        :return: The file item key (node name, node type, path).
+        :rtype: tuple
+        """
+
+        return (file_item.node_name, file_item.node_type, file_item.path)
+
+    def _insert_file_item(self, file_item):
+        """
+        Insert a row in the model for the given file item, under its group.
+
+        The group is created if it does not exist yet. The file item is added to the file
+        store, and its thumbnail is requested async.
+
+        :param file_item: The file item to insert.
+        :type file_item: FileItem
+
+        :return: True if the file item was inserted successfully, else False.
+        :rtype: bool
+        """
+
+        group_by_id, group_by_display = self._get_file_group_info(file_item)
+        if self._group_items.get(group_by_id) is None:
+            # Insert a new row in the model for the new file item grouping
+            group_row = self.__root_item.child_count()
+            success = self.insertRows(group_row, 1)
+            if not success:
+                return False
+
+            group_index = self.index(group_row)
+            self.setData(group_index, group_by_id, self.GROUP_ID_ROLE)
+            self.setData(group_index, group_by_display, self.GROUP_DISPLAY_ROLE)
+
+            group_item = group_index.internalPointer()
+            self._group_items[group_by_id] = group_item
+        else:
+            # Get the existing group item to add the new file model item to.
+            group_item = self._group_items[group_by_id]
+            group_index = self.index(group_item.row(), 0)
+
+        # Insert the row in the model to hold the new file item data
+        item_row = group_item.child_count()
+        success = self.insertRows(item_row, 1, group_index)
+        if success:
+            item_index = self.index(item_row, 0, group_index)
+            self.setData(item_index, file_item, self.FILE_ITEM_ROLE)
+            self.__file_store.add(file_item)
+
+            # Request the thumbnail data
+            file_model_item = item_index.internalPointer()
+            self._request_thumbnail(file_model_item, file_item)
+
+        return success
+
+    def _remove_index(self, index):
+        """
+        Remove the row for the given index, and its group if it becomes empty.
+
+        :param index: The index of the file item to remove.
+        :type index: QtCore.QModelIndex
+
+        :return: True if the item was successfully removed, else False.
+        :rtype: bool
+        """
+
+        if not index.isValid():
+            return False
+
+        parent_index = index.parent()
+        success = self.removeRows(index.row(), 1, parent_index)
+
+        if not success:
+            # Failed to remove item, return failure.
+            return False
+
+        # Check if by remove this item, the item's group is now empty. If so, remove the group
+        if not parent_index.isValid():
+            # No parent group to check, return success.
+            return True
+
+        if not self.rowCount(parent_index):
+            # Remove the group from the internal data list
+            group_id = self.data(parent_index, self.GROUP_ID_ROLE)
+            del self._group_items[group_id]
+
+            # Remove the group since it is now empty. Return the result of removing the group.
+            return self.removeRows(parent_index.row(), 1, parent_index.parent())
+
+        # Item removed successfully.
+        return True
+
+    def _insert_file_items(self, file_items, resolving=False):
+        """
+        Insert the rows for the given file items in the model, under their group.
+
+        Missing groups are created at once, and the rows are inserted with one row insertion
+        per group. The file items are added to the file store, and their thumbnails are
+        requested async.
+
+        :param file_items: The file items to insert.
+        :type file_items: List[FileItem]
+        :param resolving: True if the latest published file of the file items is being
+            resolved, in which case the file items are shown as loading until
+            `_apply_resolved_file_items` is called.
+        :type resolving: bool
+        """
+
+        new_group_items = {}
+        model_items_by_group = {}
+
+        for file_item in file_items:
+            if not file_item.sg_data:
+                continue
+
+            self.__file_store.add(file_item)
+            if resolving:
+                self.__resolving_file_items.add(id(file_item))
+                self.__file_store.set_loading(file_item, True)
+            self._add_file_model_item(file_item, new_group_items, model_items_by_group)
+
+        self._insert_model_items(new_group_items, model_items_by_group)
+
+    def _apply_resolved_file_items(self, file_items, latest_published_files=None):
+        """
+        Set the latest published file of the added file items, once resolved, and mark the
+        file items as no longer loading.
+
+        File items that have been removed since they were added are ignored.
+
+        :param file_items: The file items added by `_insert_file_items`.
+        :type file_items: List[FileItem]
+        :param latest_published_files: The latest published file data, by published file
+            key, as returned by `BreakdownManager.get_latest_published_files_index`. If not
+            provided (e.g. the request failed), the latest published files are not set.
+        :type latest_published_files: dict
+        """
+
+        for file_item in file_items:
+            self.__resolving_file_items.discard(id(file_item))
+            model_item = self.__model_items.get(id(file_item))
+            if model_item is None:
+                continue
+
+            if id(file_item) not in self._thumbnail_scheduler:
+                self.__file_store.set_loading(file_item, False)
+            self._notify_item_changed(model_item, [self.VIEW_ITEM_LOADING_ROLE])
+
+            if latest_published_files:
+                self.setData(
+                    self.__get_index_from_item(model_item),
+                    latest_published_files.get(
+                        self._manager.get_publish_key(file_item)
+                    ),
+                    FileTreeItemModel.FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE,
+                )
+
+    def _remove_file_items(self, file_items):
+        """
+        Remove the rows of the given file items from the model, and the file items from the
+        file store.
+
+        The rows are removed with one row removal per range of contiguous rows, and the groups
+        that become empty are removed.
+
+        :param file_items: The file items to remove.
+        :type file_items: List[FileItem]
+        """
+
+        rows_by_group = {}
+        for file_item in file_items:
+            self.__file_store.remove(file_item)
+            self.__resolving_file_items.discard(id(file_item))
+            model_item = self.__model_items.get(id(file_item))
+            if model_item is None or model_item.parent_item is None:
+                continue
+            rows_by_group.setdefault(id(model_item.parent_item), []).append(
+                (model_item.parent_item, model_item.row())
+            )
+
+        empty_group_rows = []
+        for group_rows in rows_by_group.values():
+            group_item = group_rows[0][0]
+            group_index = self.__get_index_from_item(group_item)
+
+            # Remove the ranges of rows from the last, such that the rows of the ranges left
+            # to remove do not change.
+            ranges = ChangeNotifier.get_ranges([(row, None) for _, row in group_rows])
+            for first_row, last_row, _ in reversed(ranges):
+                self.removeRows(first_row, last_row - first_row + 1, group_index)
+
+            if not group_item.child_count():
+                # Remove the group since it is now empty.
+                self._group_items.pop(group_item.group_id, None)
+                empty_group_rows.append(group_item.row())
+
+        for first_row, last_row, _ in reversed(
+            ChangeNotifier.get_ranges([(row, None) for row in empty_group_rows])
+        ):
+            self.removeRows(first_row, last_row - first_row + 1)
+
+    def _check_rescan_finished(self):
+        """Emit the rescan finished signal if there are no more pending rescan requests."""
+
+        if (
+            not self.__pending_add_published_file_requests
+            and not self.__pending_add_latest_published_files_requests
+        ):
+            self.rescan_finished.emit()
+
+    def _finish_reload(self, start_timer=True):
+        """
+        Model has finished reloading.
+
+        Emit the reload finished signal and reset the reloading flag.
+
+        :param start_timer: True will start the timer to poll for published file updates.
+        :type start_time: bool
+        """
+
+        if start_timer:
+            self.start_timer()
+
+        self.__is_reloading = False
+        self.__has_loaded = True
+        self._app.logger.debug(
+            "Thumbnail cache stats: %s" % self._thumbnail_cache.stats
+        )
+        self._app.logger.debug("Role method call counts: %s" % self.role_call_counts)
+        self.reload_finished.emit()
+
+    @sgtk.LogManager.log_timing
+    def _apply_reloaded_file_items(self, file_items, latest_published_files=None):
+        """
+        Update the model to reflect the given reloaded file items.
+
+        The reloaded file items are compared with the current file items by their node name,
+        node type, path and published file. The current file items that match a reloaded
+        file item are kept and updated with the reloaded data, such that their rows (and any
+        view state, e.g. selection) are preserved. The rows of the current file items that
+        do not match any reloaded file item are removed, and rows are inserted for the new
+        file items.
+
+        If the model is currently empty, the model is reset and built progressively from the
+        reloaded file items (see `_start_build`).
+
+        :param file_items: The reloaded file items.
+        :type file_items: List[FileItem]
+        :param latest_published_files: The latest published file data, by published file
+            key, as returned by `BreakdownManager.get_latest_published_files_index`.
+            This is used to set the file items' latest published file field.
+        :type latest_published_files: dict
+        """
+
+        if not self.__root_item.child_count():
+            # Nothing to preserve, it is more efficient to reset the model, and insert the
+            # rows as they are built.
+            self.beginResetModel()
+            try:
+                self.__root_item.reset()
+                self.__model_items = {}
+                self._group_items = {}
+                self.__file_store.clear()
+            finally:
+                self.endResetModel()
+            self._start_build(file_items, latest_published_files)
+            return
+
+        # Only file items with published file data are displayed in the model.
+        reloaded_file_items = {}
+        for file_item in file_items:
+            if not file_item.sg_data:
+                continue
+            if latest_published_files:
+                file_item.latest_published_file = latest_published_files.get(
+                    self._manager.get_publish_key(file_item)
+                )
+            reloaded_file_items.setdefault(
+                self._get_file_item_identity(file_item), []
+            ).append(file_item)
+
+        model_items = self.__model_items
+        kept_file_items = []
+        removed_file_items = []
+        added_file_items = []
+        changed_model_items = []
+        thumbnail_model_items = []
+        for file_item in self.__file_store:
+            matches = reloaded_file_items.get(self._get_file_item_identity(file_item))
+            if not matches:
+                removed_file_items.append(file_item)
+                continue
+
+            reloaded_file_item = matches.pop(0)
+            cur_group_id, _ = self._get_file_group_info(file_item)
+            sg_data_changed = file_item.sg_data != reloaded_file_item.sg_data
+            changed_roles = self._get_reloaded_file_item_roles(
+                file_item,
+                reloaded_file_item,
+                latest_published_file_changed=bool(latest_published_files),
+            )
+
+            # Update the current file item in place to preserve its model item.
+            file_item.sg_data = reloaded_file_item.sg_data
+            file_item.extra_data = reloaded_file_item.extra_data
+            file_item.locked = reloaded_file_item.locked
+            file_item.loaded = reloaded_file_item.loaded
+            if latest_published_files:
+                file_item.latest_published_file = (
+                    reloaded_file_item.latest_published_file
+                )
+
+            model_item = model_items.get(id(file_item))
+            new_group_id, _ = self._get_file_group_info(file_item)
+            if model_item is None or cur_group_id != new_group_id:
+                # The file item moved to another group, remove and insert it again.
+                removed_file_items.append(file_item)
+                added_file_items.append(file_item)
+                if sg_data_changed:
+                    # The thumbnail is requested again when the file item is inserted.
+                    file_item.thumbnail_path = None
+            else:
+                kept_file_items.append(file_item)
+                if changed_roles:
+                    changed_model_items.append((model_item, changed_roles))
+                if sg_data_changed:
+                    # The thumbnail may have changed with the published file data, request
+                    # it again once the file store is updated.
+                    model_item.set_thumbnail(None)
+                    thumbnail_model_items.append(model_item)
+
+        for matches in reloaded_file_items.values():
+            added_file_items.extend(matches)
+
+        # Emit a single data changed signal per range of updated file items, only for the
+        # file items whose data changed.
+        for model_item, changed_roles in changed_model_items:
+            self._notify_item_changed(model_item, changed_roles)
+
+        # Remove the rows with one row removal per range of contiguous rows.
+        self._remove_file_items(removed_file_items)
+
+        self.__file_store.reset(kept_file_items)
+        self._restore_file_store_loading()
+        for model_item in thumbnail_model_items:
+            self._request_thumbnail(model_item, model_item.file_item)
+
+        # Insert the rows with one row insertion per group.
+        self._insert_file_items(added_file_items)
+
+    def _get_reloaded_file_item_roles(
+        self, file_item, reloaded_file_item, latest_published_file_changed=True
+    ):
+        """
+        Get the roles of the file item data that change when the file item is updated with
+        the reloaded file item data.
+
+        :param file_item: The current file item.
+        :type file_item: FileItem
+        :param reloaded_file_item: The reloaded file item.
+        :type reloaded_file_item: FileItem
+        :param latest_published_file_changed: False if the latest published file of the
+            current file item is not updated.
+        :type latest_published_file_changed: bool
+
+        :return: The changed roles, or an empty list if the file item data does not change.
+        :rtype: List[int]
+        """
+
+        status_roles = [
+            FileTreeItemModel.STATUS_ROLE,
+            FileTreeItemModel.STATUS_FILTER_DATA_ROLE,
+        ]
+        roles = []
+        if file_item.sg_data != reloaded_file_item.sg_data:
+            roles.extend(
+                [
+                    QtCore.Qt.DisplayRole,
+                    FileTreeItemModel.FILE_ITEM_SG_DATA_ROLE,
+                    FileTreeItemModel.FILE_ITEM_CREATED_AT_ROLE,
+                    FileTreeItemModel.FILE_ITEM_TAGS_ROLE,
+                ]
+                + status_roles
+            )
+        if file_item.extra_data != reloaded_file_item.extra_data:
+            roles.append(FileTreeItemModel.FILE_ITEM_EXTRA_DATA_ROLE)
+        if file_item.locked != reloaded_file_item.locked:
+            roles.extend(status_roles)
+        if file_item.loaded != reloaded_file_item.loaded:
+            roles.extend(
+                [
+                    FileTreeItemModel.REFERENCE_LOADED,
+                    FileTreeItemModel.ICON_REFERENCE_LOADED,
+                ]
+            )
+        if latest_published_file_changed:
+            current = file_item.latest_published_file or {}
+            reloaded = reloaded_file_item.latest_published_file or {}
+            if (current.get("id"), current.get("version_number")) != (
+                reloaded.get("id"),
+                reloaded.get("version_number"),
+            ):
+                roles.append(FileTreeItemModel.FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE)
+                roles.extend(status_roles)
+
+        if not roles:
+            return []
+
+        # The view item roles are retrieved from the item data by the ui config hook.
+        view_roles = [
+            role for role in self.role_methods if role != self.VIEW_ITEM_THUMBNAIL_ROLE
+        ]
+        return list(dict.fromkeys(roles + view_roles))
+
+    def _scan_next_slice(self):
+        """
+        Scan the next slice of the scene, and request the published files for the scene
+        objects found.
+
+        The scene objects are resolved async, while the rest of the scene is being scanned.
+        Once the scan is finished, the model is updated when all the data has been retrieved.
+        """
+
+        if self.__scene_scan is None:
+            scene_objects, finished = [], True
+        else:
+            try:
+                scene_objects, finished = self._manager.get_next_scene_objects(
+                    self.__scene_scan, time_budget=self._build_slice_budget
+                )
+            except Exception as e:
+                # Stop scanning on failure, only the scene objects found so far are loaded.
+                self._app.logger.error("Failed to scan the scene: %s" % e)
+                scene_objects, finished = [], True
+
+        if scene_objects:
+            self._add_scene_objects(scene_objects)
+
+            # Make an async request to get the published files for the references found. This
+            # will omit any objects from the scene that do not have a Flow Production
+            # Tracking Published File. Some files can come from other projects so we cannot
+            # rely on templates, and instead need to query Flow Production Tracking.
+            # A reload is requested by the user, the paths cached as not having a published
+            # file are resolved again (e.g. they were published since they were cached).
+            group_id = self._manager.get_published_files_from_file_paths_by_chunk(
+                [o["path"] for o in scene_objects],
+                self._bg_task_manager,
+                extra_fields=self._published_file_fields,
+                use_cached_misses=False,
+            )
+            if group_id is not None:
+                self.__pending_published_file_data_requests[
+                    group_id
+                ] = self._get_scene_objects_by_path(scene_objects)
+
+        if not finished:
+            self.__scan_timer.start()
+            return
+
+        self._stop_scan()
+        if not self.__scene_objects:
+            # There is no data to fetch, the model is done reloading (async tasks will not
+            # emit signals to finish model reload).
+            self._apply_reloaded_file_items([])
+            self._finish_reload(start_timer=False)
+        else:
+            self._check_reload_data_retrieved()
+
+    def _stop_scan(self):
+        """Stop scanning the scene, the scene objects not scanned yet are discarded."""
+
+        self.__scan_timer.stop()
+        if self.__scene_scan is not None and hasattr(self.__scene_scan, "close"):
+            # Release the hook generator
+            self.__scene_scan.close()
+        self.__scene_scan = None
+
+    def _create_file_model_item(self, file_item, refresh_thumbnails=True):
+        """
+        Create the model item for the given file item.
+
+        The file item is expected to be in the file store already.
+
+        :param file_item: The file item to create the model item for.
+        :type file_item: FileItem
+        :param refresh_thumbnails: True will fetch the thumbnail for the file item async.
+        :type refresh_thumbnails: bool
+
+        :return: The model item.
+        :rtype: FileTreeModelItem
+        """
+
+        file_model_item = FileTreeModelItem(file_item=file_item)
+        self.__model_items[id(file_item)] = file_model_item
+
+        # Make async requests to get the item thumbnail data while the model data is being
+        # processed.
+        if refresh_thumbnails:
+            self._request_thumbnail(file_model_item, file_item)
+
+        return file_model_item
+
+    def _start_build(self, file_items, latest_published_files=None):
+        """
+        Start building the model progressively from the given file items.
+
+        The file items are added to the model in slices, each slice is processed within the
+        time budget `build_slice_budget`. If the time budget is 0 or less, all file items are
+        added immediately.
+
+        :param file_items: The file items to add to the model.
+        :type file_items: List[FileItem]
+        :param latest_published_files: The latest published file data, by published file
+            key, as returned by `BreakdownManager.get_latest_published_files_index`.
+            This is used to set the file items' latest published file field.
+        :type latest_published_files: dict
+        """
+
+        self._stop_build()
+
+        self.__build_queue.extend(file_items)
+        self.__build_latest_published_files = latest_published_files
+        self.__build_count = len(self.__build_queue)
+        if not self.__build_queue:
+            return
+
+        if self._build_slice_budget and self._build_slice_budget > 0:
+            self.__build_timer.start()
+        else:
+            self._build_next_slice()
+
+    def _stop_build(self):
+        """Stop building the model, the file items not built yet are discarded."""
+
+        self.__build_timer.stop()
+        self.__build_queue.clear()
+        self.__build_latest_published_files = None
+        self.__build_count = 0
+
+    def _build_next_slice(self):
+        """
+        Add the next slice of file items to the model.
+
+        File items are processed until the slice time budget is exceeded (at least one file
+        item is processed per slice), then their rows are inserted with one insertion per
+        group. The build is finished once there are no more file items to process.
+        """
+
+        budget = self._build_slice_budget
+        deadline = (
+            time.perf_counter() + budget / 1000.0 if budget and budget > 0 else None
+        )
+        latest_published_files = self.__build_latest_published_files
+
+        # The group items created by this slice, and the model items to add by group.
+        new_group_items = {}
+        model_items_by_group = {}
+
+        while self.__build_queue:
+            file_item = self.__build_queue.popleft()
+
+            if latest_published_files and file_item.sg_data:
+                file_item.latest_published_file = latest_published_files.get(
+                    self._manager.get_publish_key(file_item)
+                )
+            self.__file_store.add(file_item)
+
+            # if the item doesn't have any associated shotgun data, it means that the file is
+            # not a Published File so skip it
+            if file_item.sg_data:
+                self._add_file_model_item(
+                    file_item, new_group_items, model_items_by_group
+                )
+
+            if deadline is not None and time.perf_counter() >= deadline:
+                break
+
+        self._insert_model_items(new_group_items, model_items_by_group)
+
+        built, total = self.build_progress
+        if not self.__build_queue:
+            self._stop_build()
+        self.build_progress_changed.emit(built, total)
+
+        if not self.__build_queue:
+            if self.__is_reloading:
+                self._check_reload_finished()
+            else:
+                # The model was refreshed, notify the views that the layout changed once it is
+                # built (e.g. to filter the new groups, and expand them).
+                self.layoutAboutToBeChanged.emit()
+                self.layoutChanged.emit()
+
+    def _add_file_model_item(self, file_item, new_group_items, model_items_by_group):
+        """
+        Create the model item for the given file item, to be inserted under its group by
+        `_insert_model_items`. The group item is created if it does not exist yet.
+
+        :param file_item: The file item to create the model item for.
+        :type file_item: FileItem
+        :param new_group_items: The group items created, by group id.
+        :type new_group_items: dict
+        :param model_items_by_group: The model items to insert, by group id.
+        :type model_items_by_group: dict
+        """
+
+        group_by_id, group_by_display = self._get_file_group_info(file_item)
+        if group_by_id not in self._group_items:
+            group_item = FileTreeModelItem(
+                group_id=group_by_id, group_display=group_by_display
+            )
+            self._group_items[group_by_id] = group_item
+            new_group_items[group_by_id] = group_item
+
+        model_items_by_group.setdefault(group_by_id, []).append(
+            self._create_file_model_item(file_item)
+        )
+
+    def _insert_model_items(self, new_group_items, model_items_by_group):
+        """
+        Insert the given model items in the model.
+
+        The rows of the existing groups are inserted with one row insertion per group, then
+        the new groups are inserted, with their rows, in a single row insertion.
+
+        :param new_group_items: The group items to insert, by group id.
+        :type new_group_items: dict
+        :param model_items_by_group: The model items to insert, by group id.
+        :type model_items_by_group: dict
+        """
+
+        for group_id, model_items in model_items_by_group.items():
+            group_item = self._group_items[group_id]
+            first_row = group_item.child_count()
+            if group_id in new_group_items:
+                group_item.insert_children(first_row, model_items)
+                continue
+
+            self.beginInsertRows(
+                self.index(group_item.row(), 0),
+                first_row,
+                first_row + len(model_items) - 1,
+            )
+            group_item.insert_children(first_row, model_items)
+            self.endInsertRows()
+
+        if new_group_items:
+            first_row = self.__root_item.child_count()
+            self.beginInsertRows(
+                QtCore.QModelIndex(), first_row, first_row + len(new_group_items) - 1
+            )
+            self.__root_item.insert_children(first_row, list(new_group_items.values()))
+            self.endInsertRows()
+
+    def _check_reload_finished(self):
+        """
+        Finish the reload once the model has been built.
+
+        If the model is not dynamically loaded, the reload is finished once all thumbnails
+        have been retrieved.
+        """
+
+        if not self.__is_reloading or self.__build_queue:
+            return
+
+        if self.dynamic_loading or not self._thumbnail_scheduler.pending:
+            # Emit signals that data has finished loading. Any data still loading will be
+            # dynamically populated as it is retrieved (e.g. thumbnails).
+            self._finish_reload()
+
+    def _get_current_latest_published_files(self):
+        """
+        Get the current latest published file of the file items, by published file key.
+
+        This is a compact snapshot of the model data, to resolve the latest published file
+        changes in a background task (see `BreakdownManager.resolve_latest_published_files`).
+
+        :return: The current latest published file id and version number, by published file
+            key. If the file items of a key do not have the same latest published file, the
+            id is None and the version number is the lowest, such that the key is updated.
+        :rtype: Dict[tuple, Tuple[int, int]]
+        """
+
+        current_latest_published_files = {}
+
+        for file_item in self.__file_store.items:
+            key = self._manager.get_publish_key(file_item)
+            if key is None:
+                continue
+
+            latest = file_item.latest_published_file or {}
+            current = (latest.get("id"), latest.get("version_number") or 0)
+            existing = current_latest_published_files.get(key)
+            if existing is None:
+                current_latest_published_files[key] = current
+            elif existing != current:
+                current_latest_published_files[key] = (
+                    None,
+                    min(existing[1], current[1]),
+                )
+
+        return current_latest_published_files
+
+    @sgtk.LogManager.log_timing
+    def _apply_latest_published_files_changes(self, changes, merge=False):
+        """
+        Update the file items to reflect the changed latest published file data.
+
+        Only the file items of the changed keys are visited, and their data changed signals
+        are coalesced into one signal per range of rows.
+
+        :param changes: The changed latest published file data, by published file key, as
+            returned by `BreakdownManager.get_latest_published_files_changes`.
+        :type changes: dict
+        :param merge: True if the changes only contain higher versions of the latest
+            published files, in which case file items that already have an equal or higher
+            version are not updated (e.g. they were updated since the changes were resolved).
+        :type merge: bool
+
+        :return: True if the latest published file changed for any of the items.
+        :rtype: bool
+        """
+
+        changed_model_items = []
+
+        for key, latest_published_file in changes.items():
+            for file_item in self.__file_store.get_by_publish_key(key):
+                model_item = self.__model_items.get(id(file_item))
+                if model_item is None:
+                    continue
+
+                current_published_file = file_item.latest_published_file or {}
+                if merge:
+                    if (current_published_file.get("version_number") or 0) >= (
+                        (latest_published_file or {}).get("version_number") or 0
+                    ):
+                        continue
+                elif current_published_file.get("id") == (
+                    latest_published_file or {}
+                ).get("id"):
+                    continue
+
+                file_item.latest_published_file = latest_published_file
+                changed_model_items.append(model_item)
+
+        # Update the statuses of all the changed file items at once.
+        self.__file_store.update_highest_versions(
+            [model_item.file_item for model_item in changed_model_items]
+        )
+        for model_item in changed_model_items:
+            self._notify_item_changed(
+                model_item,
+                [
+                    FileTreeItemModel.FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE,
+                    FileTreeItemModel.STATUS_ROLE,
+                    FileTreeItemModel.STATUS_FILTER_DATA_ROLE,
+                ],
+            )
+
+        return bool(changed_model_items)
+
+    def _is_loading_published_files(self):
+        """
+        Return True if the published file data is being loaded for all file items.
+
+        :rtype: bool
+        """
+
+        return bool(
+            self.__scene_scan is not None
+            or self.__pending_published_file_data_requests
+            or self.__pending_reload_latest_requests
+            or self.__pending_latest_published_files_data_request
+        )
+
+    def notify_file_items_changed(self, file_items, roles=None):
+        """
+        Notify the model that the given file items were modified outside of the model (e.g.
+        updated in place by the manager).
+
+        The file items are re-indexed, and the data changed signal is emitted once the changes
+        are coalesced.
+
+        :param file_items: The file items that were modified.
+        :type file_items: List[FileItem]
+        :param roles: The roles that changed. If not provided, all roles changed.
+        :type roles: List[int]
+        """
+
+        for file_item in file_items:
+            self.__file_store.update(file_item)
+            model_item = self.__model_items.get(id(file_item))
+            if model_item:
+                self._notify_item_changed(model_item, roles)
+
+    def reset_role_call_counts(self):
+        """Reset the number of times the role methods were called."""
+
+        self.__role_call_counts = {}
+
+    def _notify_item_changed(self, model_item, roles=None):
+        """
+        Invalidate the memoized role data of the model item that depends on the changed
+        roles, and add the item to the change notifier to emit the data changed signal once
+        the changes are coalesced.
+
+        :param model_item: The model item that changed.
+        :type model_item: FileTreeModelItem
+        :param roles: The roles that changed. If not provided, all roles changed.
+        :type roles: List[int]
+        """
+
+        if roles is None:
+            model_item.clear_role_data()
+        else:
+            invalidated_roles = set()
+            for role in roles:
+                dependent_roles = self._role_data_dependencies.get(role)
+                if dependent_roles is None:
+                    invalidated_roles = None
+                    break
+                invalidated_roles.update(dependent_roles)
+            if invalidated_roles is None or invalidated_roles:
+                model_item.clear_role_data(invalidated_roles)
+
+        self._change_notifier.add(model_item, roles)
+
+    def is_loading(self, index=None):
         """Return True if the model item is currently being loaded."""
 
-        if (
-            self.__pending_published_file_data_request
-            or self.__pending_latest_published_files_data_request
-        ):
-            return True
+        if self._is_loading_published_files():
+            return True
+
+        if index:
+            if not index.isValid():
+                return False
+
+            model_item = index.internalPointer()
+            file_item = model_item.file_item
+            if file_item and (
+                id(file_item) in self._thumbnail_scheduler
+                or id(file_item) in self.__resolving_file_items
+            ):
+                return True
+
+            if model_item in self.__pending_version_requests.values():
+                return True
+        else:
+            if self._thumbnail_scheduler.pending:
+                return True
+
+            if self.__pending_version_requests.values():
+                return True
+
+            if (
+                self.__pending_add_published_file_requests
+                or self.__pending_add_latest_published_files_requests
+            ):
+                return True
+
+        return False
+
+    # ----------------------------------------------------------------------------------------
+    # Methods to retrieving and handling published file data
+
+    def _resolve_latest_published_files(
+        self,
+        file_items,
+        bg_task_manager=None,
+        published_file_filters=None,
+        current_latest_published_files=None,
+        merge=False,
+    ):
+        """
+        Make an api request to resolve the latest published files for the given file items.
+
+        If a background task manager is given, then the api request, and the resolution of
+        its result, will be executed async, else it will execute synchronously. For async
+        requests, the background task group id will be returned, else the resolved data will
+        be returned for synchronous requests.
+
+        :param file_items: The file item objects to get the latest published files for.
+        :type file_items: List[FileItem]
+        :param bg_task_manager: The background task manager to make the api request async,
+            if not provided then the request will be synchronous.
+        :type bg_task_manager: BackgroundTaskManager
+        :param published_file_filters: Additional filters to apply to the published file
+            query.
+        :type published_file_filters: List[List[str]]
+        :param current_latest_published_files: The current latest published files, to only
+            resolve the changes, as returned by `_get_current_latest_published_files`.
+        :type current_latest_published_files: dict
+        :param merge: True if the query only returns the published files created since the
+            last query.
+        :type merge: bool
+
+        :return: If executed async, the background task group id for the api request, else
+            the resolved data (see `BreakdownManager.resolve_latest_published_files`).
+        :rtype: str | dict
+        """
+
+        # Always get the creation date to keep track of the published files watermark.
+        return self._manager.resolve_latest_published_files(
+            file_items,
+            current_latest_published_files=current_latest_published_files,
+            merge=merge,
+            extra_fields=["created_at"],
+            published_file_filters=published_file_filters,
+            bg_task_manager=bg_task_manager,
+        )
+
+    def _log_latest_published_files_result(self, result):
+        """
+        Log the precision of the published file query that resolved the given result.
+
+        :param result: The resolved data, as returned by
+            `BreakdownManager.resolve_latest_published_files`.
+        :type result: dict
+        """
+
+        self._app.logger.debug(
+            "Published file status query over-fetch ratio: %.2f (%s published files)"
+            % (result["over_fetch_ratio"], result["published_file_count"])
+        )
+
+    def set_visible_indexes(self, indexes):
+        """
+        Set the model indexes of the items visible in the view, in display order. The
+        thumbnails of the visible items are requested first, and the thumbnail requests of the
+        items that are no longer visible are cancelled and queued again with a lower priority.
+
+        :param indexes: The visible model indexes.
+        :type indexes: List[QtCore.QModelIndex]
+        """
+
+        self.__visible_model_items = []
+        for index in indexes:
+            if not index.isValid():
+                continue
+            model_item = index.internalPointer()
+            if model_item and model_item.file_item:
+                self.__visible_model_items.append(model_item)
+
+        self._thumbnail_scheduler.set_visible(
+            [id(model_item.file_item) for model_item in self.__visible_model_items]
+        )
+        self._request_visible_thumbnail_decodes(self.__visible_model_items)
+
+    def _request_visible_thumbnail_decodes(self, model_items):
+        """
+        Request the thumbnail decode of the given model items, for the ones that are visible
+        and whose thumbnail is outdated (e.g. not decoded yet, evicted from the thumbnail
+        cache, or decoded at a smaller size).
+
+        :param model_items: The model items to decode the thumbnail for.
+        :type model_items: List[FileModelItem]
+        """
+
+        visible_model_items = set(self.__visible_model_items)
+        for model_item in model_items:
+            if (
+                model_item in visible_model_items
+                and model_item.file_item
+                and model_item.row() >= 0
+                and self._is_thumbnail_outdated(model_item)
+            ):
+                self._request_thumbnail_decode(model_item)
+
+    def _request_thumbnail(self, model_item, file_item):
+        """
+        Queue an async request for the file item thumbnail, to set for the model item. The
+        request is started by the thumbnail scheduler, by visibility priority.
+
+        The thumbnail is not requested if it has already been retrieved (e.g. the model is
+        refreshed), or if it is already cached or in the thumbnail atlas for the current
+        thumbnail size (e.g. the model is reloaded, or the app is opened again).
+
+        :param model_item: The model item object
+        :type model_item: FileModelItem
+        :param file_item: The file item data object
+        :type file_item: FileItem
+
+        :return: None
+        """
+
+        if not file_item.sg_data.get("image"):
+            return
+
+        if file_item.thumbnail_path:
+            return
+
+        size = self.__thumbnail_size
+        if self._get_thumbnail_key(file_item, size) in self._thumbnail_cache:
+            model_item.set_thumbnail_source(None, size)
+            return
+
+        atlas = self._get_thumbnail_atlas()
+        if atlas is not None and self._get_atlas_key(file_item) in atlas:
+            model_item.set_thumbnail_source(None, size)
+            return
+
+        # Keep track of the file items loading, to count them per group.
+        self._thumbnail_scheduler.enqueue(id(file_item), file_item)
+        if id(file_item) in self._thumbnail_scheduler:
+            self.__file_store.set_loading(file_item, True)
+
+    def _start_thumbnail_request(self, key, file_item):
+        """
+        Start the thumbnail request of the file item, once it is scheduled.
+
+        :param key: The file item identity.
+        :type key: int
+        :param file_item: The file item to request the thumbnail for.
+        :type file_item: FileItem
+
+        :return: The request id, or None if the file item is no longer in the model.
+        :rtype: str
+        """
+
+        if file_item not in self.__file_store:
+            return None
+
+        request_id = self._sg_data_retriever.request_thumbnail(
+            file_item.sg_data["image"],
+            file_item.sg_data["type"],
+            file_item.sg_data["id"],
+            "image",
+        )
+
+        # Store the file item with the request id, so that its model item can be retrieved
+        # to update when the async request completes.
+        self.__pending_thumbnail_requests[request_id] = file_item
+        return request_id
+
+    def _cancel_thumbnail_request(self, request_id):
+        """
+        Cancel the thumbnail request, e.g. its item is no longer visible.
+
+        :param request_id: The thumbnail request id.
+        :type request_id: str
+        """
+
+        self._bg_task_manager.stop_task(request_id)
+        self.__pending_thumbnail_requests.pop(request_id, None)
+
+    @staticmethod
+    def _get_thumbnail_key(file_item, size):
+        """
+        Get the thumbnail cache key of the file item.
+
+        :param file_item: The file item to get the thumbnail key for.
+        :type file_item: FileItem
+        :param size: The size (width, height) that the thumbnail is decoded to.
+        :type size: Tuple[int, int]
+
+        :return: The thumbnail cache key.
+        :rtype: tuple
+        """
+
+        sg_data = file_item.sg_data or {}
+        return ThumbnailCache.get_key(
+            sg_data.get("id") or file_item.thumbnail_path,
+            size,
+            image_url=sg_data.get("image"),
+        )
+
+    @staticmethod
+    def _get_atlas_key(file_item):
+        """
+        Get the thumbnail atlas key of the file item.
+
+        :param file_item: The file item to get the atlas key for.
+        :type file_item: FileItem
+
+        :return: The atlas key, or None if the file item does not have a published file.
+        :rtype: int
+        """
+
+        sg_data = file_item.sg_data or {}
+        publish_id = sg_data.get("id")
+        if not isinstance(publish_id, int):
+            return None
+        return ThumbnailAtlas.get_key(publish_id, sg_data.get("image"))
+
+    def _get_thumbnail_icon(self, model_item):
+        """
+        Get the decoded thumbnail icon of the model item from the thumbnail cache.
+
+        :param model_item: The model item to get the thumbnail for.
+        :type model_item: FileModelItem
+
+        :return: The thumbnail icon, or None if it is not decoded.
+        :rtype: QtGui.QIcon
+        """
+
+        source = model_item.thumbnail_source
+        if source is None:
+            return None
+
+        return self._thumbnail_cache.get(
+            self._get_thumbnail_key(model_item.file_item, source[1])
+        )
+
+    def _is_thumbnail_outdated(self, model_item):
+        """
+        Return True if the model item thumbnail needs to be decoded, because it has not been
+        decoded yet, its thumbnail path changed, it was evicted from the thumbnail cache, or
+        it was decoded at a smaller size than the current thumbnail size.
+
+        :param model_item: The model item to check.
+        :type model_item: FileModelItem
+
+        :rtype: bool
+        """
+
+        thumbnail_path = model_item.file_item.thumbnail_path
+        source = model_item.thumbnail_source
+        if not thumbnail_path and source is None:
+            # The thumbnail has not been retrieved yet.
+            return False
+
+        if id(model_item) in self.__decoding_model_items:
+            return False
+
+        if source is None or source[0] != thumbnail_path:
+            return True
+
+        decoded_size = source[1]
+        if (
+            self._get_thumbnail_key(model_item.file_item, decoded_size)
+            not in self._thumbnail_cache
+        ):
+            return True
+
+        if decoded_size is None:
+            # Decoded at its original size, it does not get any better.
+            return False
+
+        if self.__thumbnail_size is None:
+            return True
+
+        return (
+            self.__thumbnail_size[0] > decoded_size[0]
+            or self.__thumbnail_size[1] > decoded_size[1]
+        )
+
+    def _request_thumbnail_decode(self, model_item):
+        """
+        Make an async request to decode the model item thumbnail, at the current thumbnail
+        size. The thumbnail is not decoded if it is already cached (e.g. decoded for another
+        item of the same published file), or if it is read from the thumbnail atlas.
+
+        :param model_item: The model item to decode the thumbnail for.
+        :type model_item: FileModelItem
+        """
+
+        file_item = model_item.file_item
+        thumbnail_path = file_item.thumbnail_path
+        size = self.__thumbnail_size
+        if self._get_thumbnail_key(file_item, size) in self._thumbnail_cache:
+            model_item.set_thumbnail_source(thumbnail_path, size)
+            return
+
+        if self._load_atlas_thumbnail(file_item, size):
+            model_item.set_thumbnail_source(thumbnail_path, size)
+            return
+
+        if not thumbnail_path:
+            # The thumbnail was found in a cache without being retrieved, and it is no longer
+            # cached for the current size.
+            self._request_thumbnail(model_item, file_item)
+            return
+
+        task_id = self._bg_task_manager.add_task(
+            self._decode_thumbnail,
+            group=self.THUMBNAIL_DECODE_GROUP,
+            task_args=[thumbnail_path, size],
+        )
+        self.__pending_thumbnail_decodes[task_id] = (model_item, thumbnail_path, size)
+        self.__decoding_model_items.add(id(model_item))
+
+    @staticmethod
+    def _decode_thumbnail(thumbnail_path, size=None):
+        """
+        Decode the thumbnail image file, and scale it down to the given size.
+
+        This is run in a background task, so only QImage (and not QPixmap or QIcon) can be
+        used.
 
-        if index:
-            if not index.isValid():
-                return False
+        :param thumbnail_path: The path to the thumbnail image file.
+        :type thumbnail_path: str
+        :param size: The size (width, height) to scale the image to fit in, keeping its
+            aspect ratio. The image is not scaled if None, or if it is smaller than the size.
+        :type size: Tuple[int, int]
 
-            model_item = index.internalPointer()
-            if model_item in [v[1] for v in self.__pending_thumbnail_requests.values()]:
-                return True
+        :return: The decoded image, which is null if the file could not be decoded.
+        :rtype: QtGui.QImage
+        """
 
-            if model_item in self.__pending_version_requests.values():
-                return True
-        else:
-            if self.__pending_thumbnail_requests:
-                return True
+        image = QtGui.QImage(thumbnail_path)
+        if image.isNull() or not size:
+            return image
 
-            if self.__pending_version_requests.values():
-                return True
+        width, height = int(size[0]), int(size[1])
+        if width <= 0 or height <= 0:
+            return image
 
-        return False
+        if image.width() <= width and image.height() <= height:
+            return image
 
-    # ----------------------------------------------------------------------------------------
-    # Methods to retrieving and handling published file data
+        return image.scaled(
+            width,
+            height,
+            QtCore.Qt.KeepAspectRatio,
+            QtCore.Qt.SmoothTransformation,
+        )
 
-    def _get_published_files_for_items(self, file_items, data_retriever=None):
+    def _set_decoded_thumbnail(self, task_id, image):
         """
-        Make an api request to get the published file data for the given file items.
+        Cache the decoded thumbnail image for the model item that it was requested for, and
+        notify the views that the item thumbnail changed.
 
-        If a data retreiver is given, then the api request will be executed async, else it
-        will execute synchronously. For async requests, the background task id will be
-        returned, else the published file data will be returned for synchronous requests.
+        :param task_id: The decode task id.
+        :type task_id: int
+        :param image: The decoded image, or None if the decode failed.
+        :type image: QtGui.QImage
+        """
 
-        :param file_items: The file item objects to get the published file data for.
-        :type file_items: List[FileItem]
-        :param data_retriever: The Shotgun data retriever to make the api request async, if
-            not provided then the request will be synchronous.
-        :type data_retriever: ShotgunDataRetriever
+        model_item, thumbnail_path, size = self.__pending_thumbnail_decodes.pop(task_id)
+        self.__decoding_model_items.discard(id(model_item))
 
-        :return: If executed async, the background task id for the api request, else the
-            published file data for the file items is returned.
-        :rtype: str | dict
+        file_item = model_item.file_item
+        if not file_item or file_item.thumbnail_path != thumbnail_path:
+            # The thumbnail changed while it was being decoded, decode the new thumbnail if
+            # the item is still visible.
+            self._request_visible_thumbnail_decodes([model_item])
+            return
+
+        # A failed decode is cached as an empty icon, so that it is not requested again each
+        # time the item is visible.
+        if image is None or image.isNull():
+            icon = QtGui.QIcon()
+            cost = 0
+        else:
+            icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+            cost = get_image_size_in_bytes(image)
+        if cost and size == self.__thumbnail_size:
+            self._add_atlas_thumbnail(file_item, image)
+
+        key = self._get_thumbnail_key(file_item, size)
+        if not self._thumbnail_cache.put(key, icon, cost):
+            # The thumbnail does not fit in the cache memory budget on its own, it is cached
+            # as an empty icon, like a failed decode, so that it is not decoded again each time
+            # the item is visible.
+            self._thumbnail_cache.put(key, QtGui.QIcon(), 0)
+
+        model_item.set_thumbnail_source(thumbnail_path, size)
+        if model_item.row() >= 0:
+            self._notify_item_changed(
+                model_item, [QtCore.Qt.DecorationRole, self.VIEW_ITEM_THUMBNAIL_ROLE]
+            )
+
+    def _get_thumbnail_atlas(self, create=False):
         """
+        Get the atlas of the thumbnails decoded to the current thumbnail size.
 
-        return self._manager.get_published_files_for_items(
-            file_items, data_retriever=data_retriever
-        )
+        :param create: True will create the atlas if it does not exist yet.
+        :type create: bool
 
-    def _get_published_files_mapping(self, published_file_data):
+        :return: The thumbnail atlas, or None if it does not exist, or it is disabled.
+        :rtype: ThumbnailAtlas
         """
-        Return a mapping of published files by their entity, name, task and type.
 
-        The published file data passed in is a list of published file data (dictionaries). A
-        mapping is created where the published files are indexed by their entity, name, task,
-        and published file type.
+        size = self.__thumbnail_size
+        if self.__thumbnail_atlas_size != size:
+            self._close_thumbnail_atlas()
+            self.__thumbnail_atlas_size = size
+            self.__thumbnail_atlas = self._open_thumbnail_atlas(size)
 
-        :param published_file_data: The list of published file data to map.
-        :type published_file_data: List[dict]
+        if self.__thumbnail_atlas is None and create:
+            self.__thumbnail_atlas = self._open_thumbnail_atlas(size, create=True)
 
-        :return: The dictionary mapping for published files.
-        :rtype: dict
-        """
+        return self.__thumbnail_atlas
 
-        published_files_mapping = {}
+    def _open_thumbnail_atlas(self, size, create=False):
+        """
+        Open the atlas of the thumbnails decoded to the given size.
 
-        for pf_data in published_file_data:
-            name = pf_data.get("name")
+        :param size: The size (width, height) of the thumbnails.
+        :type size: Tuple[int, int]
+        :param create: True will create the atlas if it does not exist yet.
+        :type create: bool
 
-            if not pf_data.get("entity"):
-                entity_id = None
-                entity_type = None
-            else:
-                entity_id = pf_data["entity"]["id"]
-                entity_type = pf_data["entity"]["type"]
+        :return: The thumbnail atlas, or None if it could not be opened.
+        :rtype: ThumbnailAtlas
+        """
 
-            if not pf_data.get("task"):
-                task_id = None
-            else:
-                task_id = pf_data["task"]["id"]
+        try:
+            return self._manager.get_thumbnail_atlas(size, create=create)
+        except (IOError, OSError) as e:
+            self._app.logger.debug("Failed to open the thumbnail atlas: %s" % e)
+            return None
 
-            if not pf_data.get("published_file_type"):
-                pf_type_id = None
-            else:
-                pf_type_id = pf_data["published_file_type"]["id"]
-
-            published_files_mapping.setdefault(entity_type, {}).setdefault(
-                entity_id, {}
-            ).setdefault(task_id, {}).setdefault(pf_type_id, {}).setdefault(
-                name, []
-            ).append(
-                pf_data
-            )
+    def _close_thumbnail_atlas(self):
+        """Close the thumbnail atlas, if it is open."""
 
-        return published_files_mapping
+        if self.__thumbnail_atlas is not None:
+            self.__thumbnail_atlas.close()
+        self.__thumbnail_atlas = None
+        self.__thumbnail_atlas_size = None
 
-    def _get_latest_published_file_for_item(self, file_item, published_files_mapping):
+    def _load_atlas_thumbnail(self, file_item, size):
         """
-        Return the latest published file for the given file item and published file data.
+        Read the file item thumbnail from the thumbnail atlas, and cache it.
+
+        The pixel data is read from the memory-mapped atlas file, and copied once into the
+        thumbnail pixmap, without decoding any image file.
 
-        :param file_item: The file item to get the latest published file for.
+        :param file_item: The file item to get the thumbnail for.
         :type file_item: FileItem
-        :param published_files_mapping: A dictionary mapping a list of published files by
-            their entity, task, published file type, and name which is used to determine
-            the latest published file for the given item. This param is expected to be the
-            result returned by the method `_get_published_files_mapping`.
-        :type published_files_mapping: dict
+        :param size: The size (width, height) of the thumbnail.
+        :type size: Tuple[int, int]
 
-        :return: The latest published file.
-        :rtype: dict
+        :return: True if the thumbnail was read from the atlas, else False.
+        :rtype: bool
         """
 
-        name = file_item.sg_data.get("name")
-
-        if not file_item.sg_data.get("entity"):
-            entity_id = None
-            entity_type = None
-        else:
-            entity_id = file_item.sg_data["entity"]["id"]
-            entity_type = file_item.sg_data["entity"]["type"]
+        if size != self.__thumbnail_size:
+            return False
 
-        if not file_item.sg_data.get("task"):
-            task_id = None
-        else:
-            task_id = file_item.sg_data["task"]["id"]
+        atlas = self._get_thumbnail_atlas()
+        if atlas is None:
+            return False
 
-        if not file_item.sg_data.get("published_file_type"):
-            pf_type_id = None
-        else:
-            pf_type_id = file_item.sg_data["published_file_type"]["id"]
+        thumbnail = atlas.get(self._get_atlas_key(file_item))
+        if thumbnail is None:
+            return False
 
-        # Look up the published files for this item by the entity, task, published file type,
-        # and name
-        publish_files = published_files_mapping[entity_type][entity_id][task_id][
-            pf_type_id
-        ][name]
+        data, width, height, bytes_per_line, image_format = thumbnail
+        image = QtGui.QImage(
+            data, width, height, bytes_per_line, QtGui.QImage.Format(image_format)
+        )
+        icon = QtGui.QIcon(QtGui.QPixmap.fromImage(image))
+        cost = get_image_size_in_bytes(image)
+        # The image references the atlas memory, release it now that it is copied.
+        del image, data, thumbnail
 
-        # The published files are assumed to be in order of highest to lowest by version
-        # number. Thus the latest, is the first item in the list.
-        return publish_files[0]
+        return self._thumbnail_cache.put(
+            self._get_thumbnail_key(file_item, size), icon, cost
+        )
 
-    def _request_thumbnail(self, model_item, file_item):
+    def _add_atlas_thumbnail(self, file_item, image):
         """
-        Make an async request for the file item thumbnail, to set for the model item.
+        Append the decoded thumbnail of the file item to the thumbnail atlas, to read it from
+        the atlas the next time it is displayed at the same size (e.g. the app is opened
+        again for the same scene).
 
-        :param model_item: The model item object
-        :type model_item: :class:`sgtk.platform.qt.QtGui.QStandardItem`
-        :param file_item: The file item data object
+        :param file_item: The file item that the thumbnail was decoded for.
         :type file_item: FileItem
-
-        :return: None
+        :param image: The decoded thumbnail.
+        :type image: QtGui.QImage
         """
 
-        if not file_item.sg_data.get("image"):
+        key = self._get_atlas_key(file_item)
+        if key is None:
             return
 
-        request_id = self._sg_data_retriever.request_thumbnail(
-            file_item.sg_data["image"],
-            file_item.sg_data["type"],
-            file_item.sg_data["id"],
-            "image",
+        atlas = self._get_thumbnail_atlas(create=True)
+        if atlas is None:
+            return
+
+        image = image.convertToFormat(self.THUMBNAIL_ATLAS_FORMAT)
+        atlas.add(
+            key,
+            get_image_data(image),
+            image.width(),
+            image.height(),
+            image.bytesPerLine(),
+            int(
+                getattr(
+                    self.THUMBNAIL_ATLAS_FORMAT, "value", self.THUMBNAIL_ATLAS_FORMAT
+                )
+            ),
         )
 
-        # Store the model item with the request id, so that the model item can be retrieved
-        # to update when the async request completes.
-        self.__pending_thumbnail_requests[request_id] = (file_item, model_item)
+    def _pop_thumbnail_request(self, request_id):
+        """
+        Remove the pending thumbnail request, and mark its file item as no longer loading if it
+        does not have any other pending thumbnail requests. The next scheduled thumbnail
+        requests are started.
+
+        :param request_id: The thumbnail request id.
+        :type request_id: str
+
+        :return: The file item that the thumbnail was requested for, and its model item (None
+            if it has been removed from the model).
+        :rtype: Tuple[FileItem, FileTreeModelItem]
+        """
+
+        file_item = self.__pending_thumbnail_requests.pop(request_id)
+        self._thumbnail_scheduler.finish(request_id)
+
+        if (
+            id(file_item) not in self._thumbnail_scheduler
+            and id(file_item) not in self.__resolving_file_items
+        ):
+            self.__file_store.set_loading(file_item, False)
+
+        return file_item, self.__model_items.get(id(file_item))
+
+    def _restore_file_store_loading(self):
+        """
+        Mark the file items with pending thumbnail requests, or whose latest published file is
+        being resolved, as loading in the file store, after the file store was reset.
+        """
+
+        for file_item in self.__file_store:
+            if (
+                id(file_item) in self._thumbnail_scheduler
+                or id(file_item) in self.__resolving_file_items
+            ):
+                self.__file_store.set_loading(file_item, True)
 
     # ----------------------------------------------------------------------------------------
     # File grouping methods
 
+    def _get_file_group_id(self, file_item):
+        """
+        Get the id of the group that the given file item belongs to.
+
+        :param file_item: The file item to get the group id for.
+        :type file_item: FileItem
+
+        :return: The group id, or None if the file item does not have any published file data.
+        :rtype: str
+        """
+
+        if not file_item.sg_data:
+            return None
+        return self._get_file_group_info(file_item)[0]
+
     def _get_file_group_info(self, file_item):
         """
         Get the group by information for the given file item.
@@ -1372,14 +3042,27 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         if not self.polling:
             return
 
-        # Only start the timer if a valid interval was given
-        if self._timeout_interval and self._timeout_interval > 0:
-            self._file_status_check_timer.start(self._timeout_interval)
+        # The scheduler will only start if a valid interval was given
+        self._file_status_poll_scheduler.start()
 
     def stop_timer(self):
         """Stop the file status check timer to prevent any more calls to update the status."""
 
-        self._file_status_check_timer.stop()
+        self._file_status_poll_scheduler.stop()
+
+    def request_status_check(self):
+        """
+        Request to check the file item statuses as soon as possible.
+
+        This should be called after the file items have been modified (e.g. updated to a
+        different version), such that any further published file updates are picked up
+        quickly.
+        """
+
+        if not self.polling:
+            return
+
+        self._file_status_poll_scheduler.request_fast_poll()
 
     def check_published_files_status(self):
         """
@@ -1388,28 +3071,90 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         Make an async request to get the latest published file for this file model item,
         such that the file item status can be updated to show if the item is out of date
         or not.
+
+        Only the published files created since the last status query are requested, unless
+        a full re-sync is due.
         """
 
         if (
             not self.polling
             or self.__is_reloading
-            or self.__pending_published_file_data_request
+            or self.__build_queue
+            or self.__pending_published_file_data_requests
             or self.__pending_latest_published_files_data_request
             or self.rowCount() <= 0
         ):
             return
 
-        self.__pending_latest_published_files_data_request = (
-            self._get_published_files_for_items(
-                self.__file_items, self._sg_data_retriever
-            )
+        if self.__published_files_watermark is None or self._is_full_resync_due():
+            filters = None
+        else:
+            filters = [
+                [
+                    "created_at",
+                    "greater_than",
+                    self.__published_files_watermark - self.DELTA_POLL_OVERLAP,
+                ]
+            ]
+
+        # The latest published files are compared to the current ones in the background
+        # task, such that only the changes need to be applied to the model.
+        self.__pending_latest_published_files_delta = bool(filters)
+        self.__pending_latest_published_files_data_request = self._resolve_latest_published_files(
+            self.__file_store.items,
+            self._bg_task_manager,
+            published_file_filters=filters,
+            current_latest_published_files=self._get_current_latest_published_files(),
+            merge=bool(filters),
         )
 
+    def _is_full_resync_due(self):
+        """
+        Check if the file item statuses should be fully re-synced on the next status query.
+
+        :return: True if a full re-sync is due, else False.
+        :rtype: bool
+        """
+
+        if self.__last_full_resync_time is None:
+            return True
+
+        if not self._full_resync_interval or self._full_resync_interval <= 0:
+            return False
+
+        elapsed = (time.time() - self.__last_full_resync_time) * 1000
+        return elapsed >= self._full_resync_interval
+
+    def __update_published_files_watermark(self, max_created_at, full_resync):
+        """
+        Update the most recent published file creation date found by the status queries.
+
+        :param max_created_at: The most recent creation date of the published files returned
+            by a status query, or None if no published files were returned.
+        :type max_created_at: datetime.datetime
+        :param full_resync: True if the data is the result of a full status query, in which
+            case the watermark is reset.
+        :type full_resync: bool
+        """
+
+        if full_resync:
+            self.__published_files_watermark = None
+            self.__last_full_resync_time = time.time()
+
+        if max_created_at and (
+            self.__published_files_watermark is None
+            or max_created_at > self.__published_files_watermark
+        ):
+            self.__published_files_watermark = max_created_at
+
     def __get_index_from_item(self, item):
         """Return the index for the FileTreeModelItem."""
 
+        if item is self.__root_item:
+            return QtCore.QModelIndex()
+
         parent_item = item.parent_item
-        if parent_item:
+        if parent_item and parent_item is not self.__root_item:
             parent_index = self.index(parent_item.row(), 0)
         else:
             parent_index = QtCore.QModelIndex()
@@ -1433,21 +3178,24 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
 
         if uid in self.__pending_thumbnail_requests:
             # Get the file item pertaining to this thumbnail request
-            file_item, file_model_item = self.__pending_thumbnail_requests[uid]
-            del self.__pending_thumbnail_requests[uid]
+            file_item, file_model_item = self._pop_thumbnail_request(uid)
 
             # Update the thumbnail path without emitting any signals. For non-dynamic loading,
             # the thumbnail udpate will be reflected once all data has been retrieved (not
             # just thumbnails).
-            # For dynamic loading, we will emit one data changed signal once all thumbnails are
-            # retrieved. Ideally, we would emit a signal as each thumbnail is loaded but tree
-            # views do not handle single updates efficiently (e.g. the whole tree is painted
-            # on each single index update).
+            # For dynamic loading, tree views do not handle single updates efficiently (e.g.
+            # the whole tree is painted on each single index update), so the updates are
+            # coalesced by the change notifier.
             file_item.thumbnail_path = data.get("thumb_path")
-            if self.dynamic_loading and not self.__pending_thumbnail_requests:
-                top_left = self.index(0, 0)
-                bottom_right = self.index(self.rowCount() - 1, 0)
-                self.dataChanged.emit(top_left, bottom_right)
+            if file_model_item:
+                self._request_visible_thumbnail_decodes([file_model_item])
+            if self.dynamic_loading and file_model_item:
+                # The thumbnail changes are coalesced, to emit one signal per range of rows
+                # updated within the notifier interval.
+                self._notify_item_changed(
+                    file_model_item,
+                    [QtCore.Qt.DecorationRole, self.VIEW_ITEM_THUMBNAIL_ROLE],
+                )
 
         elif uid in self.__pending_version_requests:
             file_model_item = self.__pending_version_requests[uid]
@@ -1461,22 +3209,6 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
                 FileTreeItemModel.FILE_ITEM_LATEST_PUBLISHED_FILE_ROLE,
             )
 
-        elif uid == self.__pending_latest_published_files_data_request:
-            self.__pending_latest_published_files_data_request = None
-            published_files_mapping = self._get_published_files_mapping(
-                data.get("sg", [])
-            )
-
-            if self.__is_reloading:
-                self._build_model_from_file_items(published_files_mapping)
-                if self.dynamic_loading:
-                    # Emit signals that data has finished loading. Any data still loading will
-                    # be dynamically populated as it is retrieved (e.g. thumbnails).
-                    self._finish_reload()
-            else:
-                # Only update the latest published file data
-                self._update_latest_published_files(published_files_mapping)
-
     def _on_data_retriever_work_failed(self, uid, error_msg):
         """
         Slot triggered when the data retriever fails to do some work!
@@ -1486,43 +3218,173 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         """
 
         if uid in self.__pending_thumbnail_requests:
-            del self.__pending_thumbnail_requests[uid]
+            self._pop_thumbnail_request(uid)
 
         elif uid in self.__pending_version_requests:
             del self.__pending_version_requests[uid]
 
-        elif uid == self.__pending_latest_published_files_data_request:
-            self.__pending_latest_published_files_data_request = None
-
         if error_msg:
             raise Exception(error_msg)
 
     def _on_background_task_completed(self, uid, group_id, result):
         """
-        Callback triggered when the background manager has finished doing some task. The only
-        task we're asking the manager to do is to find the latest published file associated
-        to the current item.
+        Callback triggered when the background manager has finished doing some task. The
+        tasks we're asking the manager to do are to find the published files for chunks of the
+        scene object file paths, and to resolve the latest published files of the file items.
 
         :param uid: Unique id associated with the task
         :param group_id: The group the task is associated with
         :param result: The data returned by the task
         """
 
-        if uid == self.__pending_published_file_data_request:
-            self.__pending_published_file_data_request = None
+        if uid in self.__pending_thumbnail_decodes:
+            self._set_decoded_thumbnail(uid, result)
+            return
+
+        if group_id is None:
+            return
+
+        if group_id in self.__pending_published_file_data_requests:
+            # Merge the published files resolved for this chunk of file paths. The model is
+            # updated once all chunks have been resolved.
+            self.__pending_published_file_data.update(result)
+
+            # Pipeline the latest published file query for the file items of this chunk,
+            # without waiting for the other chunks to be resolved. Only the scene objects of
+            # the chunk are looked up, not all the scene objects scanned.
+            scene_objects = self._get_chunk_scene_objects(
+                self.__pending_published_file_data_requests[group_id], result
+            )
+            file_items = self._manager.get_file_items(scene_objects, result)
+            if file_items:
+                latest_group_id = self._resolve_latest_published_files(
+                    file_items, self._bg_task_manager
+                )
+                self.__pending_reload_latest_requests.add(latest_group_id)
 
-            # Get the list of FileItem objects representing the objects in the scene
-            self.__file_items = self._manager.get_file_items(
-                self.__scene_objects, result
+        elif group_id in self.__pending_add_published_file_requests:
+            scene_objects = self._get_chunk_scene_objects(
+                self.__pending_add_published_file_requests[group_id], result
             )
 
-            # Make an async request to get all published file data necessary to determine the
-            # latest published file per file item. Get all info in a single request.
-            self.__pending_latest_published_files_data_request = (
-                self._get_published_files_for_items(
-                    self.__file_items, self._sg_data_retriever
+            # Get the file items for the scene objects that have a published file in this
+            # chunk, and insert them without waiting for the other chunks to be resolved. The
+            # file items are shown as loading until their latest published file is resolved.
+            # File items whose scene object was removed since the request are ignored.
+            file_items = [
+                file_item
+                for file_item in self._manager.get_file_items(scene_objects, result)
+                if self._get_file_item_key(file_item) in self.__scene_objects
+            ]
+            if file_items:
+                self._insert_file_items(file_items, resolving=True)
+                latest_group_id = self._resolve_latest_published_files(
+                    file_items, self._bg_task_manager
                 )
+                self.__pending_add_latest_published_files_requests[
+                    latest_group_id
+                ] = file_items
+
+        elif group_id in self.__pending_reload_latest_requests:
+            # Only the resolved latest published files of the chunk are kept, they will be
+            # merged once all chunks have been resolved.
+            self.__pending_reload_latest_requests.discard(group_id)
+            self.__reload_latest_results.append(result)
+            self._check_reload_data_retrieved()
+
+        elif group_id in self.__pending_add_latest_published_files_requests:
+            file_items = self.__pending_add_latest_published_files_requests.pop(
+                group_id
+            )
+            self._apply_resolved_file_items(
+                file_items, result["latest_published_files"]
+            )
+            self._check_rescan_finished()
+
+        elif group_id == self.__pending_latest_published_files_data_request:
+            self.__pending_latest_published_files_data_request = None
+            is_delta = self.__pending_latest_published_files_delta
+            self.__pending_latest_published_files_delta = False
+
+            self._log_latest_published_files_result(result)
+            self.__update_published_files_watermark(
+                result["max_created_at"], full_resync=not is_delta
+            )
+            # The changes were resolved by the background task, only the changed file items
+            # are updated.
+            changed = self._apply_latest_published_files_changes(
+                result["latest_published_files"], merge=is_delta
+            )
+            # Adapt the polling interval to how often the file statuses change
+            self._file_status_poll_scheduler.report_poll_result(changed)
+
+    def _check_reload_data_retrieved(self):
+        """
+        Update the model once all the data for the reload has been retrieved.
+
+        The data is retrieved once the scene has been scanned, all chunks of the scene object
+        file paths have been resolved to their published files, and the latest published file
+        data for each chunk has been retrieved.
+        """
+
+        if (
+            not self.__is_reloading
+            or self.__scene_scan is not None
+            or self.__pending_published_file_data_requests
+            or self.__pending_reload_latest_requests
+        ):
+            return
+
+        # Get the list of FileItem objects representing the objects in the scene (in the scene
+        # order). These will replace the current file items.
+        self.__reload_file_items = self._manager.get_file_items(
+            list(self.__scene_objects.values()), self.__pending_published_file_data
+        )
+        reload_latest_results = self.__reload_latest_results
+        self.__pending_published_file_data = {}
+        self.__reload_latest_results = []
+
+        # Merge the latest published files resolved per chunk, keeping the highest version
+        # for the keys found in multiple chunks.
+        latest_published_files = {}
+        published_file_count = 0
+        over_fetch_count = 0.0
+        max_created_at = None
+        for result in reload_latest_results:
+            for key, sg_data in result["latest_published_files"].items():
+                latest = latest_published_files.get(key)
+                if latest is None or (sg_data.get("version_number") or 0) > (
+                    latest.get("version_number") or 0
+                ):
+                    latest_published_files[key] = sg_data
+            published_file_count += result["published_file_count"]
+            over_fetch_count += (
+                result["over_fetch_ratio"] * result["published_file_count"]
             )
+            if result["max_created_at"] and (
+                max_created_at is None or result["max_created_at"] > max_created_at
+            ):
+                max_created_at = result["max_created_at"]
+
+        self._log_latest_published_files_result(
+            {
+                "published_file_count": published_file_count,
+                "over_fetch_ratio": (
+                    over_fetch_count / published_file_count
+                    if published_file_count
+                    else 0.0
+                ),
+            }
+        )
+        self.__update_published_files_watermark(max_created_at, full_resync=True)
+
+        self._apply_reloaded_file_items(
+            self.__reload_file_items, latest_published_files
+        )
+        self.__reload_file_items = []
+
+        # The reload is finished once the model has been built.
+        self._check_reload_finished()
 
     def _on_background_task_failed(self, uid, group_id, msg, stack_trace):
         """
@@ -1534,9 +3396,32 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         :param stack_trace: Full error traceback
         """
 
-        if uid == self.__pending_published_file_data_request:
-            self.__pending_published_file_data_request = None
-            self._finish_reload()
+        if uid in self.__pending_thumbnail_decodes:
+            # The item is shown without a thumbnail.
+            self._set_decoded_thumbnail(uid, None)
+            return
+
+        # A failed chunk of file paths is omitted from the result, the other chunks will still
+        # be used once the task group has finished.
+
+        if group_id is not None:
+            if group_id == self.__pending_latest_published_files_data_request:
+                self.__pending_latest_published_files_data_request = None
+                self.__pending_latest_published_files_delta = False
+
+            elif group_id in self.__pending_reload_latest_requests:
+                # The file items of this chunk will be shown without their latest published
+                # file
+                self.__pending_reload_latest_requests.discard(group_id)
+                self._check_reload_data_retrieved()
+
+            elif group_id in self.__pending_add_latest_published_files_requests:
+                # The file items will be shown without their latest published file
+                file_items = self.__pending_add_latest_published_files_requests.pop(
+                    group_id
+                )
+                self._apply_resolved_file_items(file_items)
+                self._check_rescan_finished()
 
         if msg:
             raise Exception(msg)
@@ -1549,51 +3434,50 @@ class FileTreeItemModel(QtCore.QAbstractItemModel, ViewItemRolesMixin):
         :type group_id: This will be whatever the group_id was set as on 'add_task'.
         """
 
+        if group_id is not None:
+            if group_id == self.THUMBNAIL_DECODE_GROUP:
+                return
+
+            if group_id in self.__pending_published_file_data_requests:
+                # All chunks of file paths of a scan slice have been resolved
+                del self.__pending_published_file_data_requests[group_id]
+                self._check_reload_data_retrieved()
+                return
+
+            if group_id in self.__pending_add_published_file_requests:
+                del self.__pending_add_published_file_requests[group_id]
+                self._check_rescan_finished()
+                return
+
         # We cannot check the specific group id since we are using the data retriever to
-        # initiate the reload background tasks, so instead we know we're done with the model
-        # reload when all our pending requets are empty.
+        # request the thumbnails, so instead we know we're done with the model reload when all
+        # our pending requets are empty.
         if (
             self.__is_reloading
-            and self.__pending_published_file_data_request is None
+            and self.__scene_scan is None
+            and not self.__pending_published_file_data_requests
+            and not self.__pending_reload_latest_requests
             and self.__pending_latest_published_files_data_request is None
-            and not self.__pending_thumbnail_requests
+            and not self._thumbnail_scheduler.pending
+            and not self.__build_queue
         ):
             self._finish_reload()
 
 
 class FileModelItem:
-    """Data structure to hold information about an item in the File model."""
+    """
+    Data structure to hold information about an item in the File model.
+
+    Model items are compared and hashed by identity, the model keeps track of them by object
+    (e.g. the change notifier), and several items may refer to the same file (e.g. the same
+    file referenced twice in the scene).
+    """
 
     def __init__(self, file_item):
         """Initialize the file item."""
 
         self.set_file_item(file_item)
 
-    def __eq__(self, other):
-        """
-        Override the base method.
-
-        File model items are equal if their FileItem objects are equal. Note that this
-        means each file model item should refer to a unique file item.
-
-        :param other: The FileModelItem to compare with.
-        :type other: FileModelItem
-
-        :return: True if this model item is equal to the other item.
-        :rtype: bool
-        """
-
-        if not isinstance(other, FileModelItem):
-            return False
-
-        return self.file_item_id == other.file_item_id
-
-    def __hash__(self):
-        """Override the base method to allow FileModelItem objects to be hashable."""
-
-        # The file item is guaranteed to be unique by the file_item_id value.
-        return hash(self.file_item_id)
-
     # ----------------------------------------------------------------------
     # Properties
 
@@ -1606,8 +3490,21 @@ class FileModelItem:
         return self.__file_item
 
     @property
-    def thumbnail_icon(self):
-        return self.__thumbnail_icon
+    def thumbnail_source(self):
+        """
+        Get the thumbnail path and the size that the thumbnail was decoded to, or None if the
+        thumbnail has not been decoded yet. The decoded thumbnail is stored in the thumbnail
+        cache of the model.
+        """
+        return self.__thumbnail_source
+
+    @property
+    def role_data(self):
+        """
+        Get the memoized data of the roles retrieved by the model role methods, by role. The
+        model invalidates the role data when the item changes.
+        """
+        return self.__role_data
 
     # ----------------------------------------------------------------------
     # Public methods
@@ -1620,16 +3517,52 @@ class FileModelItem:
         if self.__file_item:
             # File item path should be unique
             self.__file_item_id = self.__file_item.path
-            self.__thumbnail_icon = QtGui.QIcon(self.__file_item.thumbnail_path)
         else:
             self.__file_item_id = None
-            self.__thumbnail_icon = QtGui.QIcon()
+
+        # The thumbnail is decoded async, once it is requested
+        self.__thumbnail_source = None
+        self.__role_data = {}
 
     def set_thumbnail(self, thumbnail_path):
-        """Custom method to set the thumbnail data to avoid emitting data changed signals."""
+        """
+        Custom method to set the thumbnail data to avoid emitting data changed signals. The
+        thumbnail is decoded async the next time it is requested.
+        """
 
         self.__file_item.thumbnail_path = thumbnail_path
-        self.__thumbnail_icon = QtGui.QIcon(thumbnail_path)
+        self.__thumbnail_source = None
+
+    def clear_role_data(self, roles=None):
+        """
+        Remove the memoized role data, such that it is retrieved again the next time it is
+        requested.
+
+        :param roles: The roles to remove the data for. If not provided, the data of all
+            roles is removed.
+        :type roles: List[int]
+        """
+
+        if roles is None:
+            self.__role_data = {}
+            return
+
+        for role in roles:
+            self.__role_data.pop(role, None)
+
+    def set_thumbnail_source(self, thumbnail_path, size):
+        """
+        Set the thumbnail path and the size that the thumbnail was decoded to, once the
+        decoded thumbnail is cached.
+
+        :param thumbnail_path: The path that the thumbnail was decoded from.
+        :type thumbnail_path: str
+        :param size: The size (width, height) that the thumbnail was decoded to, or None if
+            it was decoded at its original size.
+        :type size: Tuple[int, int]
+        """
+
+        self.__thumbnail_source = (thumbnail_path, size)
 
 
 class FileTreeModelItem(FileModelItem):
@@ -1645,43 +3578,9 @@ class FileTreeModelItem(FileModelItem):
 
         self.__child_items = []
         self.__parent_item = None
-
-    def __eq__(self, other):
-        """
-        Override the base method.
-
-        File tree model items are equal if their FileItem objects are equal. Note that this
-        means each file model item should refer to a unique file item.
-
-        :param other: The FileTreeModelItem to compare with.
-        :type other: FileTreeModelItem
-
-        :return: True if this model item is equal to the other item.
-        :rtype: bool
-        """
-
-        if not isinstance(other, FileTreeModelItem):
-            return False
-
-        if self.file_item_id is None or other.file_item_id is None:
-            # One of the items are a group
-
-            if self.file_item_id != other.file_item_id:
-                # One item is a group, while the other is a file, thus they are not equal.
-                return False
-
-            # Both items are groups, compare their group ids.
-            return self.group_id == other.group_id
-
-        # They are both file items, compare their file ids.
-        return self.file_item_id == other.file_item_id
-
-    def __hash__(self):
-        """Override the base method to allow FileModelItem objects to be hashable."""
-
-        # The file item is guaranteed to be unique by the combined values of the file_item_id
-        # and the group id.
-        return hash((self.file_item_id, self.group_id))
+        # The item's position within its parent's child items, kept up to date by the parent
+        # when children are inserted or removed.
+        self.__row = -1
 
     # ----------------------------------------------------------------------
     # Properties
@@ -1706,7 +3605,13 @@ class FileTreeModelItem(FileModelItem):
 
     @property
     def child_items(self):
-        """Get the file tree item's child items."""
+        """
+        Get the file tree item's child items.
+
+        The list must not be modified directly, use the methods `append_child`,
+        `insert_children`, `remove_children` and `take_child` to keep the child rows up to
+        date.
+        """
         return self.__child_items
 
     @property
@@ -1729,8 +3634,61 @@ class FileTreeModelItem(FileModelItem):
         :type child_item: FileTreeModelItem
         """
 
+        child_item.parent_item = self
+        child_item.__row = len(self.__child_items)
         self.__child_items.append(child_item)
 
+    def insert_children(self, row, child_items):
+        """
+        Insert the child items at the given row.
+
+        :param row: The row to insert the child items at.
+        :type row: int
+        :param child_items: The child items to insert.
+        :type child_items: List[FileTreeModelItem]
+        """
+
+        self.__child_items[row:row] = child_items
+        for child_item in child_items:
+            child_item.parent_item = self
+        self.__update_rows(row)
+
+    def remove_children(self, row, count=1):
+        """
+        Remove the child items from the given row.
+
+        :param row: The row of the first child item to remove.
+        :type row: int
+        :param count: The number of child items to remove.
+        :type count: int
+
+        :return: The removed child items.
+        :rtype: List[FileTreeModelItem]
+        """
+
+        removed_items = self.__child_items[row : row + count]
+        del self.__child_items[row : row + count]
+        for child_item in removed_items:
+            # The item still refers to its parent, but is no longer in the list of items
+            child_item.__row = -1
+        self.__update_rows(row)
+        return removed_items
+
+    def take_child(self, row):
+        """
+        Remove the child item at the given row and return it.
+
+        :param row: The row of the child item to remove.
+        :type row: int
+
+        :return: The removed child item, or None if there is no child at the given row.
+        :rtype: FileTreeModelItem
+        """
+
+        if row < 0 or row >= len(self.__child_items):
+            return None
+        return self.remove_children(row)[0]
+
     def child(self, row):
         """
         Return the child item at the specified row.
@@ -1756,14 +3714,29 @@ class FileTreeModelItem(FileModelItem):
         if self.parent_item is None:
             return 0
 
-        try:
-            return self.__parent_item.child_items.index(self)
-        except ValueError:
-            # This item is not in the list
-            return -1
+        # The row is -1 if this item is not in the list
+        return self.__row
 
     def reset(self):
         """Reset the tree item data."""
 
+        for child_item in self.__child_items:
+            child_item.__row = -1
+
         self.__parent_item = None
+        self.__row = -1
         self.__child_items = []
+
+    # ----------------------------------------------------------------------
+    # Private methods
+
+    def __update_rows(self, start_row):
+        """
+        Update the row of the child items from the given row.
+
+        :param start_row: The row of the first child item to update.
+        :type start_row: int
+        """
+
+        for row in range(start_row, len(self.__child_items)):
+            self.__child_items[row].__row = row
@@ -36,8 +36,23 @@ class FileProxyModel(FilterItemTreeProxyModel):
 
         self._search_text_filter_item = None
 
+        # The number of accepted file items per status, by group id. The counts are computed
+        # once per group, and cleared when the proxy model rows change, or when the status of
+        # the file items of a group change.
+        self._group_status_counts = {}
+
         super().__init__(*args, **kwargs)
 
+        for signal in (
+            self.modelReset,
+            self.layoutChanged,
+            self.rowsInserted,
+            self.rowsRemoved,
+            self.rowsMoved,
+        ):
+            signal.connect(self._clear_group_status_counts)
+        self.dataChanged.connect(self._on_data_changed)
+
     @property
     def search_text_filter_item(self):
         """
@@ -77,6 +92,64 @@ class FileProxyModel(FilterItemTreeProxyModel):
         source_index = self.mapToSource(index)
         return self.sourceModel().data(source_index, role)
 
+    def get_group_status_counts(self, index):
+        """
+        Get the number of file items per status, that are accepted by the proxy model, in the
+        given group.
+
+        :param index: The proxy model index of the group.
+        :type index: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+
+        :return: The number of accepted file items, by status.
+        :rtype: Dict[int, int]
+        """
+
+        source_model = self.sourceModel()
+        group_id = index.data(source_model.GROUP_ID_ROLE)
+
+        counts = self._group_status_counts.get(group_id)
+        if counts is None:
+            counts = {}
+            for row in range(self.rowCount(index)):
+                status = self.index(row, 0, index).data(source_model.STATUS_ROLE)
+                counts[status] = counts.get(status, 0) + 1
+            self._group_status_counts[group_id] = counts
+
+        return counts
+
+    def _clear_group_status_counts(self, *args):
+        """
+        Slot triggered when the proxy model rows or data changed, to clear the cached group
+        status counts.
+        """
+
+        self._group_status_counts = {}
+
+    def _on_data_changed(self, top_left, bottom_right, roles=None):
+        """
+        Slot triggered when the proxy model data changed, to clear the cached status counts
+        of the group of the changed items, if their status may have changed.
+
+        :param top_left: The top left index of the changed data.
+        :type top_left: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        :param bottom_right: The bottom right index of the changed data.
+        :type bottom_right: :class:`sgtk.platform.qt.QtCore.QModelIndex`
+        :param roles: The roles of the changed data. An empty list means all roles.
+        :type roles: List[int]
+        """
+
+        if roles and self.sourceModel().STATUS_ROLE not in roles:
+            return
+
+        parent = top_left.parent()
+        if not parent.isValid():
+            # The group items changed
+            self._clear_group_status_counts()
+            return
+
+        group_id = parent.data(self.sourceModel().GROUP_ID_ROLE)
+        self._group_status_counts.pop(group_id, None)
+
     def _is_row_accepted(self, src_row, src_parent_idx, parent_accepted):
         """
         Override the base method.
@@ -0,0 +1,288 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import random
+import time
+
+from sgtk.platform.qt import QtCore
+
+
+class PollScheduler(QtCore.QObject):
+    """
+    Schedule polling requests with an adaptive interval.
+
+    The scheduler starts polling at its base interval. Each time a poll result is reported
+    without any changes, the interval is increased exponentially, up to the max interval.
+    As soon as a change is reported, the interval is reset to the base interval. A random
+    jitter is applied to each interval, such that multiple sessions started at the same time
+    do not poll in lockstep.
+
+    Polling is paused while the application is not active, or while it is paused explicitly
+    (e.g. the widget displaying the polled data is hidden).
+    """
+
+    # Emitted when a poll is due.
+    poll_requested = QtCore.Signal()
+
+    # Reasons to pause polling.
+    PAUSE_HIDDEN = "hidden"
+    PAUSE_INACTIVE = "inactive"
+
+    def __init__(
+        self,
+        interval,
+        max_interval=None,
+        backoff_factor=2.0,
+        jitter=0.1,
+        fast_poll_delay=1000,
+        parent=None,
+    ):
+        """
+        Constructor.
+
+        :param interval: The base interval (in milliseconds) between polls. A value of 0 or
+            less disables polling.
+        :type interval: int
+        :param max_interval: The max interval (in milliseconds) that the interval can back off
+            to. Defaults to the base interval (no back off).
+        :type max_interval: int
+        :param backoff_factor: The factor applied to the interval each time a poll does not
+            find any changes.
+        :type backoff_factor: float
+        :param jitter: The max ratio of the interval to randomly add or remove to each
+            interval, e.g. 0.1 for +/- 10%.
+        :type jitter: float
+        :param fast_poll_delay: The delay (in milliseconds) of a poll that is explicitly
+            requested.
+        :type fast_poll_delay: int
+        :param parent: The parent QObject.
+        :type parent: QtCore.QObject
+        """
+
+        super().__init__(parent)
+
+        self._base_interval = interval or 0
+        self._max_interval = max(max_interval or 0, self._base_interval)
+        self._backoff_factor = max(backoff_factor, 1.0)
+        self._jitter = min(max(jitter, 0.0), 1.0)
+        self._fast_poll_delay = fast_poll_delay
+
+        self._interval = self._base_interval
+        self._active = False
+        self._pause_reasons = set()
+        self._next_poll_time = None
+
+        self._poll_count = 0
+        self._fast_poll_count = 0
+        self._changed_count = 0
+        self._unchanged_count = 0
+        self._last_poll_time = None
+
+        self._timer = QtCore.QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._on_timeout)
+
+        # Pause polling while the application is not active. The application state signal
+        # is not available in older versions of Qt.
+        self._app_instance = QtCore.QCoreApplication.instance()
+        if self._app_instance and hasattr(
+            self._app_instance, "applicationStateChanged"
+        ):
+            self._app_instance.applicationStateChanged.connect(
+                self._on_application_state_changed
+            )
+        else:
+            self._app_instance = None
+
+    @property
+    def enabled(self):
+        """Get whether or not the scheduler has a valid interval to poll with."""
+        return self._base_interval > 0
+
+    @property
+    def is_active(self):
+        """Get whether or not the scheduler has been started."""
+        return self._active
+
+    @property
+    def is_paused(self):
+        """Get whether or not polling is currently paused."""
+        return bool(self._pause_reasons)
+
+    @property
+    def interval(self):
+        """Get the current interval (in milliseconds) between polls, without jitter."""
+        return self._interval
+
+    @property
+    def stats(self):
+        """
+        Get the polling statistics.
+
+        :return: The polling statistics.
+        :rtype: dict
+        """
+
+        return {
+            "interval": self._interval,
+            "base_interval": self._base_interval,
+            "max_interval": self._max_interval,
+            "active": self._active,
+            "paused": sorted(self._pause_reasons),
+            "polls": self._poll_count,
+            "fast_polls": self._fast_poll_count,
+            "changed": self._changed_count,
+            "unchanged": self._unchanged_count,
+            "last_poll_time": self._last_poll_time,
+        }
+
+    def destroy(self):
+        """Stop polling and disconnect from the application signals."""
+
+        self.stop()
+
+        if self._app_instance:
+            try:
+                self._app_instance.applicationStateChanged.disconnect(
+                    self._on_application_state_changed
+                )
+            except (RuntimeError, TypeError):
+                # Already disconnected
+                pass
+            self._app_instance = None
+
+    def start(self):
+        """Start polling at the base interval."""
+
+        if not self.enabled:
+            return
+
+        self._active = True
+        self._interval = self._base_interval
+        self._schedule(self._interval)
+
+    def stop(self):
+        """Stop polling."""
+
+        self._active = False
+        self._next_poll_time = None
+        self._timer.stop()
+
+    def pause(self, reason):
+        """
+        Pause polling for the given reason.
+
+        Polling will resume once all reasons to pause have been removed.
+
+        :param reason: The reason to pause polling.
+        :type reason: str
+        """
+
+        self._pause_reasons.add(reason)
+        self._timer.stop()
+
+    def resume(self, reason):
+        """
+        Remove the given reason to pause polling, and resume polling if there are no other
+        reasons to pause.
+
+        If a poll was due while paused, it is requested as soon as polling resumes.
+
+        :param reason: The reason to remove.
+        :type reason: str
+        """
+
+        self._pause_reasons.discard(reason)
+        if self._pause_reasons or not self._active:
+            return
+
+        if self._next_poll_time is None:
+            self._schedule(self._interval)
+        else:
+            remaining = max(0, self._next_poll_time - time.monotonic())
+            self._timer.start(int(remaining * 1000))
+
+    def request_fast_poll(self):
+        """
+        Request a poll as soon as possible (e.g. after the polled data was modified), and
+        reset the interval to the base interval.
+        """
+
+        if not self._active:
+            return
+
+        self._fast_poll_count += 1
+        self._interval = self._base_interval
+        self._schedule(self._fast_poll_delay, jitter=False)
+
+    def report_poll_result(self, changed):
+        """
+        Report the result of a poll to adapt the interval for the next poll.
+
+        :param changed: True if the poll found changes, else False.
+        :type changed: bool
+        """
+
+        if changed:
+            self._changed_count += 1
+            self._interval = self._base_interval
+        else:
+            self._unchanged_count += 1
+            self._interval = min(
+                int(self._interval * self._backoff_factor), self._max_interval
+            )
+
+        if self._active:
+            self._schedule(self._interval)
+
+    def _schedule(self, delay, jitter=True):
+        """
+        Schedule the next poll.
+
+        :param delay: The delay (in milliseconds) until the next poll.
+        :type delay: int
+        :param jitter: True to apply a random jitter to the delay.
+        :type jitter: bool
+        """
+
+        if not self._active:
+            return
+
+        if jitter and self._jitter:
+            delay *= random.uniform(1.0 - self._jitter, 1.0 + self._jitter)
+        delay = max(int(delay), 0)
+
+        self._next_poll_time = time.monotonic() + delay / 1000.0
+        if not self._pause_reasons:
+            self._timer.start(delay)
+
+    def _on_timeout(self):
+        """Slot triggered when a poll is due."""
+
+        self._poll_count += 1
+        self._last_poll_time = time.time()
+
+        # Schedule the next poll at the current interval, in case no poll result is reported.
+        self._schedule(self._interval)
+
+        self.poll_requested.emit()
+
+    def _on_application_state_changed(self, state):
+        """
+        Slot triggered when the application state changed.
+
+        :param state: The application state.
+        :type state: QtCore.Qt.ApplicationState
+        """
+
+        if state == QtCore.Qt.ApplicationActive:
+            self.resume(self.PAUSE_INACTIVE)
+        else:
+            self.pause(self.PAUSE_INACTIVE)
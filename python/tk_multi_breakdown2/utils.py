@@ -53,3 +53,35 @@ def get_ui_published_file_fields(app):
         fields.append("image")
 
     return list(set(fields))
+
+
+def get_image_size_in_bytes(image):
+    """
+    Get the number of bytes used by the image data.
+
+    :param image: The image to get the size of.
+    :type image: QtGui.QImage
+
+    :return: The number of bytes.
+    :rtype: int
+    """
+
+    if hasattr(image, "sizeInBytes"):
+        return image.sizeInBytes()
+
+    # Qt versions older than 5.10
+    return image.byteCount()
+
+
+def get_image_data(image):
+    """
+    Get a copy of the pixel data of the image.
+
+    :param image: The image to get the pixel data of.
+    :type image: QtGui.QImage
+
+    :return: The pixel data, bytes per line * height bytes.
+    :rtype: bytes
+    """
+
+    return bytes(image.constBits())[: get_image_size_in_bytes(image)]
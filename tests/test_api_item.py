@@ -105,6 +105,30 @@ class TestApiItem:
                 "version_number", None
             )
 
+    def test_publish_key(self):
+        """
+        Test the publish_key property value.
+        """
+
+        sg_data = {
+            "id": 1,
+            "project": {"type": "Project", "id": 2},
+            "entity": {"type": "Asset", "id": 3},
+            "task": None,
+            "published_file_type": {"type": "PublishedFileType", "id": 4},
+            "name": "hello",
+            "version_number": 5,
+        }
+        file_item = FileItem("node", "reference", "/foo/bar", sg_data=sg_data)
+        assert file_item.publish_key is None
+
+        file_item.publish_key = (2, "Asset", 3, None, 4, "hello")
+        assert file_item.publish_key == (2, "Asset", 3, None, 4, "hello")
+
+        # The key is reset when the data is set
+        file_item.sg_data = dict(sg_data, name="world")
+        assert file_item.publish_key is None
+
     @pytest.mark.parametrize(
         "file_item_data",
         [(False, False), (True, False), (False, True), (True, True)],
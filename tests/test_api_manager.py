@@ -273,6 +273,95 @@ def test_scan_scene(
         assert item.extra_data == expected_scene_item.get("extra_data")
 
 
+@pytest.mark.parametrize("batch_size", [1, 2, 10])
+def test_iter_scene_objects(
+    bundle, bundle_hook_methods, bundle_hook_scan_scene_return_value, batch_size
+):
+    """
+    Test the BreakdownManager 'iter_scene_objects' and 'get_next_scene_objects' methods, with
+    and without a hook that scans the scene in batches.
+    """
+
+    manager = BreakdownManager(bundle)
+
+    # The hook does not scan in batches, the scene is scanned at once, when the first
+    # batch is consumed.
+    with patch.object(
+        manager, "get_scene_objects", wraps=manager.get_scene_objects
+    ) as get_scene_objects:
+        scene_objects_iter = manager.iter_scene_objects(batch_size=batch_size)
+        get_scene_objects.assert_not_called()
+        batches = list(scene_objects_iter)
+        get_scene_objects.assert_called_once()
+    assert batches == [bundle_hook_scan_scene_return_value]
+
+    # The hook scans in batches.
+    scene_objects = bundle_hook_scan_scene_return_value
+    hook_batches = [
+        scene_objects[i : i + batch_size]
+        for i in range(0, len(scene_objects), batch_size)
+    ]
+    hook_methods = dict(bundle_hook_methods["hook_scene_operations"])
+    hook_methods["iter_scene_objects"] = iter(hook_batches)
+    with patch.dict(bundle_hook_methods, {"hook_scene_operations": hook_methods}):
+        scene_objects_iter = manager.iter_scene_objects(batch_size=batch_size)
+
+        # A time budget consumes at least one batch per slice.
+        result, finished = manager.get_next_scene_objects(
+            scene_objects_iter, time_budget=0.000001
+        )
+        assert result == hook_batches[0]
+        assert not finished
+
+        # No time budget consumes all the remaining batches.
+        result, finished = manager.get_next_scene_objects(scene_objects_iter)
+        assert result == scene_objects[len(hook_batches[0]) :]
+        assert finished
+
+
+def test_get_thumbnail_atlas(bundle, bundle_settings, tmp_path):
+    """
+    Test the BreakdownManager 'get_thumbnail_atlas' method, and that only the most recently
+    used atlas files are kept.
+    """
+
+    bundle.cache_location = str(tmp_path)
+    manager = BreakdownManager(bundle)
+
+    # The atlas is disabled by default
+    assert manager.get_thumbnail_atlas((64, 36)) is None
+
+    with patch.dict(bundle_settings, {"thumbnail_atlas_size": 1}):
+        assert manager.get_thumbnail_atlas(None) is None
+        assert manager.get_thumbnail_atlas((64, 36), create=False) is None
+
+        atlas = manager.get_thumbnail_atlas((64, 36))
+        assert atlas.path.endswith("thumbnails_64x36.atlas")
+        atlas.close()
+        atlas = manager.get_thumbnail_atlas((64, 36), create=False)
+        assert atlas is not None
+        atlas.close()
+
+        # An atlas open in another process is not shared, the next atlas file is used.
+        atlas = manager.get_thumbnail_atlas((64, 36))
+        other_atlas = manager.get_thumbnail_atlas((64, 36))
+        assert other_atlas.path.endswith("thumbnails_64x36_1.atlas")
+        assert manager.get_thumbnail_atlas((64, 36), create=False) is None
+        other_atlas.close()
+
+        for width in range(1, BreakdownManager.MAX_THUMBNAIL_ATLASES + 1):
+            manager.get_thumbnail_atlas((width * 100, 36)).close()
+
+        # The open atlas is not removed.
+        atlas_dir = os.path.dirname(atlas.path)
+        atlas_names = [
+            name for name in os.listdir(atlas_dir) if name.endswith(".atlas")
+        ]
+        assert len(atlas_names) == BreakdownManager.MAX_THUMBNAIL_ATLASES
+        assert os.path.basename(atlas.path) in atlas_names
+        atlas.close()
+
+
 @pytest.mark.parametrize(
     "file_item_data",
     [(False, False), (True, False), (False, True), (True, True)],
@@ -834,6 +923,216 @@ class TestBreakdownManager(AppTestBase):
                 if pf not in found_published_files
             ] == []
 
+    def test_get_published_files_from_file_paths_cached(self):
+        """
+        Test the BreakdownManager 'get_published_files_from_file_paths' method with the
+        published file path cache enabled.
+        """
+
+        get_setting = self.app.get_setting
+
+        def mock_get_setting(name, *args, **kwargs):
+            if name == "published_file_path_cache":
+                return True
+            return get_setting(name, *args, **kwargs)
+
+        not_published_path = os.path.join(self.project_root, "foo", "not_published")
+        file_paths = list(self.published_files.keys()) + [not_published_path]
+        expected_ids = {path: pf["id"] for path, pf in self.published_files.items()}
+
+        with patch.object(self.app, "get_setting", new=mock_get_setting):
+            self.manager.get_published_file_path_cache().clear()
+
+            published_files = self.manager.get_published_files_from_file_paths(
+                file_paths
+            )
+            assert {
+                path: pf["id"] for path, pf in published_files.items()
+            } == expected_ids
+
+            # All paths are now cached, published files or not.
+            with patch("sgtk.util.find_publish") as find_publish:
+                published_files = self.manager.get_published_files_from_file_paths(
+                    file_paths
+                )
+                find_publish.assert_not_called()
+            assert {
+                path: pf["id"] for path, pf in published_files.items()
+            } == expected_ids
+
+            # The paths cached as not having a published file can be resolved again.
+            with patch("sgtk.util.find_publish", return_value={}) as find_publish:
+                self.manager.get_published_files_from_file_paths(
+                    file_paths, use_cached_misses=False
+                )
+                find_publish.assert_called_once()
+                assert find_publish.call_args[0][1] == [not_published_path]
+
+    def test_get_published_files_from_file_paths_cached_chunked(self):
+        """
+        Test that the cached published files are validated with one query per chunk of
+        published file ids, of the same size as the chunks of file paths.
+        """
+
+        get_setting = self.app.get_setting
+
+        def mock_get_setting(name, *args, **kwargs):
+            if name == "published_file_path_cache":
+                return True
+            if name == "published_file_paths_chunk_size":
+                return 1
+            return get_setting(name, *args, **kwargs)
+
+        file_paths = list(self.published_files.keys())
+        expected_ids = {path: pf["id"] for path, pf in self.published_files.items()}
+
+        with patch.object(self.app, "get_setting", new=mock_get_setting):
+            self.manager.get_published_file_path_cache().clear()
+            self.manager.get_published_files_from_file_paths(file_paths)
+
+            find = self.mockgun.find
+            with patch.object(self.mockgun, "find", wraps=find) as mock_find, patch(
+                "sgtk.util.find_publish"
+            ) as find_publish:
+                published_files = self.manager.get_published_files_from_file_paths(
+                    file_paths
+                )
+                find_publish.assert_not_called()
+
+            validated_ids = []
+            for call in mock_find.call_args_list:
+                assert call[0][0] == "PublishedFile"
+                id_filter = call[0][1][0]
+                assert id_filter[:2] == ["id", "in"]
+                assert len(id_filter[2]) == 1
+                validated_ids.extend(id_filter[2])
+            assert sorted(validated_ids) == sorted(set(expected_ids.values()))
+            assert {
+                path: pf["id"] for path, pf in published_files.items()
+            } == expected_ids
+
+    def test_get_published_files_from_file_paths_invalid_cache(self):
+        """
+        Test the BreakdownManager 'get_published_files_from_file_paths' method when the
+        published file path cache cannot be read.
+        """
+
+        get_setting = self.app.get_setting
+
+        def mock_get_setting(name, *args, **kwargs):
+            if name == "published_file_path_cache":
+                return True
+            return get_setting(name, *args, **kwargs)
+
+        file_paths = list(self.published_files.keys())
+        expected_ids = {path: pf["id"] for path, pf in self.published_files.items()}
+
+        with patch.object(self.app, "get_setting", new=mock_get_setting):
+            db_path = self.manager.get_published_file_path_cache().db_path
+            with open(db_path, "wb") as db_file:
+                db_file.write(b"not a database" * 100)
+
+            # The published files are resolved without the cache.
+            published_files = self.manager.get_published_files_from_file_paths(
+                file_paths
+            )
+            assert {
+                path: pf["id"] for path, pf in published_files.items()
+            } == expected_ids
+
+    def test_get_published_files_from_file_paths_chunked(self):
+        """
+        Test the BreakdownManager 'get_published_files_from_file_paths' method when the file
+        paths are resolved in chunks.
+        """
+
+        get_setting = self.app.get_setting
+        not_published_path = os.path.join(self.project_root, "foo", "not_published")
+        file_paths = list(self.published_files.keys()) + [not_published_path]
+        # Duplicate paths are only resolved once
+        file_paths += file_paths[:1]
+        expected_ids = {path: pf["id"] for path, pf in self.published_files.items()}
+
+        for chunk_size, max_workers in [(0, 4), (1, 1), (2, 4)]:
+
+            def mock_get_setting(name, *args, **kwargs):
+                if name == "published_file_paths_chunk_size":
+                    return chunk_size
+                if name == "published_file_paths_max_workers":
+                    return max_workers
+                return get_setting(name, *args, **kwargs)
+
+            with patch.object(self.app, "get_setting", new=mock_get_setting):
+                chunks = self.manager._get_file_path_chunks(file_paths)
+                assert sum(len(chunk) for chunk in chunks) == len(file_paths) - 1
+                if chunk_size:
+                    assert all(len(chunk) <= chunk_size for chunk in chunks)
+                else:
+                    assert len(chunks) == 1
+
+                published_files = self.manager.get_published_files_from_file_paths(
+                    file_paths
+                )
+                assert {
+                    path: pf["id"] for path, pf in published_files.items()
+                } == expected_ids
+
+    def test_get_published_files_from_file_paths_async(self):
+        """
+        Test the BreakdownManager 'get_published_files_from_file_paths' and
+        'get_published_files_from_file_paths_by_chunk' methods executed async.
+        """
+
+        get_setting = self.app.get_setting
+
+        def mock_get_setting(name, *args, **kwargs):
+            if name == "published_file_paths_chunk_size":
+                return 1
+            return get_setting(name, *args, **kwargs)
+
+        file_paths = list(self.published_files.keys())
+        expected_ids = {path: pf["id"] for path, pf in self.published_files.items()}
+        assert len(file_paths) > 1
+
+        def run_task(call):
+            cbl = call[0][0]
+            return cbl(*call[1].get("task_args", []), **call[1].get("task_kwargs", {}))
+
+        with patch.object(self.app, "get_setting", new=mock_get_setting):
+            # A single task resolves all chunks, its task id is returned.
+            bg_task_manager = MagicMock()
+            task_id = self.manager.get_published_files_from_file_paths(
+                file_paths, bg_task_manager=bg_task_manager
+            )
+            assert task_id == bg_task_manager.add_task.return_value
+            bg_task_manager.add_task.assert_called_once()
+            published_files = run_task(bg_task_manager.add_task.call_args)
+            assert {
+                path: pf["id"] for path, pf in published_files.items()
+            } == expected_ids
+
+            # One task per chunk, in the same task group.
+            bg_task_manager = MagicMock()
+            group_id = self.manager.get_published_files_from_file_paths_by_chunk(
+                file_paths, bg_task_manager
+            )
+            calls = bg_task_manager.add_task.call_args_list
+            assert len(calls) == len(file_paths)
+            assert all(call[1]["group"] == group_id for call in calls)
+            published_files = {}
+            for call in calls:
+                published_files.update(run_task(call))
+            assert {
+                path: pf["id"] for path, pf in published_files.items()
+            } == expected_ids
+
+        assert (
+            self.manager.get_published_files_from_file_paths_by_chunk(
+                [], bg_task_manager
+            )
+            is None
+        )
+
     def test_get_published_files_for_items(self):
         """Test the BreakdownManager 'get_published_files_for_items' method."""
 
@@ -849,6 +1148,580 @@ class TestBreakdownManager(AppTestBase):
             assert pf["code"] != "ignore_history"
             assert pf["id"] in self.expected_published_file_ids
 
+    def test_get_published_files_for_items_with_filters(self):
+        """
+        Test the BreakdownManager 'get_published_files_for_items' method with additional
+        filters, e.g. to only get the published files created since a given date.
+        """
+
+        new_publish = self.create_published_file(
+            code="hello3",
+            name=self.first_publish["name"],
+            path_cache="%s/foo/bar/hello3" % self.project_name,
+            path_cache_storage=self.primary_storage,
+            created_at=datetime.datetime(2021, 2, 1, 12, 1),
+            task=self.first_publish["task"],
+            entity=self.first_publish["entity"],
+            version_number=3,
+            published_file_type=self.first_publish["published_file_type"],
+        )
+
+        file_items = self.manager.scan_scene()
+        published_files = self.manager.get_published_files_for_items(
+            file_items,
+            extra_fields=["created_at"],
+            published_file_filters=[
+                ["created_at", "greater_than", datetime.datetime(2021, 1, 10)]
+            ],
+        )
+
+        assert [pf["id"] for pf in published_files] == [new_publish["id"]]
+
+    def test_get_published_files_for_items_exact_keys(self):
+        """
+        Test that the BreakdownManager 'get_published_files_for_items' method only finds the
+        published files that match exactly the items' keys.
+        """
+
+        other_pf_type = {
+            "id": 889,
+            "type": self.published_file_type,
+            "name": "Other File",
+        }
+        self.add_to_sg_mock_db(other_pf_type)
+
+        # A published file with the name of one item and the type of the other item. This
+        # does not belong to either item.
+        cross_publish = self.create_published_file(
+            code="cross",
+            name=self.first_publish["name"],
+            path_cache="%s/foo/bar/cross" % self.project_name,
+            path_cache_storage=self.primary_storage,
+            created_at=datetime.datetime(2021, 1, 4, 12, 1),
+            task=self.first_publish["task"],
+            entity=self.first_publish["entity"],
+            version_number=3,
+            published_file_type=other_pf_type,
+        )
+        other_publish = self.create_published_file(
+            code="other",
+            name="other",
+            path_cache="%s/foo/bar/other" % self.project_name,
+            path_cache_storage=self.primary_storage,
+            created_at=datetime.datetime(2021, 1, 4, 12, 1),
+            task=self.first_publish["task"],
+            entity=self.first_publish["entity"],
+            version_number=1,
+            published_file_type=other_pf_type,
+        )
+
+        file_items = [
+            FileItem(
+                "hello_node",
+                "test",
+                "foo/bar/hello",
+                sg_data={
+                    field: self.first_publish.get(field)
+                    for field in self.constants.PUBLISHED_FILES_FIELDS
+                },
+            ),
+            FileItem(
+                "other_node",
+                "test",
+                "foo/bar/other",
+                sg_data={
+                    field: other_publish.get(field)
+                    for field in self.constants.PUBLISHED_FILES_FIELDS
+                },
+            ),
+        ]
+        published_files = self.manager.get_published_files_for_items(
+            file_items, extra_fields=["code"]
+        )
+
+        assert set(pf["id"] for pf in published_files) == set(
+            [
+                self.first_publish["id"],
+                self.first_publish_latest["id"],
+                other_publish["id"],
+            ]
+        )
+        assert (
+            self.manager.get_published_files_over_fetch_ratio(
+                file_items, published_files
+            )
+            == 0.0
+        )
+        assert (
+            self.manager.get_published_files_over_fetch_ratio(
+                file_items, published_files + [cross_publish]
+            )
+            == 0.25
+        )
+
+    def test_get_published_files_for_items_split(self):
+        """
+        Test the BreakdownManager 'get_published_files_for_items' method when the query is
+        split into several queries to stay under the query budget.
+        """
+
+        file_items = self.manager.scan_scene(extra_fields=["code"])
+        unique_keys = set(
+            (
+                item.sg_data["entity"]["id"],
+                item.sg_data["task"]["id"],
+                item.sg_data["name"],
+            )
+            for item in file_items
+        )
+        assert len(unique_keys) > 1
+
+        expected_published_files = self.manager.get_published_files_for_items(
+            file_items, extra_fields=["code"]
+        )
+        expected_latest_ids = {}
+        for pf in expected_published_files:
+            key = (pf["entity"]["id"], pf["task"]["id"], pf["name"])
+            expected_latest_ids.setdefault(key, pf["id"])
+
+        get_setting = self.app.get_setting
+        for max_items, max_filter_size in [(1, 0), (0, 1), (2, 1000000)]:
+
+            def mock_get_setting(name, *args, **kwargs):
+                if name == "published_files_query_max_items":
+                    return max_items
+                if name == "published_files_query_max_filter_size":
+                    return max_filter_size
+                if name == "latest_published_files_only":
+                    return True
+                return get_setting(name, *args, **kwargs)
+
+            with patch.object(self.app, "get_setting", new=mock_get_setting):
+                query_filters = self.app.execute_hook_method(
+                    "hook_get_published_files",
+                    "get_published_file_query_filters_for_items",
+                    items=file_items,
+                )
+                if max_items == 2:
+                    assert len(query_filters) == (len(unique_keys) + 1) // 2
+                else:
+                    # One query per unique item key
+                    assert len(query_filters) == len(unique_keys)
+
+                published_files = self.manager.get_published_files_for_items(
+                    file_items, extra_fields=["code"]
+                )
+                latest_published_files = (
+                    self.manager.get_latest_published_files_for_items(
+                        file_items, extra_fields=["code"]
+                    )
+                )
+
+            # The merged results are the same, still ordered by version number
+            assert sorted(pf["id"] for pf in published_files) == sorted(
+                pf["id"] for pf in expected_published_files
+            )
+            versions = [pf["version_number"] for pf in published_files]
+            assert versions == sorted(versions, reverse=True)
+
+            assert sorted(pf["id"] for pf in latest_published_files) == sorted(
+                expected_latest_ids.values()
+            )
+
+    def test_get_latest_published_files_for_items(self):
+        """Test the BreakdownManager 'get_latest_published_files_for_items' method."""
+
+        file_items = self.manager.scan_scene(extra_fields=["code"])
+        assert isinstance(file_items, list)
+
+        # Get the latest published file per key from the full history
+        history_published_files = self.manager.get_published_files_for_items(
+            file_items, extra_fields=["code"]
+        )
+        expected_latest = {}
+        for pf in history_published_files:
+            key = (pf["entity"]["id"], pf["task"]["id"], pf["name"])
+            expected_latest.setdefault(key, pf)
+
+        get_setting = self.app.get_setting
+
+        def mock_get_setting(name, *args, **kwargs):
+            if name == "latest_published_files_only":
+                return latest_only
+            return get_setting(name, *args, **kwargs)
+
+        with patch.object(self.app, "get_setting", new=mock_get_setting):
+            # Querying the full history should return the same result.
+            latest_only = False
+            published_files = self.manager.get_latest_published_files_for_items(
+                file_items, extra_fields=["code"]
+            )
+            assert published_files == history_published_files
+
+            # Querying only the latest should return the first published file per key
+            # found in the full history.
+            latest_only = True
+            published_files = self.manager.get_latest_published_files_for_items(
+                file_items, extra_fields=["code"]
+            )
+
+        assert len(published_files) == len(expected_latest)
+        for pf in published_files:
+            assert pf["code"] != "ignore_history"
+            key = (pf["entity"]["id"], pf["task"]["id"], pf["name"])
+            assert expected_latest[key]["id"] == pf["id"]
+            assert pf["version_number"] == expected_latest[key]["version_number"]
+            # Ensure the fields of the full history query were retrieved.
+            assert set(pf.keys()) == set(expected_latest[key].keys())
+
+    def summarize_published_files(self, entity_type, filters, summary_fields, grouping):
+        """
+        Summarize the highest version number of the published files from the mock database,
+        grouped by the given fields, in the format returned by the Flow Production Tracking
+        API: the groups are nested in the order of the grouping fields, entity fields are
+        grouped by entity and the other fields by value.
+        """
+
+        assert summary_fields == [{"field": "version_number", "type": "maximum"}]
+        fields = [group["field"] for group in grouping]
+
+        groups = []
+        # Use the class method, the instance method may be patched by the test.
+        for pf in type(self.mockgun).find(
+            self.mockgun, entity_type, filters, fields=fields + ["version_number"]
+        ):
+            level = groups
+            for depth, field in enumerate(fields):
+                value = pf.get(field)
+                if isinstance(value, dict):
+                    value = {
+                        "type": value["type"],
+                        "id": value["id"],
+                        "name": value.get("name") or value.get("code"),
+                        "valid": "valid",
+                    }
+                group = next((g for g in level if g["group_value"] == value), None)
+                if group is None:
+                    group = {
+                        "group_name": str((value or {}).get("name") or "")
+                        if isinstance(value, dict)
+                        else str(value or ""),
+                        "group_value": value,
+                        "summaries": {"version_number": 0},
+                    }
+                    if depth < len(fields) - 1:
+                        group["groups"] = []
+                    level.append(group)
+                group["summaries"]["version_number"] = max(
+                    group["summaries"]["version_number"], pf["version_number"]
+                )
+                level = group.get("groups")
+
+        return {
+            "groups": groups,
+            "summaries": {
+                "version_number": max(
+                    [g["summaries"]["version_number"] for g in groups] or [0]
+                )
+            },
+        }
+
+    def test_get_latest_versions_summary(self):
+        """
+        Test that the highest version number per published file key is parsed from the
+        summary returned by the Flow Production Tracking API.
+        """
+
+        hook = self.app.create_hook_instance(
+            self.app.get_setting("hook_get_published_files")
+        )
+        project = {"type": "Project", "id": 1, "name": "Project", "valid": "valid"}
+        asset = {"type": "Asset", "id": 2, "name": "Asset", "valid": "valid"}
+        task = {"type": "Task", "id": 3, "name": "Model", "valid": "valid"}
+        pf_type = {"type": "PublishedFileType", "id": 4, "name": "Maya Scene"}
+        summary = {
+            "groups": [
+                {
+                    "group_name": "Project",
+                    "group_value": project,
+                    "summaries": {"version_number": 7},
+                    "groups": [
+                        {
+                            "group_name": "Asset",
+                            "group_value": asset,
+                            "summaries": {"version_number": 7},
+                            "groups": [
+                                {
+                                    "group_name": "",
+                                    "group_value": None,
+                                    "summaries": {"version_number": 3},
+                                    "groups": [
+                                        {
+                                            "group_name": "Maya Scene",
+                                            "group_value": pf_type,
+                                            "summaries": {"version_number": 3},
+                                            "groups": [
+                                                {
+                                                    "group_name": "hello",
+                                                    "group_value": "hello",
+                                                    "summaries": {"version_number": 3},
+                                                },
+                                            ],
+                                        },
+                                    ],
+                                },
+                                {
+                                    "group_name": "Model",
+                                    "group_value": task,
+                                    "summaries": {"version_number": 7},
+                                    "groups": [
+                                        {
+                                            "group_name": "Maya Scene",
+                                            "group_value": pf_type,
+                                            "summaries": {"version_number": 7},
+                                            "groups": [
+                                                {
+                                                    "group_name": "hello",
+                                                    "group_value": "hello",
+                                                    "summaries": {"version_number": 2},
+                                                },
+                                                {
+                                                    "group_name": "world",
+                                                    "group_value": "world",
+                                                    "summaries": {"version_number": 7},
+                                                },
+                                            ],
+                                        },
+                                    ],
+                                },
+                            ],
+                        },
+                    ],
+                },
+            ],
+            "summaries": {"version_number": 7},
+        }
+
+        sg = MagicMock()
+        sg.summarize.return_value = summary
+        filters = [["project", "is", project]]
+        assert hook._get_latest_versions(sg, filters) == {
+            (1, "Asset", 2, None, 4, "hello"): 3,
+            (1, "Asset", 2, 3, 4, "hello"): 2,
+            (1, "Asset", 2, 3, 4, "world"): 7,
+        }
+        sg.summarize.assert_called_once_with(
+            "PublishedFile",
+            filters=filters,
+            summary_fields=[{"field": "version_number", "type": "maximum"}],
+            grouping=[
+                {"field": field, "type": "exact", "direction": "asc"}
+                for field in hook.KEY_FIELDS
+            ],
+        )
+        sg.find.assert_not_called()
+
+    def test_get_latest_published_files_for_items_summary(self):
+        """
+        Test the BreakdownManager 'get_latest_published_files_for_items' method, with the
+        highest versions summarized on the server, and that only the latest version of each
+        key is retrieved.
+        """
+
+        file_items = self.manager.scan_scene(extra_fields=["code"])
+        history_published_files = self.manager.get_published_files_for_items(
+            file_items, extra_fields=["code"]
+        )
+        expected_latest = {}
+        for pf in history_published_files:
+            expected_latest.setdefault(self.manager.get_published_file_key(pf), pf)
+
+        get_setting = self.app.get_setting
+
+        def mock_get_setting(name, *args, **kwargs):
+            if name == "latest_published_files_only":
+                return True
+            return get_setting(name, *args, **kwargs)
+
+        found_published_files = []
+        find = self.mockgun.find
+
+        def mock_find(entity_type, filters, *args, **kwargs):
+            result = find(entity_type, filters, *args, **kwargs)
+            found_published_files.extend(result)
+            return result
+
+        with patch.object(self.app, "get_setting", new=mock_get_setting), patch.object(
+            self.mockgun,
+            "summarize",
+            create=True,
+            side_effect=self.summarize_published_files,
+        ) as summarize, patch.object(self.mockgun, "find", side_effect=mock_find):
+            published_files = self.manager.get_latest_published_files_for_items(
+                file_items, extra_fields=["code"]
+            )
+            assert summarize.called
+
+        assert len(published_files) == len(expected_latest)
+        for pf in published_files:
+            key = self.manager.get_published_file_key(pf)
+            assert pf["id"] == expected_latest[key]["id"]
+            assert set(pf.keys()) == set(expected_latest[key].keys())
+
+        # Only the latest version of each key was retrieved, not the versions of the other
+        # keys that have the same version number.
+        assert sorted(pf["id"] for pf in found_published_files) == sorted(
+            pf["id"] for pf in expected_latest.values()
+        )
+
+    def test_get_publish_key(self):
+        """Test the BreakdownManager 'get_publish_key' method."""
+
+        sg_data = {
+            "id": 1,
+            "project": {"type": "Project", "id": 2},
+            "entity": {"type": "Asset", "id": 3},
+            "task": None,
+            "published_file_type": {"type": "PublishedFileType", "id": 4},
+            "name": "hello",
+            "version_number": 5,
+        }
+        file_item = FileItem("node", "reference", "/foo/bar", sg_data=sg_data)
+
+        # The key is the one defined by the get published files hook.
+        hook_key = self.app.execute_hook_method(
+            "hook_get_published_files", "get_published_file_key", sg_data=sg_data
+        )
+        assert hook_key == (2, "Asset", 3, None, 4, "hello")
+        assert self.manager.get_published_file_key(sg_data) == hook_key
+        assert (
+            self.manager.get_published_file_key(dict(sg_data, id=6, version_number=7))
+            == hook_key
+        )
+        assert self.manager.get_published_file_key(None) is None
+
+        # The key is cached by the item, until its data is set again.
+        assert self.manager.get_publish_key(file_item) == hook_key
+        assert file_item.publish_key == hook_key
+        file_item.sg_data = dict(sg_data, name="world")
+        assert self.manager.get_publish_key(file_item) == (
+            2,
+            "Asset",
+            3,
+            None,
+            4,
+            "world",
+        )
+        file_item.sg_data = None
+        assert self.manager.get_publish_key(file_item) is None
+
+    def test_get_latest_published_files_mapping(self):
+        """Test the BreakdownManager 'get_latest_published_files_mapping' method."""
+
+        file_items = self.manager.scan_scene()
+        assert isinstance(file_items, list)
+
+        history_published_files = self.manager.get_published_files_for_items(file_items)
+        # The history is sorted by version, the first published file per key is the latest.
+        expected_latest = {}
+        for pf in history_published_files:
+            expected_latest.setdefault(self.manager.get_published_file_key(pf), pf)
+
+        # The order of the published files should not matter.
+        for published_files in (
+            history_published_files,
+            list(reversed(history_published_files)),
+        ):
+            index = self.manager.get_latest_published_files_index(published_files)
+            assert len(index) == len(expected_latest)
+            for key, pf in index.items():
+                assert pf["version_number"] == expected_latest[key]["version_number"]
+
+            latest_published_files = self.manager.get_latest_published_files_mapping(
+                file_items, published_files
+            )
+            assert latest_published_files
+            for file_item in file_items:
+                if file_item not in latest_published_files:
+                    assert (
+                        not file_item.sg_data
+                        or self.manager.get_publish_key(file_item)
+                        not in expected_latest
+                    )
+                    continue
+                latest = latest_published_files[file_item]
+                assert latest["version_number"] == (
+                    expected_latest[self.manager.get_publish_key(file_item)][
+                        "version_number"
+                    ]
+                )
+                assert latest["version_number"] >= file_item.sg_data["version_number"]
+
+        assert self.manager.get_latest_published_files_index([]) == {}
+        assert self.manager.get_latest_published_files_mapping(file_items, []) == {}
+
+    def test_get_latest_published_files_changes(self):
+        """Test the BreakdownManager 'get_latest_published_files_changes' method."""
+
+        latest_published_files = {
+            "a": {"id": 2, "version_number": 2},
+            "b": {"id": 4, "version_number": 4},
+        }
+        current_latest_published_files = {
+            "a": (2, 2),
+            "b": (3, 3),
+            "c": (5, 1),
+            "d": (None, 0),
+        }
+
+        # All published files were queried, keys without a latest published file change.
+        changes = self.manager.get_latest_published_files_changes(
+            latest_published_files, current_latest_published_files
+        )
+        assert changes == {"b": latest_published_files["b"], "c": None}
+
+        # Only new published files were queried, only higher versions change.
+        current_latest_published_files["b"] = (5, 5)
+        changes = self.manager.get_latest_published_files_changes(
+            latest_published_files, current_latest_published_files, merge=True
+        )
+        assert changes == {}
+        current_latest_published_files["a"] = (None, 1)
+        changes = self.manager.get_latest_published_files_changes(
+            latest_published_files, current_latest_published_files, merge=True
+        )
+        assert changes == {"a": latest_published_files["a"]}
+
+    def test_resolve_latest_published_files(self):
+        """Test the BreakdownManager 'resolve_latest_published_files' method."""
+
+        file_items = self.manager.scan_scene()
+        assert isinstance(file_items, list)
+
+        result = self.manager.resolve_latest_published_files(
+            file_items, extra_fields=["created_at"]
+        )
+        published_files = self.manager.get_latest_published_files_for_items(
+            file_items, extra_fields=["created_at"]
+        )
+        assert result["published_file_count"] == len(published_files)
+        assert result["latest_published_files"] == (
+            self.manager.get_latest_published_files_index(published_files)
+        )
+        assert result["max_created_at"] == max(
+            pf["created_at"] for pf in published_files
+        )
+
+        # Nothing changed since the latest published files were resolved.
+        current_latest_published_files = {
+            key: (pf["id"], pf["version_number"])
+            for key, pf in result["latest_published_files"].items()
+        }
+        result = self.manager.resolve_latest_published_files(
+            file_items, current_latest_published_files=current_latest_published_files
+        )
+        assert result["latest_published_files"] == {}
+
     def test_get_latest_published_file(self):
         """Test getting the latest available published file according to the current item context."""
 
@@ -0,0 +1,204 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import datetime
+import os
+import pytest
+import sys
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python"))
+app_dir = os.path.abspath(os.path.join(base_dir, "tk_multi_breakdown2"))
+api_dir = os.path.abspath(os.path.join(app_dir, "api"))
+sys.path.extend([base_dir, app_dir, api_dir])
+from tk_multi_breakdown2.api.path_cache import PublishedFilePathCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    """The path to the cache database file, in a directory that does not exist yet."""
+
+    return str(tmp_path / "cache" / "published_file_paths.db")
+
+
+@pytest.fixture
+def sg_data():
+    """Published file data to cache."""
+
+    return {
+        "id": 6,
+        "type": "PublishedFile",
+        "name": "hello",
+        "version_number": 2,
+        "updated_at": datetime.datetime(2021, 1, 4, 12, 1),
+    }
+
+
+class TestApiPathCache:
+    """
+    Test the PublishedFilePathCache class methods.
+    """
+
+    def test_hits_and_misses(self, cache_path, sg_data):
+        """Test caching the paths with and without published files."""
+
+        cache = PublishedFilePathCache(cache_path, signature="query")
+        assert os.path.exists(cache_path)
+
+        cache.set_hits({"/foo/bar/hello": sg_data})
+        cache.set_misses(["/foo/bar/texture"])
+
+        hits, misses, uncached = cache.get(
+            ["/foo/bar/hello", "/foo/bar/texture", "/foo/bar/world"]
+        )
+        assert hits == {"/foo/bar/hello": sg_data}
+        assert misses == ["/foo/bar/texture"]
+        assert uncached == ["/foo/bar/world"]
+
+    def test_normalized_paths(self, cache_path, sg_data):
+        """Test that the paths are looked up by their normalized path."""
+
+        cache = PublishedFilePathCache(cache_path, signature="query")
+        cache.set_hits({"/foo/bar/hello": sg_data})
+
+        hits, _, uncached = cache.get(["/foo//bar/./hello"])
+        assert hits == {"/foo//bar/./hello": sg_data}
+        assert uncached == []
+
+    def test_persistence(self, cache_path, sg_data):
+        """Test that the cache persists across instances."""
+
+        PublishedFilePathCache(cache_path, signature="query").set_hits(
+            {"/foo/bar/hello": sg_data}
+        )
+
+        hits, _, _ = PublishedFilePathCache(cache_path, signature="query").get(
+            ["/foo/bar/hello"]
+        )
+        assert hits == {"/foo/bar/hello": sg_data}
+
+    def test_signature(self, cache_path, sg_data):
+        """Test that entries cached by a different query are not found."""
+
+        PublishedFilePathCache(cache_path, signature="query").set_hits(
+            {"/foo/bar/hello": sg_data}
+        )
+
+        hits, misses, uncached = PublishedFilePathCache(
+            cache_path, signature="another query"
+        ).get(["/foo/bar/hello"])
+        assert hits == {}
+        assert misses == []
+        assert uncached == ["/foo/bar/hello"]
+
+        assert PublishedFilePathCache.get_signature(
+            ["name", "id"], [["code", "is", "a"]]
+        ) == PublishedFilePathCache.get_signature(["id", "name"], [["code", "is", "a"]])
+        assert PublishedFilePathCache.get_signature(
+            ["id"], [["code", "is", "a"]]
+        ) != PublishedFilePathCache.get_signature(["id"], [["code", "is", "b"]])
+
+    @pytest.mark.parametrize(
+        "age,expected_hits,expected_misses",
+        [(10, True, True), (100, True, False), (1000, False, False)],
+    )
+    def test_ttl(self, cache_path, sg_data, age, expected_hits, expected_misses):
+        """Test that hits and misses expire after their own time to live."""
+
+        cache = PublishedFilePathCache(
+            cache_path, hit_ttl=500, miss_ttl=50, signature="query"
+        )
+        cache.set_hits({"/foo/bar/hello": sg_data}, now=0)
+        cache.set_misses(["/foo/bar/texture"], now=0)
+
+        hits, misses, uncached = cache.get(
+            ["/foo/bar/hello", "/foo/bar/texture"], now=age
+        )
+        assert bool(hits) == expected_hits
+        assert bool(misses) == expected_misses
+        assert len(uncached) == (not expected_hits) + (not expected_misses)
+
+    def test_disabled_ttl(self, cache_path, sg_data):
+        """Test that nothing is cached with a time to live of 0."""
+
+        cache = PublishedFilePathCache(
+            cache_path, hit_ttl=0, miss_ttl=0, signature="query"
+        )
+        cache.set_hits({"/foo/bar/hello": sg_data})
+        cache.set_misses(["/foo/bar/texture"])
+
+        _, _, uncached = cache.get(["/foo/bar/hello", "/foo/bar/texture"])
+        assert uncached == ["/foo/bar/hello", "/foo/bar/texture"]
+
+    def test_invalidate_and_clear(self, cache_path, sg_data):
+        """Test removing entries from the cache."""
+
+        cache = PublishedFilePathCache(cache_path, signature="query")
+        cache.set_hits({"/foo/bar/hello": sg_data, "/foo/bar/world": sg_data})
+        cache.set_misses(["/foo/bar/texture"])
+
+        cache.invalidate(["/foo/bar/hello"])
+        hits, misses, uncached = cache.get(
+            ["/foo/bar/hello", "/foo/bar/world", "/foo/bar/texture"]
+        )
+        assert list(hits.keys()) == ["/foo/bar/world"]
+        assert misses == ["/foo/bar/texture"]
+        assert uncached == ["/foo/bar/hello"]
+
+        cache.clear()
+        hits, misses, _ = cache.get(["/foo/bar/world", "/foo/bar/texture"])
+        assert hits == {}
+        assert misses == []
+
+    def test_encoded_data(self, cache_path, sg_data):
+        """
+        Test that the published file data is stored as JSON, and that the datetime values are
+        decoded back to datetime objects.
+        """
+
+        sg_data["created_at"] = datetime.datetime(
+            2021, 1, 4, 12, 1, tzinfo=datetime.timezone(datetime.timedelta(hours=-5))
+        )
+        sg_data["entity"] = {"type": "Asset", "id": 2, "name": "hello"}
+        sg_data["tags"] = [{"type": "Tag", "id": 3}]
+
+        data = PublishedFilePathCache.encode_data(sg_data)
+        assert isinstance(data, str)
+        assert PublishedFilePathCache.decode_data(data) == sg_data
+
+        cache = PublishedFilePathCache(cache_path, signature="query")
+        cache.set_hits({"/foo/bar/hello": sg_data})
+        hits, _, _ = cache.get(["/foo/bar/hello"])
+        assert hits == {"/foo/bar/hello": sg_data}
+        assert isinstance(hits["/foo/bar/hello"]["updated_at"], datetime.datetime)
+
+    def test_invalid_data(self, cache_path, sg_data):
+        """Test that the entries whose data cannot be decoded are not found."""
+
+        cache = PublishedFilePathCache(cache_path, signature="query")
+        cache.set_hits({"/foo/bar/hello": sg_data, "/foo/bar/world": sg_data})
+
+        # Entry written by a previous version of the cache, with a binary format.
+        with cache._connect() as connection:
+            connection.execute(
+                "UPDATE published_file_paths SET sg_data = ? WHERE path = ?",
+                (
+                    b"\x80\x04\x95",
+                    PublishedFilePathCache.normalize_path("/foo/bar/hello"),
+                ),
+            )
+
+        hits, misses, uncached = cache.get(["/foo/bar/hello", "/foo/bar/world"])
+        assert hits == {"/foo/bar/world": sg_data}
+        assert misses == []
+        assert uncached == ["/foo/bar/hello"]
+
+        with pytest.raises(PublishedFilePathCache.ERRORS):
+            PublishedFilePathCache.encode_data({"id": 1, "data": object()})
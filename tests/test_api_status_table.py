@@ -0,0 +1,175 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import os
+import pytest
+import sys
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python"))
+app_dir = os.path.abspath(os.path.join(base_dir, "tk_multi_breakdown2"))
+api_dir = os.path.abspath(os.path.join(app_dir, "api"))
+sys.path.extend([base_dir, app_dir, api_dir])
+from tk_multi_breakdown2.api.status_table import FileItemStatusTable
+
+
+class TestApiStatusTable:
+    """
+    Test the FileItemStatusTable class methods.
+    """
+
+    @pytest.mark.parametrize(
+        "current_version,highest_version,locked,expected_status",
+        [
+            (1, 2, True, FileItemStatusTable.STATUS_LOCKED),
+            (1, 2, False, FileItemStatusTable.STATUS_OUT_OF_SYNC),
+            (2, 2, False, FileItemStatusTable.STATUS_UP_TO_DATE),
+            (3, 2, False, FileItemStatusTable.STATUS_UP_TO_DATE),
+            (1, None, False, FileItemStatusTable.STATUS_NONE),
+            (1, None, True, FileItemStatusTable.STATUS_LOCKED),
+        ],
+    )
+    def test_status(self, current_version, highest_version, locked, expected_status):
+        """Test computing the row status."""
+
+        table = FileItemStatusTable()
+        table.set_row("a", current_version, highest_version, locked)
+        assert table.get_status("a") == expected_status
+        assert table.get_status("b") is None
+        assert (
+            FileItemStatusTable.compute_status(current_version, highest_version, locked)
+            == expected_status
+        )
+
+    def test_update_and_remove(self):
+        """Test that the statuses are updated after the table is modified."""
+
+        table = FileItemStatusTable()
+        table.set_row("a", 1, 2, False, "group")
+        table.set_row("b", 2, 2, False, "group")
+        table.set_row("c", 1, 1, True, "group")
+        assert len(table) == 3
+        assert table.get_status("a") == FileItemStatusTable.STATUS_OUT_OF_SYNC
+
+        table.set_row("a", 2, 2, False, "group")
+        assert table.get_status("a") == FileItemStatusTable.STATUS_UP_TO_DATE
+
+        # Removing a row moves the last row, make sure the rows keep their own data.
+        assert table.remove_row("a")
+        assert not table.remove_row("a")
+        assert "a" not in table
+        assert len(table) == 2
+        assert table.get_status("a") is None
+        assert table.get_status("b") == FileItemStatusTable.STATUS_UP_TO_DATE
+        assert table.get_status("c") == FileItemStatusTable.STATUS_LOCKED
+
+        table.clear()
+        assert len(table) == 0
+        assert table.get_status("b") is None
+
+    def test_update_rows(self):
+        """Test updating the highest versions of many rows at once."""
+
+        table = FileItemStatusTable()
+        table.set_row("a", 1, None, False, "group")
+        table.set_row("b", 2, None, False, "group")
+        table.set_row("c", 1, None, True, "group")
+        table.set_row("d", 1, None, False)
+        assert table.get_group_status_counts("group") == [2, 0, 0, 1]
+
+        changed_keys = table.update_rows(["a", "b", "c", "d", "e"], [2, 2, 2, 1, 1])
+        assert sorted(changed_keys) == ["a", "b", "d"]
+        assert table.get_status("a") == FileItemStatusTable.STATUS_OUT_OF_SYNC
+        assert table.get_status("b") == FileItemStatusTable.STATUS_UP_TO_DATE
+        assert table.get_status("c") == FileItemStatusTable.STATUS_LOCKED
+        assert table.get_status("d") == FileItemStatusTable.STATUS_UP_TO_DATE
+        assert "e" not in table
+        assert table.get_group_status_counts("group") == [0, 1, 1, 1]
+
+        # The rows keep their highest version when they are updated one at a time.
+        assert table.update_rows([], []) == []
+        table.remove_row("a")
+        assert table.update_rows(["b"], [3]) == ["b"]
+        assert table.get_group_status_counts("group") == [0, 0, 1, 1]
+
+    def test_group_status(self):
+        """Test the group status and status counts."""
+
+        table = FileItemStatusTable()
+        table.set_row("a", 1, 1, True, "locked")
+        table.set_row("b", 1, 1, True, "locked")
+        table.set_row("c", 1, 1, True, "up_to_date")
+        table.set_row("d", 1, 1, False, "up_to_date")
+        table.set_row("e", 1, None, False, "up_to_date")
+        table.set_row("f", 1, 2, False, "out_of_sync")
+        table.set_row("g", 1, 2, True, "out_of_sync")
+        table.set_row("h", 1, 2, False)
+
+        assert table.get_group_status("locked") == FileItemStatusTable.STATUS_LOCKED
+        assert (
+            table.get_group_status("up_to_date")
+            == FileItemStatusTable.STATUS_UP_TO_DATE
+        )
+        assert (
+            table.get_group_status("out_of_sync")
+            == FileItemStatusTable.STATUS_OUT_OF_SYNC
+        )
+        assert table.get_group_status("empty") is None
+
+        assert table.get_group_status_counts("up_to_date") == [1, 1, 0, 1]
+        assert table.get_group_status_counts("out_of_sync") == [0, 0, 1, 1]
+        assert table.get_group_status_counts("empty") == [0, 0, 0, 0]
+
+        # Move a row to another group
+        table.set_row("f", 1, 2, False, "up_to_date")
+        assert table.get_group_status_counts("up_to_date") == [1, 1, 1, 1]
+        assert (
+            table.get_group_status("out_of_sync") == FileItemStatusTable.STATUS_LOCKED
+        )
+
+        # Remove all rows of a group
+        table.remove_row("g")
+        assert table.get_group_status("out_of_sync") is None
+
+    def test_group_loading_count(self):
+        """Test the number of rows loading per group."""
+
+        table = FileItemStatusTable()
+        table.set_row("a", 1, 1, False, "group")
+        table.set_row("b", 1, 1, False, "group")
+        table.set_row("c", 1, 1, False, "other")
+        assert table.get_group_count("group") == 2
+        assert table.get_group_loading_count("group") == 0
+
+        assert table.set_loading("a", True)
+        assert table.set_loading("a", True)
+        assert table.set_loading("b", True)
+        assert not table.set_loading("d", True)
+        assert table.is_loading("a")
+        assert not table.is_loading("c")
+        assert table.get_group_loading_count("group") == 2
+
+        # Updating a row keeps its loading state, and moves it to its new group.
+        table.set_row("a", 1, 2, False, "other")
+        assert table.is_loading("a")
+        assert table.get_group_loading_count("group") == 1
+        assert table.get_group_loading_count("other") == 1
+
+        table.set_loading("a", False)
+        assert table.get_group_loading_count("other") == 0
+
+        table.remove_row("b")
+        assert table.get_group_loading_count("group") == 0
+        assert table.get_group_count("group") == 0
+
+        table.set_loading("c", True)
+        table.clear_loading()
+        assert not table.is_loading("c")
+        assert table.get_group_loading_count("other") == 0
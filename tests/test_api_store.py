@@ -0,0 +1,244 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import os
+import pytest
+import sys
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python"))
+app_dir = os.path.abspath(os.path.join(base_dir, "tk_multi_breakdown2"))
+api_dir = os.path.abspath(os.path.join(app_dir, "api"))
+sys.path.extend([base_dir, app_dir, api_dir])
+from tk_multi_breakdown2.api.item import FileItem
+from tk_multi_breakdown2.api.store import FileItemStore
+
+
+def create_file_item(node_name, path, name, version_number, entity_id=1, task_id=2):
+    """Create a file item with the minimal published file data."""
+
+    return FileItem(
+        node_name,
+        "reference",
+        path,
+        sg_data={
+            "id": version_number,
+            "type": "PublishedFile",
+            "project": {"type": "Project", "id": 1},
+            "entity": {"type": "Asset", "id": entity_id},
+            "task": {"type": "Task", "id": task_id},
+            "published_file_type": {"type": "PublishedFileType", "id": 3},
+            "name": name,
+            "version_number": version_number,
+        },
+    )
+
+
+@pytest.fixture
+def file_items():
+    """A list of file items to store."""
+
+    return [
+        create_file_item("hello_node", "/foo/bar/hello.v001", "hello", 1),
+        create_file_item("hello_node2", "/foo/bar/hello.v001", "hello", 1),
+        create_file_item("world_node", "/foo/bar/world.v002", "world", 2, task_id=4),
+    ]
+
+
+class TestApiStore:
+    """
+    Test the FileItemStore class methods.
+    """
+
+    def test_add_and_get(self, file_items):
+        """Test looking up the file items by each index."""
+
+        store = FileItemStore(
+            file_items,
+            group_func=lambda item: item.sg_data["task"]["id"],
+            publish_key_func=lambda item: (
+                item.sg_data["entity"]["id"],
+                item.sg_data["name"],
+            ),
+        )
+        assert len(store) == 3
+        assert store.items == file_items
+        assert list(store) == file_items
+        assert all(item in store for item in file_items)
+
+        assert store.get_by_path("/foo/bar/hello.v001") == file_items[:2]
+        assert store.get_by_path("/foo/bar/not_found") == []
+        assert store.find_by_path("/foo/bar/world.v002") is file_items[2]
+
+        assert store.get_by_publish_key((1, "hello")) == file_items[:2]
+        assert store.get_by_publish_key((1, "not_found")) == []
+
+        assert store.get_by_group(2) == file_items[:2]
+        assert store.get_by_group(4) == file_items[2:]
+        assert sorted(store.get_group_ids()) == [2, 4]
+
+        # No latest published file data yet
+        assert store.get_by_status(FileItemStore.STATUS_NONE) == file_items
+
+    def test_update(self, file_items):
+        """Test that the indexes are updated after the file items are modified."""
+
+        store = FileItemStore(file_items)
+        hello_item = file_items[0]
+
+        # Update the file item to a new version
+        hello_item.extra_data = {"old_path": hello_item.path}
+        hello_item.path = "/foo/bar/hello.v002"
+        assert store.update(hello_item)
+
+        assert store.get_by_path("/foo/bar/hello.v001") == file_items[1:2]
+        assert store.get_by_path("/foo/bar/hello.v002") == [hello_item]
+        assert store.get_by_old_path("/foo/bar/hello.v001") == [hello_item]
+        assert store.find_by_path("/foo/bar/hello.v002") is hello_item
+        assert store.find_by_path("/foo/bar/hello.v003", check_old_path=True) is None
+
+        # Items not in the store are not updated
+        other_item = create_file_item("other", "/foo/other", "other", 1)
+        assert not store.update(other_item)
+        assert store.get_by_path("/foo/other") == []
+
+    @pytest.mark.parametrize(
+        "locked,current_version,latest_version,expected_status",
+        [
+            (True, 1, 2, FileItemStore.STATUS_LOCKED),
+            (False, 1, 2, FileItemStore.STATUS_OUT_OF_SYNC),
+            (False, 2, 2, FileItemStore.STATUS_UP_TO_DATE),
+            (False, 2, None, FileItemStore.STATUS_NONE),
+        ],
+    )
+    def test_status(self, locked, current_version, latest_version, expected_status):
+        """Test indexing the file items by status."""
+
+        file_item = create_file_item("node", "/foo/bar", "bar", current_version)
+        store = FileItemStore([file_item])
+        assert store.get_by_status(FileItemStore.STATUS_NONE) == [file_item]
+
+        file_item.locked = locked
+        if latest_version:
+            file_item.latest_published_file = {"version_number": latest_version}
+        store.update(file_item)
+
+        assert FileItemStore.get_item_status(file_item) == expected_status
+        assert store.get_by_status(expected_status) == [file_item]
+        if expected_status != FileItemStore.STATUS_NONE:
+            assert store.get_by_status(FileItemStore.STATUS_NONE) == []
+
+    def test_remove_and_clear(self, file_items):
+        """Test removing file items from the store."""
+
+        store = FileItemStore(file_items)
+        assert store.remove(file_items[0])
+        assert not store.remove(file_items[0])
+        assert len(store) == 2
+        assert file_items[0] not in store
+        assert store.get_by_path("/foo/bar/hello.v001") == [file_items[1]]
+
+        # Equal file items are found, even if they are different objects
+        hello_item = create_file_item("hello_node2", "/foo/bar/hello.v001", "hello", 1)
+        assert hello_item not in store
+        assert store.find(hello_item) is file_items[1]
+
+        store.clear()
+        assert len(store) == 0
+        assert store.get_by_path("/foo/bar/hello.v001") == []
+        assert store.find(hello_item) is None
+
+        store.reset(file_items[:1])
+        assert store.items == file_items[:1]
+
+    def test_set_group_func(self, file_items):
+        """Test that the file items are indexed by their new group."""
+
+        store = FileItemStore(file_items)
+        assert store.get_group_ids() == []
+
+        store.set_group_func(lambda item: item.sg_data["name"])
+        assert store.get_by_group("hello") == file_items[:2]
+        assert store.get_by_group("world") == file_items[2:]
+
+    def test_group_status(self, file_items):
+        """Test the status of the file items and their groups."""
+
+        store = FileItemStore(
+            file_items, group_func=lambda item: item.sg_data["task"]["id"]
+        )
+        assert store.get_group_status(2) == FileItemStore.STATUS_UP_TO_DATE
+        assert store.get_group_status_counts(2) == {
+            FileItemStore.STATUS_NONE: 2,
+            FileItemStore.STATUS_UP_TO_DATE: 0,
+            FileItemStore.STATUS_OUT_OF_SYNC: 0,
+            FileItemStore.STATUS_LOCKED: 0,
+        }
+
+        hello_item = file_items[0]
+        hello_item.latest_published_file = {"version_number": 2}
+        store.update(hello_item)
+        assert store.get_status(hello_item) == FileItemStore.STATUS_OUT_OF_SYNC
+        assert store.get_status(file_items[1]) == FileItemStore.STATUS_NONE
+        assert store.get_group_status(2) == FileItemStore.STATUS_OUT_OF_SYNC
+        assert store.get_group_status_counts(2)[FileItemStore.STATUS_OUT_OF_SYNC] == 1
+
+        store.remove(hello_item)
+        assert store.get_group_status(2) == FileItemStore.STATUS_UP_TO_DATE
+        # File items not in the store have their status computed directly.
+        assert store.get_status(hello_item) == FileItemStore.STATUS_OUT_OF_SYNC
+
+        store.clear()
+        assert store.get_group_status(2) is None
+
+    def test_update_highest_versions(self, file_items):
+        """Test updating the statuses of many file items at once."""
+
+        store = FileItemStore(
+            file_items, group_func=lambda item: item.sg_data["task"]["id"]
+        )
+        assert store.get_by_status(FileItemStore.STATUS_NONE) == file_items
+
+        file_items[0].latest_published_file = {"version_number": 2}
+        file_items[2].latest_published_file = {"version_number": 2}
+        changed_items = store.update_highest_versions(file_items)
+        assert changed_items == [file_items[0], file_items[2]]
+        assert store.get_status(file_items[0]) == FileItemStore.STATUS_OUT_OF_SYNC
+        assert store.get_status(file_items[2]) == FileItemStore.STATUS_UP_TO_DATE
+        assert store.get_by_status(FileItemStore.STATUS_NONE) == [file_items[1]]
+        assert store.get_by_status(FileItemStore.STATUS_OUT_OF_SYNC) == [file_items[0]]
+        assert store.get_group_status(2) == FileItemStore.STATUS_OUT_OF_SYNC
+        assert store.get_group_status(4) == FileItemStore.STATUS_UP_TO_DATE
+
+        # The file items keep their status when they are updated one at a time.
+        store.update(file_items[0])
+        assert store.get_by_status(FileItemStore.STATUS_OUT_OF_SYNC) == [file_items[0]]
+
+    def test_loading(self, file_items):
+        """Test keeping track of the file items loading per group."""
+
+        store = FileItemStore(
+            file_items, group_func=lambda item: item.sg_data["task"]["id"]
+        )
+        assert store.get_group_count(2) == 2
+        assert store.set_loading(file_items[0], True)
+        assert store.is_loading(file_items[0])
+        assert store.get_group_loading_count(2) == 1
+
+        # Updating the file item keeps its loading state
+        store.update(file_items[0])
+        assert store.get_group_loading_count(2) == 1
+
+        store.set_loading(file_items[0], False)
+        assert store.get_group_loading_count(2) == 0
+
+        store.set_loading(file_items[2], True)
+        store.clear_loading()
+        assert store.get_group_loading_count(4) == 0
@@ -0,0 +1,173 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import os
+import pytest
+import sys
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python"))
+app_dir = os.path.abspath(os.path.join(base_dir, "tk_multi_breakdown2"))
+api_dir = os.path.abspath(os.path.join(app_dir, "api"))
+sys.path.extend([base_dir, app_dir, api_dir])
+from tk_multi_breakdown2.api.thumbnail_atlas import (
+    ThumbnailAtlas,
+    ThumbnailAtlasLockedError,
+)
+
+
+@pytest.fixture
+def atlas_path(tmp_path):
+    """The path to the atlas file, in a directory that does not exist yet."""
+
+    return str(tmp_path / "atlas" / "thumbnails_64x36.atlas")
+
+
+def pixels(width, height, value):
+    """Create the pixel data of a 32 bit image filled with the value."""
+
+    return bytes([value]) * (width * 4 * height)
+
+
+class TestApiThumbnailAtlas:
+    """
+    Test the ThumbnailAtlas class methods.
+    """
+
+    def test_add_and_get(self, atlas_path):
+        """Test adding thumbnails and reading them back."""
+
+        atlas = ThumbnailAtlas(atlas_path)
+        assert os.path.exists(atlas_path)
+        assert len(atlas) == 0
+
+        assert atlas.add(1, pixels(4, 2, 1), 4, 2, 16, 6)
+        assert atlas.add(2, pixels(2, 2, 2), 2, 2, 8, 6)
+        assert 1 in atlas and 2 in atlas
+        assert atlas.get(3) is None
+
+        data, width, height, bytes_per_line, image_format = atlas.get(1)
+        assert isinstance(data, memoryview)
+        assert bytes(data) == pixels(4, 2, 1)
+        assert (width, height, bytes_per_line, image_format) == (4, 2, 16, 6)
+        data.release()
+
+        # Adding a thumbnail again replaces it
+        assert atlas.add(1, pixels(2, 2, 3), 2, 2, 8, 6)
+        data = atlas.get(1)[0]
+        assert bytes(data) == pixels(2, 2, 3)
+        data.release()
+        assert len(atlas) == 2
+
+        with pytest.raises(ValueError):
+            atlas.add(4, b"\0", 2, 2, 8, 6)
+
+        atlas.close()
+
+    def test_persistence(self, atlas_path):
+        """Test that the thumbnails are found when the atlas is opened again."""
+
+        atlas = ThumbnailAtlas(atlas_path)
+        atlas.add(1, pixels(4, 2, 1), 4, 2, 16, 6)
+        atlas.add(2, pixels(2, 2, 2), 2, 2, 8, 6)
+        atlas.close()
+
+        atlas = ThumbnailAtlas(atlas_path)
+        assert len(atlas) == 2
+        data = atlas.get(2)[0]
+        assert bytes(data) == pixels(2, 2, 2)
+        data.release()
+        atlas.close()
+
+    def test_truncated_record(self, atlas_path):
+        """Test that a partially written record is discarded."""
+
+        atlas = ThumbnailAtlas(atlas_path)
+        atlas.add(1, pixels(4, 2, 1), 4, 2, 16, 6)
+        atlas.add(2, pixels(4, 2, 2), 4, 2, 16, 6)
+        size = atlas.size_in_bytes
+        atlas.close()
+
+        with open(atlas_path, "r+b") as atlas_file:
+            atlas_file.truncate(size - 10)
+
+        atlas = ThumbnailAtlas(atlas_path)
+        assert 1 in atlas
+        assert 2 not in atlas
+        assert atlas.add(3, pixels(4, 2, 3), 4, 2, 16, 6)
+        atlas.close()
+
+        atlas = ThumbnailAtlas(atlas_path)
+        assert sorted([key for key in (1, 2, 3) if key in atlas]) == [1, 3]
+        atlas.close()
+
+    def test_invalid_file(self, atlas_path):
+        """Test that a file that is not an atlas is reset."""
+
+        os.makedirs(os.path.dirname(atlas_path))
+        with open(atlas_path, "wb") as atlas_file:
+            atlas_file.write(b"not an atlas")
+
+        atlas = ThumbnailAtlas(atlas_path)
+        assert len(atlas) == 0
+        assert atlas.add(1, pixels(1, 1, 1), 1, 1, 4, 6)
+        atlas.close()
+
+    def test_max_size(self, atlas_path):
+        """Test that the atlas is cleared once it exceeds its max size."""
+
+        record_size = ThumbnailAtlas.RECORD.size + 32
+        atlas = ThumbnailAtlas(
+            atlas_path, max_bytes=ThumbnailAtlas.HEADER.size + record_size * 2
+        )
+        assert atlas.add(1, pixels(4, 2, 1), 4, 2, 16, 6)
+        assert atlas.add(2, pixels(4, 2, 2), 4, 2, 16, 6)
+        assert atlas.add(3, pixels(4, 2, 3), 4, 2, 16, 6)
+        assert 1 not in atlas
+        assert 3 in atlas
+        assert atlas.size_in_bytes == ThumbnailAtlas.HEADER.size + record_size
+
+        # A thumbnail larger than the atlas is not added
+        assert not atlas.add(4, pixels(8, 8, 4), 8, 8, 32, 6)
+
+        # The atlas is not cleared while its pixel data is in use
+        data = atlas.get(3)[0]
+        atlas.add(5, pixels(4, 2, 5), 4, 2, 16, 6)
+        assert not atlas.add(6, pixels(4, 2, 6), 4, 2, 16, 6)
+        data.release()
+        assert atlas.add(6, pixels(4, 2, 6), 4, 2, 16, 6)
+
+        atlas.close()
+
+    def test_lock(self, atlas_path):
+        """Test that an atlas file is only open once at a time."""
+
+        atlas = ThumbnailAtlas(atlas_path)
+        with pytest.raises(ThumbnailAtlasLockedError):
+            ThumbnailAtlas(atlas_path)
+        assert not ThumbnailAtlas.remove(atlas_path)
+        assert os.path.exists(atlas_path)
+        atlas.close()
+
+        atlas = ThumbnailAtlas(atlas_path)
+        atlas.close()
+        assert ThumbnailAtlas.remove(atlas_path)
+        assert not os.path.exists(atlas_path)
+        assert not os.path.exists(atlas_path + ".lock")
+
+    def test_get_key(self):
+        """Test that a thumbnail uploaded again gets a new key."""
+
+        key = ThumbnailAtlas.get_key(1, "https://host/thumbs/a.jpg?sig=1")
+        assert isinstance(key, int)
+        assert key == ThumbnailAtlas.get_key(1, "https://host/thumbs/a.jpg?sig=2")
+        assert key != ThumbnailAtlas.get_key(1, "https://host/thumbs/b.jpg?sig=1")
+        assert key != ThumbnailAtlas.get_key(2, "https://host/thumbs/a.jpg?sig=1")
+        assert ThumbnailAtlas.get_key(None, "https://host/thumbs/a.jpg") is None
@@ -0,0 +1,133 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import os
+import pytest
+import sys
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python"))
+app_dir = os.path.abspath(os.path.join(base_dir, "tk_multi_breakdown2"))
+api_dir = os.path.abspath(os.path.join(app_dir, "api"))
+sys.path.extend([base_dir, app_dir, api_dir])
+from tk_multi_breakdown2.api.thumbnail_cache import ThumbnailCache
+
+
+class TestApiThumbnailCache:
+    """
+    Test the ThumbnailCache class methods.
+    """
+
+    def test_get_and_put(self):
+        """Test caching thumbnails by publish id and size."""
+
+        cache = ThumbnailCache(max_bytes=100)
+        small_key = ThumbnailCache.get_key(1, (64, 36))
+        large_key = ThumbnailCache.get_key(1, [128, 72])
+        assert small_key == (1, None, (64, 36))
+        assert large_key == (1, None, (128, 72))
+        assert ThumbnailCache.get_key(1) == (1, None, None)
+
+        # The url query is ignored, a new url path is a new thumbnail.
+        url_key = ThumbnailCache.get_key(
+            1, (64, 36), image_url="https://host/thumbs/a.jpg?sig=1"
+        )
+        assert url_key == (1, "/thumbs/a.jpg", (64, 36))
+        assert url_key == ThumbnailCache.get_key(
+            1, (64, 36), image_url="https://host/thumbs/a.jpg?sig=2"
+        )
+        assert url_key != ThumbnailCache.get_key(
+            1, (64, 36), image_url="https://host/thumbs/b.jpg?sig=1"
+        )
+
+        assert cache.put(small_key, "small", 10)
+        assert cache.put(large_key, "large", 40)
+        assert len(cache) == 2
+        assert cache.size_in_bytes == 50
+
+        assert cache.get(small_key) == "small"
+        assert cache.get(ThumbnailCache.get_key(2, (64, 36))) is None
+        assert cache.get(ThumbnailCache.get_key(2, (64, 36)), "default") == "default"
+
+        # Replacing a thumbnail updates its cost
+        assert cache.put(small_key, "small2", 20)
+        assert len(cache) == 2
+        assert cache.size_in_bytes == 60
+        assert cache.get(small_key) == "small2"
+
+        assert cache.stats == {
+            "hits": 2,
+            "misses": 2,
+            "evictions": 0,
+            "count": 2,
+            "bytes": 60,
+            "max_bytes": 100,
+        }
+        cache.reset_stats()
+        assert cache.stats["hits"] == 0
+
+    def test_lru_eviction(self):
+        """Test that the least recently used thumbnails are evicted first."""
+
+        cache = ThumbnailCache(max_bytes=100)
+        for publish_id in range(4):
+            cache.put(ThumbnailCache.get_key(publish_id), publish_id, 30)
+
+        # The first thumbnail was evicted to fit the fourth one
+        assert ThumbnailCache.get_key(0) not in cache
+        assert cache.size_in_bytes == 90
+        assert cache.stats["evictions"] == 1
+
+        # Using the second thumbnail makes the third one the least recently used
+        cache.get(ThumbnailCache.get_key(1))
+        cache.put(ThumbnailCache.get_key(4), 4, 30)
+        assert ThumbnailCache.get_key(1) in cache
+        assert ThumbnailCache.get_key(2) not in cache
+
+        # Reducing the budget evicts thumbnails
+        cache.max_bytes = 30
+        assert len(cache) == 1
+        assert ThumbnailCache.get_key(4) in cache
+
+    @pytest.mark.parametrize("max_bytes,expected", [(50, False), (0, True)])
+    def test_budget(self, max_bytes, expected):
+        """Test caching a thumbnail larger than the memory budget."""
+
+        cache = ThumbnailCache(max_bytes=max_bytes)
+        cache.put(ThumbnailCache.get_key(1), 1, 10)
+        assert cache.put(ThumbnailCache.get_key(2), 2, 100) == expected
+        assert (ThumbnailCache.get_key(2) in cache) == expected
+        # The other thumbnails are not evicted for a thumbnail that does not fit
+        assert ThumbnailCache.get_key(1) in cache
+
+    def test_remove_and_clear(self):
+        """Test removing thumbnails from the cache."""
+
+        cache = ThumbnailCache()
+        cache.put(ThumbnailCache.get_key(1), 1, 10)
+        cache.put(ThumbnailCache.get_key(2), 2, 10)
+
+        assert cache.remove(ThumbnailCache.get_key(1))
+        assert not cache.remove(ThumbnailCache.get_key(1))
+        assert cache.size_in_bytes == 10
+
+        cache.clear()
+        assert len(cache) == 0
+        assert cache.size_in_bytes == 0
+
+    def test_instance(self):
+        """Test that the process-wide cache is shared."""
+
+        cache = ThumbnailCache.instance(max_bytes=1024)
+        assert ThumbnailCache.instance() is cache
+        assert cache.max_bytes == 1024
+
+        assert ThumbnailCache.instance(max_bytes=2048) is cache
+        assert cache.max_bytes == 2048
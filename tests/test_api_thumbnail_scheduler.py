@@ -0,0 +1,154 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import os
+import pytest
+import sys
+
+# Manually add the app modules to the path in order to import them here.
+base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "python"))
+app_dir = os.path.abspath(os.path.join(base_dir, "tk_multi_breakdown2"))
+api_dir = os.path.abspath(os.path.join(app_dir, "api"))
+sys.path.extend([base_dir, app_dir, api_dir])
+from tk_multi_breakdown2.api.thumbnail_scheduler import ThumbnailScheduler
+
+
+class Requests(object):
+    """Record the requests started and cancelled by the scheduler."""
+
+    def __init__(self, skip=None):
+        self.started = []
+        self.cancelled = []
+        self.skip = skip or set()
+
+    def start(self, key, data):
+        if key in self.skip:
+            return None
+        self.started.append(key)
+        return "request_%s" % key
+
+    def cancel(self, request_id):
+        self.cancelled.append(request_id)
+
+
+@pytest.fixture
+def requests():
+    """The requests recorded by the scheduler."""
+
+    return Requests()
+
+
+class TestApiThumbnailScheduler:
+    """
+    Test the ThumbnailScheduler class methods.
+    """
+
+    def test_max_concurrent(self, requests):
+        """Test that requests are started up to the max number of concurrent requests."""
+
+        scheduler = ThumbnailScheduler(
+            requests.start, requests.cancel, max_concurrent=2
+        )
+        for key in range(4):
+            scheduler.enqueue(key, data=key)
+
+        assert requests.started == [0, 1]
+        assert scheduler.running_count == 2
+        assert len(scheduler) == 4
+        assert all(key in scheduler for key in range(4))
+
+        # Queuing the same key again does not start another request
+        scheduler.enqueue(0)
+        assert requests.started == [0, 1]
+
+        assert scheduler.finish("request_0") == 0
+        assert requests.started == [0, 1, 2]
+        assert 0 not in scheduler
+
+        # Unknown (e.g. cancelled) requests do not start more requests
+        assert scheduler.finish("request_0") is None
+        assert requests.started == [0, 1, 2]
+
+        scheduler.max_concurrent = 0
+        assert requests.started == [0, 1, 2, 3]
+        assert scheduler.pending
+
+    def test_visible_priority(self, requests):
+        """Test that the requests of the visible items are started first."""
+
+        scheduler = ThumbnailScheduler(
+            requests.start, requests.cancel, max_concurrent=1
+        )
+        for key in range(5):
+            scheduler.enqueue(key)
+        assert requests.started == [0]
+
+        scheduler.set_visible([4, 3])
+        scheduler.finish("request_0")
+        assert requests.started == [0, 4]
+        scheduler.finish("request_4")
+        assert requests.started == [0, 4, 3]
+
+        # Scrolling away cancels the visible request, which is queued again last
+        scheduler.set_visible([1])
+        assert requests.cancelled == ["request_3"]
+        assert requests.started == [0, 4, 3, 1]
+        assert scheduler.finish("request_3") is None
+
+        scheduler.finish("request_1")
+        scheduler.finish("request_2")
+        assert requests.started == [0, 4, 3, 1, 2, 3]
+
+    def test_background_requests_not_cancelled(self, requests):
+        """Test that requests not started for visible items are not cancelled."""
+
+        scheduler = ThumbnailScheduler(
+            requests.start, requests.cancel, max_concurrent=1
+        )
+        scheduler.enqueue(0)
+        scheduler.enqueue(1)
+
+        scheduler.set_visible([1])
+        assert requests.cancelled == []
+        scheduler.finish("request_0")
+        assert requests.started == [0, 1]
+
+    def test_skipped_requests(self):
+        """Test that requests not started (e.g. cached) do not take a request slot."""
+
+        requests = Requests(skip={0, 1})
+        scheduler = ThumbnailScheduler(
+            requests.start, requests.cancel, max_concurrent=1
+        )
+        for key in range(3):
+            scheduler.enqueue(key)
+
+        assert requests.started == [2]
+        assert 0 not in scheduler
+        assert len(scheduler) == 1
+
+    def test_remove_and_clear(self, requests):
+        """Test removing queued and running requests."""
+
+        scheduler = ThumbnailScheduler(
+            requests.start, requests.cancel, max_concurrent=1
+        )
+        for key in range(3):
+            scheduler.enqueue(key)
+
+        assert scheduler.remove(1)
+        assert not scheduler.remove(1)
+        assert scheduler.remove(0)
+        assert requests.cancelled == ["request_0"]
+        assert requests.started == [0, 2]
+
+        scheduler.clear()
+        assert requests.cancelled == ["request_0", "request_2"]
+        assert not scheduler.pending
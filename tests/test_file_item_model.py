@@ -0,0 +1,314 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import importlib
+import itertools
+
+from mock import patch, MagicMock
+
+from app_test_base import AppTestBase
+
+from tank_test.tank_test_base import setUpModule  # noqa
+
+
+class TestFileTreeModelItem(AppTestBase):
+    """
+    Test the FileTreeModelItem class, and its use by the ChangeNotifier. The modules are
+    imported from the app, since they require Qt.
+    """
+
+    def setUp(self):
+        """Import the app modules under test."""
+
+        super().setUp()
+
+        app_module = self.app.import_module("tk_multi_breakdown2")
+        self.model_module = importlib.import_module(
+            "%s.file_item_model" % app_module.__name__
+        )
+        self.notifier_module = importlib.import_module(
+            "%s.change_notifier" % app_module.__name__
+        )
+
+    def create_group(self, file_paths):
+        """
+        Create a group item with one child item per file path.
+
+        :param file_paths: The file paths of the child items.
+        :type file_paths: List[str]
+
+        :return: The group item and its child items.
+        :rtype: tuple
+        """
+
+        FileTreeModelItem = self.model_module.FileTreeModelItem
+
+        # The group is added to a root item, the items of removed groups are ignored.
+        root_item = FileTreeModelItem()
+        group_item = FileTreeModelItem(group_id="group", group_display="Group")
+        root_item.append_child(group_item)
+        child_items = []
+        for i, path in enumerate(file_paths):
+            file_item = self._file_item_class(
+                "node_%s" % i, "reference", path, sg_data={"id": 1}
+            )
+            child_item = FileTreeModelItem(file_item=file_item)
+            group_item.append_child(child_item)
+            child_items.append(child_item)
+        return group_item, child_items
+
+    def test_row_lookup_does_not_scan_children(self):
+        """
+        Test that the row of an item, and the row of its parent, are looked up without
+        scanning the child items of the parent, such that their cost does not grow with the
+        number of items in a group.
+        """
+
+        FileTreeModelItem = self.model_module.FileTreeModelItem
+
+        class ChildItems(list):
+            """A list of child items that fails when it is scanned."""
+
+            def index(self, *args, **kwargs):
+                raise AssertionError("The child items were scanned to find a row")
+
+            def __contains__(self, item):
+                raise AssertionError("The child items were scanned to find a row")
+
+        for count in (1000, 10000):
+            root_item = FileTreeModelItem()
+            group_item = FileTreeModelItem(group_id="group", group_display="Group")
+            root_item.append_child(group_item)
+            group_item.insert_children(
+                0, [FileTreeModelItem(group_id=i) for i in range(count)]
+            )
+            # Replace the child item lists, the rows must be read without scanning them.
+            root_item._FileTreeModelItem__child_items = ChildItems(
+                root_item.child_items
+            )
+            group_item._FileTreeModelItem__child_items = ChildItems(
+                group_item.child_items
+            )
+
+            child_items = list(group_item.child_items)
+            for row in (0, count // 2, count - 1):
+                child_item = child_items[row]
+                assert child_item.row() == row
+                assert child_item.parent_item is group_item
+                assert child_item.parent_item.row() == 0
+                assert group_item.child(row) is child_item
+
+    def test_duplicate_references(self):
+        """
+        Test that two references to the same file, in the same group, are tracked as two
+        distinct items.
+        """
+
+        group_item, child_items = self.create_group(["/path/to/file.ma"] * 2)
+        first_item, second_item = child_items
+
+        assert first_item.file_item_id == second_item.file_item_id
+        assert first_item != second_item
+        assert len(set(child_items)) == 2
+        assert [item.row() for item in child_items] == [0, 1]
+
+    def test_duplicate_references_data_changed(self):
+        """
+        Test that the data changed signal is emitted for the rows of both references to the
+        same file.
+        """
+
+        group_item, child_items = self.create_group(["/path/to/file.ma"] * 2)
+        group_index = MagicMock()
+
+        model = MagicMock()
+        notifier = self.notifier_module.ChangeNotifier(model, lambda item: group_index)
+        for child_item in child_items:
+            notifier.add(child_item, [1])
+        notifier.flush()
+
+        model.dataChanged.emit.assert_called_once()
+        assert [call[0] for call in model.index.call_args_list] == [
+            (0, 0, group_index),
+            (1, 0, group_index),
+        ]
+
+
+class TestFileTreeItemModelChunks(AppTestBase):
+    """
+    Test that the file items of a chunk of file paths are created from the scene objects of
+    the chunk only.
+    """
+
+    def setUp(self):
+        """Import the app modules under test."""
+
+        super().setUp()
+
+        app_module = self.app.import_module("tk_multi_breakdown2")
+        self.model_module = importlib.import_module(
+            "%s.file_item_model" % app_module.__name__
+        )
+
+    def test_chunk_scene_objects(self):
+        """
+        Test that the scene objects of a chunk are the ones with a published file in the
+        result of the chunk, in their scene order.
+        """
+
+        FileTreeItemModel = self.model_module.FileTreeItemModel
+
+        scene_objects = [
+            {"node_name": "node_%s" % i, "node_type": "reference", "path": path}
+            for i, path in enumerate(["/a", "/b", "/c", "/a", "/d"])
+        ]
+        scene_objects_by_path = FileTreeItemModel._get_scene_objects_by_path(
+            scene_objects
+        )
+
+        # The chunk result may not be in the scene order, and omits the paths without a
+        # published file.
+        result = {"/c": {"id": 3}, "/a": {"id": 1}}
+        assert FileTreeItemModel._get_chunk_scene_objects(
+            scene_objects_by_path, result
+        ) == [scene_objects[0], scene_objects[2], scene_objects[3]]
+
+        # Paths that are not part of the request are ignored.
+        assert (
+            FileTreeItemModel._get_chunk_scene_objects(
+                scene_objects_by_path, {"/e": {"id": 5}}
+            )
+            == []
+        )
+
+
+class TestFileTreeItemModelRoleData(AppTestBase):
+    """
+    Test that the role data memoized by the model items is retrieved again when the data it
+    depends on changes.
+    """
+
+    def setUp(self):
+        """Create the model under test, with role methods that count their calls."""
+
+        super().setUp()
+
+        app_module = self.app.import_module("tk_multi_breakdown2")
+        self.model_module = importlib.import_module(
+            "%s.file_item_model" % app_module.__name__
+        )
+
+        self.model = self.model_module.FileTreeItemModel(None, MagicMock())
+        self.addCleanup(self.model.destroy)
+        # The change notifier is not under test, the model item is not in the model.
+        self.model._change_notifier = MagicMock()
+
+        # Each call returns a new value, to tell when the role data is retrieved again.
+        values = itertools.count()
+        self.model.role_methods = {
+            role: MagicMock(side_effect=lambda index: next(values))
+            for role in (
+                self.model.VIEW_ITEM_HEADER_ROLE,
+                self.model.VIEW_ITEM_SUBTITLE_ROLE,
+                self.model.VIEW_ITEM_TEXT_ROLE,
+                self.model.VIEW_ITEM_SHORT_TEXT_ROLE,
+            )
+        }
+
+        file_item = self._file_item_class(
+            "node", "reference", "/foo/bar/hello", sg_data={"id": 1}
+        )
+        self.model_item = self.model_module.FileTreeModelItem(file_item=file_item)
+        self.index = self.model.createIndex(0, 0, self.model_item)
+
+    def get_role_data(self):
+        """
+        Get the data of each role with a role method, twice, and check that it is memoized.
+
+        :return: The role data, by role.
+        :rtype: dict
+        """
+
+        role_data = {}
+        for role in self.model.role_methods:
+            role_data[role] = self.model.data(self.index, role)
+            assert self.model.data(self.index, role) == role_data[role]
+        return role_data
+
+    def test_loading_changed(self):
+        """Test that the text roles are retrieved again when the loading state changes."""
+
+        model = self.model
+        role_data = self.get_role_data()
+
+        model._notify_item_changed(self.model_item, [model.VIEW_ITEM_LOADING_ROLE])
+        changed_role_data = self.get_role_data()
+
+        for role in (
+            model.VIEW_ITEM_SUBTITLE_ROLE,
+            model.VIEW_ITEM_TEXT_ROLE,
+            model.VIEW_ITEM_SHORT_TEXT_ROLE,
+        ):
+            assert changed_role_data[role] != role_data[role]
+            assert model.role_methods[role].call_count == 2
+        assert (
+            changed_role_data[model.VIEW_ITEM_HEADER_ROLE]
+            == role_data[model.VIEW_ITEM_HEADER_ROLE]
+        )
+        assert model.role_methods[model.VIEW_ITEM_HEADER_ROLE].call_count == 1
+
+    def test_status_changed(self):
+        """Test that all roles are retrieved again when the status changes."""
+
+        model = self.model
+        role_data = self.get_role_data()
+
+        model._notify_item_changed(
+            self.model_item, [model.STATUS_ROLE, model.STATUS_FILTER_DATA_ROLE]
+        )
+        changed_role_data = self.get_role_data()
+
+        for role, role_method in model.role_methods.items():
+            assert changed_role_data[role] != role_data[role]
+            assert role_method.call_count == 2
+
+    def test_thumbnail_changed(self):
+        """Test that no role is retrieved again when the thumbnail changes."""
+
+        model = self.model
+        role_data = self.get_role_data()
+
+        model._notify_item_changed(
+            self.model_item,
+            [
+                model.VIEW_ITEM_THUMBNAIL_ROLE,
+                self.model_module.QtCore.Qt.DecorationRole,
+            ],
+        )
+        assert self.get_role_data() == role_data
+        for role_method in model.role_methods.values():
+            assert role_method.call_count == 1
+
+    def test_thumbnail_decoded_when_visible(self):
+        """
+        Test that the thumbnail is not requested when its data is retrieved (e.g. painted),
+        but when the item is visible.
+        """
+
+        model = self.model
+        QtCore = self.model_module.QtCore
+        self.model_item.file_item.thumbnail_path = "/foo/bar/thumbnail.png"
+
+        with patch.object(model, "_request_thumbnail_decode") as request_decode:
+            model.data(self.index, QtCore.Qt.DecorationRole)
+            request_decode.assert_not_called()
+
+            model.set_visible_indexes([self.index])
+            request_decode.assert_called_once_with(self.model_item)
@@ -0,0 +1,227 @@
+# Copyright (c) 2024 Autodesk, Inc.
+#
+# CONFIDENTIAL AND PROPRIETARY
+#
+# This work is provided "AS IS" and subject to the Shotgun Pipeline Toolkit
+# Source Code License included in this distribution package. See LICENSE.
+# By accessing, using, copying or modifying this work you indicate your
+# agreement to the Shotgun Pipeline Toolkit Source Code License. All rights
+# not expressly granted therein are reserved by Autodesk, Inc.
+
+import importlib
+import random
+
+from app_test_base import AppTestBase
+
+from tank_test.tank_test_base import setUpModule  # noqa
+
+
+class TestPollScheduler(AppTestBase):
+    """
+    Test the PollScheduler class. The module is imported from the app, since it requires Qt.
+    The polls are triggered by calling the timer slot directly, the timer is only checked for
+    the delay it was started with.
+    """
+
+    def setUp(self):
+        """Import the app module under test."""
+
+        super().setUp()
+
+        app_module = self.app.import_module("tk_multi_breakdown2")
+        self.poll_scheduler_module = importlib.import_module(
+            "%s.poll_scheduler" % app_module.__name__
+        )
+        self.qt_core = importlib.import_module("sgtk.platform.qt").QtCore
+
+    def create_scheduler(self, **kwargs):
+        """
+        Create a started scheduler, with a base interval of 1 second, backing off up to 8
+        seconds.
+
+        :param kwargs: The arguments to create the scheduler with, in addition to the
+            defaults.
+
+        :return: The scheduler.
+        :rtype: PollScheduler
+        """
+
+        scheduler_kwargs = {
+            "interval": 1000,
+            "max_interval": 8000,
+            "backoff_factor": 2.0,
+            "jitter": 0.0,
+            "fast_poll_delay": 100,
+        }
+        scheduler_kwargs.update(kwargs)
+        scheduler = self.poll_scheduler_module.PollScheduler(**scheduler_kwargs)
+        self.addCleanup(scheduler.destroy)
+        scheduler.start()
+        return scheduler
+
+    def test_disabled(self):
+        """Test that the scheduler does not poll without a valid interval."""
+
+        scheduler = self.create_scheduler(interval=0, max_interval=0)
+
+        assert not scheduler.enabled
+        assert not scheduler.is_active
+        assert not scheduler._timer.isActive()
+
+    def test_backoff(self):
+        """
+        Test that the interval grows each time a poll does not find any changes, up to the
+        max interval.
+        """
+
+        scheduler = self.create_scheduler()
+        assert scheduler.interval == 1000
+        assert scheduler._timer.interval() == 1000
+
+        for expected_interval in (2000, 4000, 8000, 8000, 8000):
+            scheduler._on_timeout()
+            scheduler.report_poll_result(False)
+            assert scheduler.interval == expected_interval
+            assert scheduler._timer.isActive()
+            assert scheduler._timer.interval() == expected_interval
+
+        assert scheduler.stats["polls"] == 5
+        assert scheduler.stats["unchanged"] == 5
+
+    def test_backoff_default_max_interval(self):
+        """Test that the interval does not back off without a max interval."""
+
+        scheduler = self.create_scheduler(max_interval=None)
+
+        scheduler.report_poll_result(False)
+        assert scheduler.interval == 1000
+
+    def test_jitter(self):
+        """Test that the jitter applied to each interval stays within its bounds."""
+
+        random.seed(42)
+        scheduler = self.create_scheduler(jitter=0.1, max_interval=1000 * 2**10)
+
+        delays = set()
+        for _ in range(10):
+            scheduler.report_poll_result(False)
+            delay = scheduler._timer.interval()
+            assert (
+                int(scheduler.interval * 0.9) <= delay <= int(scheduler.interval * 1.1)
+            )
+            delays.add(delay / float(scheduler.interval))
+        # The jitter is random, the delays are not all a fixed ratio of the interval.
+        assert len(delays) > 1
+
+        # The jitter does not apply to the interval itself, only to the delay of each poll.
+        assert scheduler.interval == 1000 * 2**10
+
+    def test_reset_on_change(self):
+        """Test that the interval is reset to the base interval when a change is found."""
+
+        scheduler = self.create_scheduler()
+        for _ in range(3):
+            scheduler.report_poll_result(False)
+        assert scheduler.interval == 8000
+
+        scheduler.report_poll_result(True)
+        assert scheduler.interval == 1000
+        assert scheduler._timer.interval() == 1000
+        assert scheduler.stats["changed"] == 1
+
+    def test_fast_poll(self):
+        """
+        Test that a fast poll is scheduled after the fast poll delay, without jitter, and
+        resets the interval to the base interval.
+        """
+
+        scheduler = self.create_scheduler(jitter=0.5)
+        for _ in range(3):
+            scheduler.report_poll_result(False)
+
+        scheduler.request_fast_poll()
+        assert scheduler.interval == 1000
+        assert scheduler._timer.isActive()
+        assert scheduler._timer.interval() == 100
+        assert scheduler.stats["fast_polls"] == 1
+
+        # A fast poll is not requested once stopped.
+        scheduler.stop()
+        scheduler.request_fast_poll()
+        assert not scheduler._timer.isActive()
+        assert scheduler.stats["fast_polls"] == 1
+
+    def test_poll_requested(self):
+        """Test that a poll is requested when a poll is due, and the next one scheduled."""
+
+        scheduler = self.create_scheduler()
+        polls = []
+        scheduler.poll_requested.connect(lambda: polls.append(True))
+
+        scheduler._on_timeout()
+        assert polls == [True]
+        assert scheduler._timer.isActive()
+        assert scheduler.stats["last_poll_time"] is not None
+
+    def test_pause_hidden(self):
+        """Test that polling is paused while hidden, and resumed once shown."""
+
+        scheduler = self.create_scheduler()
+
+        scheduler.pause(scheduler.PAUSE_HIDDEN)
+        assert scheduler.is_paused
+        assert not scheduler._timer.isActive()
+
+        # Poll results reported while paused do not restart the timer.
+        scheduler.report_poll_result(False)
+        assert scheduler.interval == 2000
+        assert not scheduler._timer.isActive()
+
+        scheduler.resume(scheduler.PAUSE_HIDDEN)
+        assert not scheduler.is_paused
+        assert scheduler._timer.isActive()
+        # The poll is due after the remaining time of the poll scheduled while paused.
+        assert scheduler._timer.interval() <= 2000
+
+    def test_pause_resume_due_poll(self):
+        """Test that a poll that was due while paused is requested once resumed."""
+
+        scheduler = self.create_scheduler()
+
+        scheduler.pause(scheduler.PAUSE_HIDDEN)
+        scheduler._next_poll_time -= 10
+        scheduler.resume(scheduler.PAUSE_HIDDEN)
+        assert scheduler._timer.isActive()
+        assert scheduler._timer.interval() == 0
+
+    def test_pause_inactive(self):
+        """
+        Test that polling is paused while the application is not active, and only resumes
+        once there are no more reasons to pause.
+        """
+
+        QtCore = self.qt_core
+        scheduler = self.create_scheduler()
+
+        scheduler._on_application_state_changed(QtCore.Qt.ApplicationInactive)
+        assert scheduler.stats["paused"] == [scheduler.PAUSE_INACTIVE]
+        assert not scheduler._timer.isActive()
+
+        scheduler.pause(scheduler.PAUSE_HIDDEN)
+        scheduler._on_application_state_changed(QtCore.Qt.ApplicationActive)
+        assert scheduler.stats["paused"] == [scheduler.PAUSE_HIDDEN]
+        assert not scheduler._timer.isActive()
+
+        scheduler.resume(scheduler.PAUSE_HIDDEN)
+        assert not scheduler.is_paused
+        assert scheduler._timer.isActive()
+
+    def test_resume_stopped(self):
+        """Test that a stopped scheduler does not poll once resumed."""
+
+        scheduler = self.create_scheduler()
+        scheduler.pause(scheduler.PAUSE_HIDDEN)
+        scheduler.stop()
+
+        scheduler.resume(scheduler.PAUSE_HIDDEN)
+        assert not scheduler._timer.isActive()